@@ -150,3 +150,6 @@ def pytest_addoption(parser):
     parser.addoption(
         "--file-path", action="store", default=None, help="Path to the input file"
     )
+    parser.addoption(
+        "--benchmark", action="store_true", default=False, help="Run the benchmarks"
+    )
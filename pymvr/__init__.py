@@ -22,73 +22,529 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from copy import deepcopy
-from typing import List, Union, Optional, Tuple
+from operator import itemgetter
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Generator,
+    Iterator,
+    List,
+    Union,
+    Optional,
+    Set,
+    Tuple,
+)
 from xml.etree import ElementTree
 from xml.etree.ElementTree import Element
+import gc
+import io
+import os
+import threading
+import re
 import zipfile
 import sys
 import uuid as py_uuid
+import zlib
 from .value import Matrix, Color  # type: ignore
+from .cache import SceneCache
+from .archive import (
+    STORED_EXTENSIONS,
+    PARALLEL_DEFLATE_THRESHOLD,
+    COPY_CHUNK_SIZE,
+    ArchiveMember,
+    ReaderPool,
+    copy_raw_member,
+    deflate,
+    new_zip_info,
+    write_deflated_member,
+)
 from enum import Enum
 
 __version__ = "1.0.7"
 
-
-def _find_root(pkg: "zipfile.ZipFile") -> "ElementTree.Element":
+__all__ = [
+    # parsing and writing
+    "GeneralSceneDescription",
+    "GeneralSceneDescriptionWriter",
+    "SceneCache",
+    "ArchiveMember",
+    "STORED_EXTENSIONS",
+    "PARALLEL_DEFLATE_THRESHOLD",
+    "paused_gc",
+    # nodes and values
+    "BaseNode",
+    "ContainerNode",
+    "Protocols",
+    "Alignments",
+    "CustomCommands",
+    "Overwrites",
+    "Connections",
+    "Mappings",
+    "Scene",
+    "Layers",
+    "UserData",
+    "ScaleHandelingEnum",
+    "ScaleHandeling",
+    "Network",
+    "Addresses",
+    "BaseChildNode",
+    "BaseChildNodeExtended",
+    "Data",
+    "AUXData",
+    "MappingDefinition",
+    "Fixture",
+    "GroupObject",
+    "ChildList",
+    "Layer",
+    "Address",
+    "Class",
+    "Position",
+    "Geometry3D",
+    "Symbol",
+    "Geometries",
+    "SymdefChildList",
+    "Symdef",
+    "FocusPoint",
+    "SceneObject",
+    "Truss",
+    "Support",
+    "VideoScreen",
+    "Projector",
+    "Protocol",
+    "Alignment",
+    "Overwrite",
+    "Connection",
+    "Mapping",
+    "Gobo",
+    "CustomCommand",
+    "Projection",
+    "Projections",
+    "Source",
+    "Sources",
+    "Matrix",
+    "Color",
+    # see the modules below
+    "save_snapshot",
+    "load_snapshot",
+    "FixtureTable",
+    "fixture_table",
+    "import_fixtures",
+    "read_patch_sheet",
+    "NodeChange",
+    "SceneDiff",
+    "diff_scenes",
+    "MergeConflict",
+    "MergeResult",
+    "merge_scenes",
+    "ChangeSet",
+    "Observer",
+    "batch_changes",
+    "Journal",
+    "Transaction",
+    "LoadResult",
+    "load_many",
+    "CancelToken",
+    "Cancelled",
+    "Progress",
+    "Tracker",
+    "load_async",
+    "DeltaError",
+    "SceneDelta",
+    "apply_delta",
+    "make_delta",
+    "resource_hashes",
+]
+
+
+def _find_root(
+    pkg: "zipfile.ZipFile",
+) -> Tuple["ElementTree.Element", Optional[bytes]]:
     """Given a GDTF zip archive, find the GeneralSceneDescription of the
     corresponding GeneralSceneDescription.xml file."""
 
     with pkg.open("GeneralSceneDescription.xml", "r") as f:
-        description_str = f.read().decode("utf-8")
-        if description_str[-1] == "\x00":  # this should not happen, but...
-            description_str = description_str[:-1]
-    return ElementTree.fromstring(description_str)
+        return _parse_description(f.read())
+
+
+@contextmanager
+def paused_gc() -> Iterator[None]:
+    """Pause the cyclic garbage collector of the process while bulk loads
+    run, resuming it afterwards. The collector rescans the growing set of
+    new nodes many times while a large scene is built."""
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+_QUOTED_ATTRIBUTES = rb"""(?:[^>"']|"[^"]*"|'[^']*')*"""
+_USER_DATA_TAG = re.compile(rb"<(/?)UserData(?=[\s/>])" + _QUOTED_ATTRIBUTES)
+_ROOT_TAG = re.compile(
+    rb"<GeneralSceneDescription(?=[\s/>])" + _QUOTED_ATTRIBUTES + rb">"
+)
+_MARKUP_SECTION = re.compile(rb"<!--.*?-->|<!\[CDATA\[.*?\]\]>", re.DOTALL)
+_ENCODING = re.compile(rb"""^\s*<\?xml[^>]*encoding=["']([^"']*)""")
+
+
+def _hides_user_data(data: bytes) -> bool:
+    # comments and CDATA could contain text looking like UserData tags, or
+    # be cut in half if they did
+    sections = [m.group() for m in _MARKUP_SECTION.finditer(data)]
+    if len(sections) != data.count(b"<!"):
+        return True
+    return any(b"UserData" in section for section in sections)
+
+
+def _split_user_data(description: bytes) -> Tuple[bytes, Optional[bytes]]:
+    """Cut the UserData element out of the document, to be parsed only when
+    used. Returns the description unchanged if the element can not be
+    located reliably (namespaces, DTDs, other encodings...)."""
+
+    start = _USER_DATA_TAG.search(description)
+    if start is None or start.group(1):
+        return description, None
+    head = description[: start.start()]
+    encoding = _ENCODING.match(head)
+    if encoding is not None and encoding.group(1).lower() not in (b"utf-8", b"utf8"):
+        return description, None
+    if b"<!" in head or b"xmlns" in head:
+        return description, None
+    # UserData is a child of the root, before or after the Scene
+    stripped = head.rstrip()
+    if not stripped.endswith(b"</Scene>"):
+        root = _ROOT_TAG.search(head)
+        if root is None or root.end() != len(stripped):
+            return description, None
+
+    depth = 0
+    end = None
+    for tag in _USER_DATA_TAG.finditer(description, start.start()):
+        closing = tag.group(1)
+        self_closing = tag.group().endswith(b"/")
+        if closing:
+            depth -= 1
+        elif not self_closing:
+            depth += 1
+        if depth == 0:
+            end = description.find(b">", tag.end()) + 1
+            break
+    if end is None or end == 0:
+        return description, None
+    raw = description[start.start() : end]
+    rest = description[end:].lstrip()
+    if not (
+        rest.startswith(b"</GeneralSceneDescription") or rest.startswith(b"<Scene")
+    ):
+        return description, None
+    if b"<!" in raw and _hides_user_data(raw):
+        return description, None
+    return head + description[end:], raw
+
+
+def _parse_description(
+    description: Union[bytes, str],
+) -> Tuple["ElementTree.Element", Optional[bytes]]:
+    """Root element of the document and the raw UserData cut out of it"""
+    if description[-1:] in (b"\x00", "\x00"):  # this should not happen, but...
+        description = description[:-1]
+    user_data = None
+    if isinstance(description, bytes):
+        description, user_data = _split_user_data(description)
+    return ElementTree.fromstring(description), user_data
 
 
 class GeneralSceneDescription:
-    def __init__(self, path: Optional[str] = None):
+    """Parsed MVR file. path is a file path or a seekable binary file object,
+    see also from_bytes() and from_xml(). With a SceneCache, the parsed scene
+    is stored on disk and reused when the same GeneralSceneDescription.xml is
+    opened again. With workers > 1, the layers of the scene are built in
+    parallel threads on free-threaded Python builds.
+
+    Reading the parsed model and reading packed files with read_file() and
+    open_file() is safe from several threads. Each reading thread uses its
+    own handle of the archive, up to max_readers at once, file objects which
+    cannot be opened again are read by one thread at a time.
+
+    progress is called with a Progress after the XML is parsed and after each
+    layer. Loading stops with Cancelled once the cancel token (CancelToken)
+    is cancelled, it is checked before each child list entry."""
+
+    def __init__(
+        self,
+        path: Union[str, "os.PathLike", BinaryIO, None] = None,
+        cache: Optional[SceneCache] = None,
+        workers: int = 1,
+        max_readers: int = 4,
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ):
+        steps = self._loading(path, cache, workers, max_readers)
+        try:
+            _progress.run(steps, _progress.tracker("load", progress, cancel))
+        except Cancelled:
+            self.__exit__(None, None, None)
+            raise
+
+    def _loading(
+        self,
+        path: Union[str, "os.PathLike", BinaryIO, None],
+        cache: Optional[SceneCache],
+        workers: int,
+        max_readers: int,
+    ) -> Generator[None, None, None]:
+        # __init__ in steps, yields after parsing the XML and after each
+        # layer, see load_async()
+        self._workers = workers
+        self._package: Optional[zipfile.ZipFile] = None
+        self._readers: Optional[ReaderPool] = None
+        self._root: Optional[Element] = None
+        self._user_data_xml: Optional[bytes] = None
+        self._owned_files: List[IO[bytes]] = []
+        self.version_major: str = ""
+        self.version_minor: str = ""
+        self.provider: str = ""
+        self.provider_version: str = ""
+        self.scene: Optional[Scene] = None
+        self.user_data: Optional[UserData] = None
         if path is not None:
             self._package = zipfile.ZipFile(path, "r")
+            self._readers = ReaderPool(self._package, _reopener(path), size=max_readers)
         if self._package is not None:
-            self._root = _find_root(self._package)
+            if cache is not None:
+                info = self._package.getinfo("GeneralSceneDescription.xml")
+                key = cache.key(info.CRC, info.file_size, __version__)
+                if self._load_cached(cache, key):
+                    return
+            self._root, self._user_data_xml = _find_root(self._package)
+            tracker = _progress.current()
+            if tracker is not None:
+                size = self._package.getinfo("GeneralSceneDescription.xml").file_size
+                tracker.progress.bytes_done = tracker.progress.bytes_total = size
+            yield
         if self._root is not None:
-            self._read_xml()
+            yield from self._reading()
+            if cache is not None:
+                self._store_cached(cache, key)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        data: Union[bytes, bytearray, memoryview],
+        cache: Optional[SceneCache] = None,
+        workers: int = 1,
+        max_readers: int = 4,
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ) -> "GeneralSceneDescription":
+        """Open MVR file data held in memory"""
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return cls(
+            io.BytesIO(data),
+            cache=cache,
+            workers=workers,
+            max_readers=max_readers,
+            progress=progress,
+            cancel=cancel,
+        )
 
-    def _read_xml(self):
-        self.version_major: str = self._root.get("verMajor", "")
-        self.version_minor: str = self._root.get("verMinor", "")
-        self.provider: str = self._root.get("provider", "")
-        self.provider_version: str = self._root.get("providerVersion", "")
+    @classmethod
+    def from_xml(
+        cls,
+        source: Union[bytes, bytearray, memoryview, str, BinaryIO],
+        cache: Optional[SceneCache] = None,
+        workers: int = 1,
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ) -> "GeneralSceneDescription":
+        """Parse a bare GeneralSceneDescription.xml, given as bytes, str or a
+        binary stream. There is no archive, so no packed files. The cache is
+        only used for bytes and str input."""
+        mvr = cls(workers=workers)
+        tracker = _progress.tracker("load", progress, cancel)
+        if isinstance(source, (bytearray, memoryview)):
+            source = bytes(source)
+        if isinstance(source, (bytes, str)):
+            if cache is not None:
+                data = source.encode("utf-8") if isinstance(source, str) else source
+                key = cache.key(zlib.crc32(data), len(data), __version__)
+                if mvr._load_cached(cache, key):
+                    return mvr
+            mvr._root, mvr._user_data_xml = _parse_description(source)
+            if tracker is not None:
+                tracker.progress.bytes_done = tracker.progress.bytes_total = len(source)
+            mvr._read_xml(tracker)
+            if cache is not None:
+                mvr._store_cached(cache, key)
+        else:
+            mvr._root = ElementTree.parse(source).getroot()
+            mvr._read_xml(tracker)
+        return mvr
+
+    def _load_cached(self, cache: SceneCache, key: str) -> bool:
+        payload = cache.load(key)
+        if payload is None:
+            return False
+        (
+            self.version_major,
+            self.version_minor,
+            self.provider,
+            self.provider_version,
+            self.scene,
+            self.user_data,
+        ) = payload
+        return True
+
+    def _store_cached(self, cache: SceneCache, key: str):
+        cache.store(
+            key,
+            (
+                self.version_major,
+                self.version_minor,
+                self.provider,
+                self.provider_version,
+                self.scene,
+                self.user_data,
+            ),
+        )
 
-        scene = self._root.find("Scene")
+    def _read_xml(self, tracker: Optional["Tracker"] = None):
+        _progress.run(self._reading(), tracker)
+
+    def _reading(self) -> Generator[None, None, None]:
+        # yields after each layer
+        root = self._root
+        assert root is not None
+        self.version_major = root.get("verMajor", "")
+        self.version_minor = root.get("verMinor", "")
+        self.provider = root.get("provider", "")
+        self.provider_version = root.get("providerVersion", "")
+
+        scene = root.find("Scene")
+        tracker = _progress.current()
         if scene is not None:
-            self.scene = Scene(xml_node=scene)
+            from .parallel import read_layers
+
+            layers_node = scene.find("Layers")
+            layer_nodes = [] if layers_node is None else layers_node.findall("Layer")
+            if tracker is not None:
+                tracker.progress.layers_total = len(layer_nodes)
+            layers = []
+            for layer in read_layers(layer_nodes, self._workers, tracker):
+                layers.append(layer)
+                if tracker is not None:
+                    tracker.progress.layers_done += 1
+                yield
+            aux_data = scene.find("AUXData")
+            self.scene = Scene(
+                layers=Layers(layers=layers),
+                aux_data=AUXData(xml_node=aux_data) if aux_data is not None else None,
+            )
 
-        user_data = self._root.find("UserData")
+        user_data = root.find("UserData")
 
         if user_data is not None:
             self.user_data = UserData(xml_node=user_data)
+        elif self._user_data_xml is not None:
+            self.user_data = UserData.from_raw(self._user_data_xml)
+
+    def files(self) -> List[str]:
+        """Names of the files packed in the MVR archive"""
+        if self._package is None:
+            return []
+        return self._package.namelist()
+
+    @contextmanager
+    def open_file(self, name: str) -> Iterator[IO[bytes]]:
+        """Binary stream of a packed file, to be used as a context manager.
+        Raises KeyError if there is no such file."""
+        if self._readers is None:
+            raise KeyError(f"There is no item named {name!r} in the archive")
+        with self._readers.handle() as archive:
+            with archive.open(name, "r") as f:
+                yield f
+
+    def read_file(self, name: str) -> bytes:
+        """Content of a packed file. Raises KeyError if there is no such
+        file."""
+        with self.open_file(name) as f:
+            return f.read()
+
+    def close_on_exit(self, file: IO[bytes]):
+        """Close file along with the archive, for a temporary file the MVR
+        was opened from"""
+        self._owned_files.append(file)
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
+        if self._readers is not None:
+            self._readers.close()
         if self._package is not None:
             self._package.close()
+        for file in self._owned_files:
+            file.close()
+        self._owned_files.clear()
+
+
+def _reopener(
+    path: Union[str, "os.PathLike", BinaryIO],
+) -> Optional[Callable[[], "zipfile.ZipFile"]]:
+    # opens another handle of the archive, None for file objects which can
+    # only be read through one handle
+    if isinstance(path, (str, os.PathLike)):
+        file_path = os.fspath(path)
+        return lambda: zipfile.ZipFile(file_path, "r")
+    if type(path) is io.BytesIO:
+        # shares the buffer of bytes passed to BytesIO, no copy is made
+        data = path.getvalue()
+        return lambda: zipfile.ZipFile(io.BytesIO(data), "r")
+    return None
 
 
 class GeneralSceneDescriptionWriter:
-    """Creates MVR zip archive with packed GeneralSceneDescription xml and other files"""
+    """Creates MVR zip archive with packed GeneralSceneDescription xml and other files
+
+    Members with already compressed formats (see stored_extensions) are
+    stored, everything else is deflated. With workers > 1, members larger than
+    parallel_threshold are deflated concurrently in worker threads.
+
+    With incremental=True, the serialized XML of layers, child list and
+    AUXData entries is cached on the nodes and reused by later saves as long
+    as the nodes stay unchanged, so saving again after an edit only
+    serializes the changed nodes and their parents."""
 
     def __init__(
         self,
+        compression_level: Optional[int] = None,
+        workers: int = 1,
+        incremental: bool = False,
     ):
         self.version_major: str = "1"
         self.version_minor: str = "6"
         self.provider: str = "pymvr"
         self.provider_version: str = __version__
-        self.files_list: List[Tuple[str, str]] = []
+        self.files_list: List[Tuple[Any, str]] = []
+        # members of a base archive which are not copied, see write_mvr()
+        self.removed_files: Set[str] = set()
+        self.stored_extensions = set(STORED_EXTENSIONS)
+        self.compression_level = compression_level
+        self.workers = workers
+        self.parallel_threshold: int = PARALLEL_DEFLATE_THRESHOLD
+        self.incremental = incremental
+        self.fragments = _fragments.FragmentWriter()
         self.xml_root = ElementTree.Element(
             "GeneralSceneDescription",
             verMajor=self.version_major,
@@ -97,30 +553,302 @@ class GeneralSceneDescriptionWriter:
             providerVersion=self.provider_version,
         )
 
-    def serialize_scene(self, scene: "Scene"):
-        scene.to_xml(parent=self.xml_root)
+    def serialize_scene(
+        self,
+        scene: "Scene",
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ):
+        """Add the scene to the XML. progress is called after each layer,
+        cancel is checked before each child list entry, a cancelled scene is
+        not added."""
+        tracker = _progress.tracker("serialize", progress, cancel)
+        if tracker is None:
+            self._serialize_scene(scene)
+            return
+        if scene.layers is not None:
+            tracker.progress.layers_total = len(scene.layers)
+        children = len(self.xml_root)
+        fragments = len(self.fragments.nodes)
+        try:
+            with tracker.active():
+                self._serialize_scene(scene)
+        except Cancelled:
+            del self.xml_root[children:]
+            del self.fragments.nodes[fragments:]
+            raise
+
+    def _serialize_scene(self, scene: "Scene"):
+        if self.incremental:
+            self.fragments.collect(scene.to_xml, self.xml_root)
+        else:
+            scene.to_xml(parent=self.xml_root)
 
     def serialize_user_data(self, user_data: "UserData"):
         if user_data:
-            user_data.to_xml(parent=self.xml_root)
+            self.fragments.collect(user_data.to_xml, self.xml_root)
 
-    def write_mvr(self, path: Optional[str] = None):
-        if path is not None:
-            if sys.version_info >= (3, 9):
-                ElementTree.indent(self.xml_root, space="    ", level=0)
-            xmlstr = ElementTree.tostring(
-                self.xml_root, encoding="UTF-8", xml_declaration=True
+    def add_file(self, source: Any, file_name: str):
+        """Add a file to be packed into the archive as file_name. The source
+        can be a file path, bytes, a readable binary file object or an
+        ArchiveMember of another opened MVR file."""
+        self.files_list.append((source, file_name))
+
+    def compress_type(self, file_name: str) -> int:
+        """Zip compression method used for the given archive member"""
+        if Path(file_name).suffix.lower() in self.stored_extensions:
+            return zipfile.ZIP_STORED
+        return zipfile.ZIP_DEFLATED
+
+    def write_mvr(
+        self,
+        path: Union[str, "os.PathLike", BinaryIO],
+        base=None,
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ):
+        """Write the MVR file to path, which is a file path or a writable
+        binary stream (BytesIO, socket file, HTTP response...). Non-seekable
+        streams are written sequentially, the archive is not built in memory.
+
+        If base (path, GeneralSceneDescription or zipfile.ZipFile of an
+        existing MVR file) is given, its members which are not replaced via
+        files_list or listed in removed_files are copied over byte-for-byte,
+        without decompressing them.
+        Only the GeneralSceneDescription.xml and the changed files are
+        compressed and written. path can point to the base file itself.
+
+        A file path is written to a temporary file next to it, which replaces
+        the file at path once fully written. If writing fails or is
+        cancelled, an existing file at path is left as it was.
+
+        progress is called with a Progress after the XML is written and after
+        each member or chunk of a streamed member. Once the cancel token is
+        cancelled, writing stops with Cancelled."""
+
+        _progress.run(
+            self._writing(path, base), _progress.tracker("write", progress, cancel)
+        )
+
+    async def write_mvr_async(
+        self,
+        path: Union[str, "os.PathLike", BinaryIO, Any],
+        base=None,
+        executor=None,
+        progress: Optional[Callable[["Progress"], None]] = None,
+        cancel: Optional["CancelToken"] = None,
+    ):
+        """write_mvr() for asyncio, see pymvr.aio.write_mvr_async()"""
+        await _aio.write_mvr_async(self, path, base, executor, progress, cancel)
+
+    def _writing(
+        self, path: Union[str, "os.PathLike", BinaryIO], base
+    ) -> Generator[None, None, None]:
+        # write_mvr() in steps, yields after serializing the XML, after each
+        # member and after each chunk of streamed members, see
+        # write_mvr_async()
+        if path is None:
+            raise ValueError("write_mvr requires a file path or a binary stream")
+        if sys.version_info >= (3, 9):
+            ElementTree.indent(self.xml_root, space="    ", level=0)
+        xmlstr = ElementTree.tostring(
+            self.xml_root, encoding="UTF-8", xml_declaration=True
+        )
+        if self.fragments.nodes:
+            xmlstr = self.fragments.splice(xmlstr, self.xml_root, 0)
+        yield
+        if base is None:
+            yield from self._write_archive(path, xmlstr, None)
+            return
+
+        if isinstance(base, (str, os.PathLike)):
+            with zipfile.ZipFile(base, "r") as base_package:
+                yield from self._write_archive(path, xmlstr, base_package)
+        else:
+            yield from self._write_archive(
+                path, xmlstr, getattr(base, "_package", base)
             )
-            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as z:
-                z.writestr("GeneralSceneDescription.xml", xmlstr)
-                for file_path, file_name in self.files_list:
-                    try:
-                        z.write(file_path, arcname=file_name)
-                    except Exception:
-                        print(f"File does not exist {file_path}")
+
+    def _write_archive(
+        self, path, xmlstr: bytes, base_package: Optional["zipfile.ZipFile"]
+    ) -> Iterator[None]:
+        if not isinstance(path, (str, os.PathLike)):
+            yield from self._write_zip(path, xmlstr, base_package)
+            return
+        # written next to path and moved there once complete, so a failed or
+        # cancelled write leaves an existing file (the base file too) as it was
+        temp_path = f"{os.fspath(path)}.{py_uuid.uuid4().hex}.tmp"
+        try:
+            yield from self._write_zip(temp_path, xmlstr, base_package)
+            os.replace(temp_path, path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    def _write_zip(
+        self, path, xmlstr: bytes, base_package: Optional["zipfile.ZipFile"]
+    ) -> Iterator[None]:
+        replaced = {
+            file_name for source, file_name in self.files_list if source is not None
+        }
+        copied = []
+        if base_package is not None:
+            replaced.add("GeneralSceneDescription.xml")
+            replaced.update(self.removed_files)
+            copied = [
+                info.filename
+                for info in base_package.infolist()
+                if info.filename not in replaced
+            ]
+        tracker = _progress.current()
+        with zipfile.ZipFile(
+            path,
+            "w",
+            zipfile.ZIP_DEFLATED,
+            compresslevel=self.compression_level,
+        ) as z:
+            members = self._write_members(z, xmlstr, copied, base_package)
+            if tracker is None:
+                yield from members
+                return
+            sources = sum(1 for source, _ in self.files_list if source is not None)
+            tracker.progress.files_total = 1 + len(copied) + sources
+            for _ in members:
+                tracker.progress.files_done = len(z.filelist)
+                tracker.progress.bytes_done = z.fp.tell()  # type: ignore[union-attr]
+                yield
+
+    def _write_members(
+        self, z: "zipfile.ZipFile", xmlstr: bytes, copied: List[str], base_package
+    ) -> Iterator[None]:
+        z.writestr("GeneralSceneDescription.xml", xmlstr)
+        yield
+        for file_name in copied:
+            copy_raw_member(base_package, z, file_name)
+            yield
+        yield from self._write_files(z)
+
+    def _write_files(self, z: "zipfile.ZipFile") -> Iterator[None]:
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                yield from self._write_files_with(z, executor)
+        else:
+            yield from self._write_files_with(z, None)
+
+    def _write_files_with(
+        self, z: "zipfile.ZipFile", executor: Optional[ThreadPoolExecutor]
+    ) -> Iterator[None]:
+        # large members are deflated in the pool, limit how many are kept in memory
+        pending: deque = deque()
+        for source, file_name in self.files_list:
+            if source is None:
+                continue
+            compress_type = self.compress_type(file_name)
+            data = None
+            if isinstance(source, (bytes, bytearray, memoryview)):
+                data = bytes(source)
+            elif isinstance(source, (str, os.PathLike)):
+                if not os.path.isfile(source):
+                    raise FileNotFoundError(f"File does not exist {source}")
+                if (
+                    executor is not None
+                    and compress_type == zipfile.ZIP_DEFLATED
+                    and os.path.getsize(source) >= self.parallel_threshold
+                ):
+                    with open(source, "rb") as f:
+                        data = f.read()
+                else:
+                    z.write(
+                        source,
+                        arcname=file_name,
+                        compress_type=compress_type,
+                        compresslevel=self.compression_level,
+                    )
+                    yield
+                    continue
+            else:
+                yield from self._write_stream(z, source, file_name, compress_type)
+                continue
+
+            if (
+                executor is not None
+                and compress_type == zipfile.ZIP_DEFLATED
+                and len(data) >= self.parallel_threshold
+            ):
+                future = executor.submit(deflate, data, self.compression_level)
+                pending.append((file_name, data, future))
+                if len(pending) > self.workers:
+                    self._write_deflated(z, *pending.popleft())
+            else:
+                zinfo = new_zip_info(file_name, compress_type, self.compression_level)
+                z.writestr(zinfo, data)
+            yield
+        while pending:
+            self._write_deflated(z, *pending.popleft())
+            yield
+
+    def _write_stream(
+        self, z: "zipfile.ZipFile", source, file_name: str, compress_type: int
+    ) -> Iterator[None]:
+        if isinstance(source, ArchiveMember):
+            # already compressed in the other archive, copy as is
+            source.copy_to(z, file_name)
+            yield
+        elif hasattr(source, "read"):
+            zinfo = new_zip_info(file_name, compress_type, self.compression_level)
+            with z.open(zinfo, "w") as dest:
+                while True:
+                    chunk = source.read(COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    dest.write(chunk)
+                    yield
+        else:
+            raise TypeError(
+                f"Unsupported source {type(source).__name__} for file {file_name}"
+            )
+
+    def _write_deflated(self, z: "zipfile.ZipFile", file_name: str, data, future):
+        write_deflated_member(z, file_name, data, future.result())
+
+
+# fields whose values repeat across nodes, equal values are shared so that
+# pickle writes them once and refers to them afterwards
+_SHARED_FIELDS = frozenset(
+    {"gdtf_spec", "gdtf_mode", "classing", "file_name", "symdef", "position"}
+)
+_SHARED_LIMIT = 4096
+_shared_values: Dict[str, str] = {}
+# (node class, attribute names) -> (shape, getter of the field values, indices
+# of shared fields)
+_shapes: Dict[Tuple[Any, ...], Tuple[Any, ...]] = {}
+
+
+def _node_shape(node_type: type, keys: Tuple[str, ...]) -> Tuple[Any, ...]:
+    names = tuple(key for key in keys if key[0] != "_")
+    getter: Callable[[Dict[str, Any]], Tuple[Any, ...]]
+    if len(names) > 1:
+        getter = itemgetter(*names)
+    else:
+        # itemgetter of a single name returns the value, not a tuple
+        getter = lambda state: tuple(state[name] for name in names)  # noqa: E731
+    shared = [index for index, name in enumerate(names) if name in _SHARED_FIELDS]
+    return (node_type, names), getter, shared
+
+
+def _restore_node(shape, *values):
+    node_type, names = shape
+    node = node_type.__new__(node_type)
+    node.__dict__.update(zip(names, values))
+    return node
 
 
 class BaseNode:
+    # see tracking.py
+    _parent = None
+    _content_hash = None
+
     def __init__(self, xml_node: Optional["Element"] = None):
         if xml_node is not None:
             self._read_xml(xml_node)
@@ -128,6 +856,64 @@ class BaseNode:
     def _read_xml(self, xml_node: "Element"):
         pass
 
+    def __getstate__(self):
+        # underscore attributes are caches and links to the parent
+        return {k: v for k, v in _cow.state_of(self).items() if k[0] != "_"}
+
+    def __reduce__(self):
+        # compact pickles: the class and field names are kept in a shape
+        # tuple shared by all nodes with the same fields, which pickle writes
+        # once and refers to afterwards, followed by the field values
+        state = _cow.state_of(self)
+        key = (type(self), tuple(state))
+        entry = _shapes.get(key)
+        if entry is None:
+            entry = _shapes.setdefault(key, _node_shape(*key))
+        shape, getter, shared = entry
+        values = getter(state)
+        if shared:
+            values = list(values)
+            if len(_shared_values) >= _SHARED_LIMIT:
+                _shared_values.clear()
+            for index in shared:
+                value = values[index]
+                if type(value) is str:
+                    values[index] = _shared_values.setdefault(value, value)
+        return _restore_node, (shape, *values)
+
+    def __getattr__(self, name: str):
+        # only called for missing attributes, fields of a clone which were
+        # not read yet. The field is copied from the source of the clone, or
+        # by another thread meanwhile
+        if name[0] != "_":
+            state = self.__dict__
+            if _cow.SOURCE in state or name in state:
+                try:
+                    return _cow.read(self, name)
+                except AttributeError:
+                    pass
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def clone(self):
+        """Copy-on-write copy of this node and everything nested in it. Nodes
+        of the copy are copied from this one when they are first used, so
+        cloning is cheap and the copy grows with the parts which are used.
+
+        Changes of either side after cloning are not seen by the other."""
+        return _cow.clone(self)
+
+    def content_hash(self) -> bytes:
+        """Digest of the fields of this node and everything nested in it,
+        equal for equal content. Cached until something below changes."""
+        return _tracking.content_hash(self)
+
+    def invalidate(self):
+        """Drop the cached content hash after changing values in place which
+        are not tracked (ElementTree elements)"""
+        _tracking.invalidate(self)
+
 
 class ContainerNode(BaseNode):
     def __init__(
@@ -259,8 +1045,10 @@ class Layers(BaseNode):
 
     def to_xml(self, parent: Element):
         element = ElementTree.SubElement(parent, "Layers")
+        child_xml = _fragments.child_writer()
         for layer in self.layers:
-            element.append(layer.to_xml())
+            element.append(child_xml(layer))
+            _progress.layer_done()
         return element
 
     def __iter__(self):
@@ -291,7 +1079,14 @@ class Layers(BaseNode):
         return len(self.layers)
 
 
+_user_data_lock = threading.Lock()
+
+
 class UserData(BaseNode):
+    """UserData of a read file is kept as the raw bytes of its source (raw)
+    and only parsed when data is accessed. Unless parsed, it is written back
+    verbatim."""
+
     def __init__(
         self,
         data: Optional[List["Data"]] = None,
@@ -302,10 +1097,36 @@ class UserData(BaseNode):
         self.data = data if data is not None else []
         super().__init__(xml_node, *args, **kwargs)
 
+    @classmethod
+    def from_raw(cls, raw: bytes) -> "UserData":
+        user_data = cls.__new__(cls)
+        user_data.raw = raw
+        return user_data
+
+    def __getattr__(self, name: str):
+        # only called for missing attributes, data of raw UserData
+        raw = self.__dict__.get("raw")
+        if name != "data" or raw is None:
+            return super().__getattr__(name)
+        with _user_data_lock:
+            # another thread might have parsed it in the meantime
+            if "data" not in self.__dict__:
+                self._read_xml(ElementTree.fromstring(raw))
+        return self.__dict__["data"]
+
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if name == "data" and self.__dict__.pop("raw", None) is not None:
+            self.invalidate()
+
     def _read_xml(self, xml_node: "Element"):
         self.data = [Data(xml_node=i) for i in xml_node.findall("Data")]
 
     def to_xml(self, parent: Element):
+        raw = self.__dict__.get("raw")
+        if raw is not None:
+            parent.append(_fragments.opaque(raw))
+            return
         element = ElementTree.SubElement(parent, type(self).__name__)
         for _data in self.data:
             element.append(_data.to_xml())
@@ -556,7 +1377,7 @@ class BaseChildNode(BaseNode):
     def __str__(self):
         return f"{self.name}"
 
-    def populate_xml(self, element: Element):
+    def populate_xml(self, element: Element, default_ids: bool = False):
         Matrix(self.matrix.matrix).to_xml(element)
         if self.classing:
             ElementTree.SubElement(element, "Classing").text = self.classing
@@ -582,11 +1403,19 @@ class BaseChildNode(BaseNode):
         if self.connections:
             self.connections.to_xml(element)
 
-        if self.fixture_id is not None:
-            ElementTree.SubElement(element, "FixtureID").text = str(self.fixture_id)
-        if self.fixture_id_numeric is not None:
+        fixture_id = self.fixture_id
+        fixture_id_numeric = self.fixture_id_numeric
+        if default_ids:
+            # ids are mandatory unless the node is part of a multipatch
+            if fixture_id is None:
+                fixture_id = "0"
+            if fixture_id_numeric is None:
+                fixture_id_numeric = 0
+        if fixture_id is not None:
+            ElementTree.SubElement(element, "FixtureID").text = str(fixture_id)
+        if fixture_id_numeric is not None:
             ElementTree.SubElement(element, "FixtureIDNumeric").text = str(
-                self.fixture_id_numeric
+                fixture_id_numeric
             )
         if self.unit_number is not None:
             ElementTree.SubElement(element, "UnitNumber").text = str(self.unit_number)
@@ -626,8 +1455,8 @@ class BaseChildNodeExtended(BaseChildNode):
     def __str__(self):
         return f"{self.name}"
 
-    def populate_xml(self, element: Element):
-        super().populate_xml(element)
+    def populate_xml(self, element: Element, default_ids: bool = False):
+        super().populate_xml(element, default_ids)
         if self.geometries is None:
             raise ValueError(
                 f"{type(self).__name__} '{self.name}' missing required Geometries"
@@ -657,7 +1486,8 @@ class Data(BaseNode):
         if ver is not None:
             self.ver = ver
         self.text = xml_node.text
-        self.extra_children = [deepcopy(child) for child in list(xml_node)]
+        # the parsed tree is not used otherwise, no need to copy
+        self.extra_children = list(xml_node)
 
     def __str__(self):
         return f"{self.provider} {self.ver}"
@@ -667,8 +1497,11 @@ class Data(BaseNode):
             type(self).__name__, provider=self.provider, ver=self.ver
         )
         element.text = self.text
-        for child in self.extra_children:
-            element.append(deepcopy(child))
+        if _fragments.collecting():
+            # written verbatim by the writer, no need to copy the children
+            element.extend(self.extra_children)
+            return _fragments.opaque(element)
+        element.extend(deepcopy(child) for child in self.extra_children)
         return element
 
 
@@ -701,14 +1534,15 @@ class AUXData(BaseNode):
 
     def to_xml(self, parent: Element):
         element = ElementTree.SubElement(parent, type(self).__name__)
+        child_xml = _fragments.child_writer()
         for _class in self.classes:
-            element.append(_class.to_xml())
+            element.append(child_xml(_class))
         for symdef in self.symdefs:
-            element.append(symdef.to_xml())
+            element.append(child_xml(symdef))
         for position in self.positions:
-            element.append(position.to_xml())
+            element.append(child_xml(position))
         for mapping_definition in self.mapping_definitions:
-            element.append(mapping_definition.to_xml())
+            element.append(child_xml(mapping_definition))
         return element
 
 
@@ -853,12 +1687,7 @@ class Fixture(BaseChildNode):
         if self.multipatch:
             attributes["multipatch"] = self.multipatch
         element = ElementTree.Element(type(self).__name__, attributes)
-        if self.multipatch is None:
-            if self.fixture_id is None:
-                self.fixture_id = "0"
-            if self.fixture_id_numeric is None:
-                self.fixture_id_numeric = 0
-        self.populate_xml(element)
+        self.populate_xml(element, default_ids=self.multipatch is None)
 
         if self.focus:
             ElementTree.SubElement(element, "Focus").text = self.focus
@@ -977,6 +1806,10 @@ class ChildList(BaseNode):
         super().__init__(xml_node, *args, **kwargs)
 
     def _read_xml(self, xml_node: "Element"):
+        tracker = _progress.current()
+        if tracker is not None:
+            self._read_tracked(xml_node, tracker)
+            return
         self.scene_objects = [
             SceneObject(xml_node=i) for i in xml_node.findall("SceneObject")
         ]
@@ -1000,24 +1833,43 @@ class ChildList(BaseNode):
 
         self.projectors = [Projector(xml_node=i) for i in xml_node.findall("Projector")]
 
+    def _read_tracked(self, xml_node: "Element", tracker: "Tracker"):
+        # _read_xml() counting the entries and checking for cancellation
+        def read(node_type: type) -> list:
+            children = []
+            for child_node in xml_node.findall(node_type.__name__):
+                tracker.node()
+                children.append(node_type(xml_node=child_node))
+            return children
+
+        self.scene_objects = read(SceneObject)
+        self.group_objects = read(GroupObject)
+        self.focus_points = read(FocusPoint)
+        self.fixtures = read(Fixture)
+        self.supports = read(Support)
+        self.trusses = read(Truss)
+        self.video_screens = read(VideoScreen)
+        self.projectors = read(Projector)
+
     def to_xml(self, parent: Element):
         element = ElementTree.SubElement(parent, type(self).__name__)
+        child_xml = _fragments.child_writer()
         for fixture in self.fixtures:
-            element.append(fixture.to_xml())
+            element.append(child_xml(fixture))
         for focus_point in self.focus_points:
-            element.append(focus_point.to_xml())
+            element.append(child_xml(focus_point))
         for group_object in self.group_objects:
-            element.append(group_object.to_xml())
+            element.append(child_xml(group_object))
         for scene_object in self.scene_objects:
-            element.append(scene_object.to_xml())
+            element.append(child_xml(scene_object))
         for support in self.supports:
-            element.append(support.to_xml())
+            element.append(child_xml(support))
         for truss in self.trusses:
-            element.append(truss.to_xml())
+            element.append(child_xml(truss))
         for video_screen in self.video_screens:
-            element.append(video_screen.to_xml())
+            element.append(child_xml(video_screen))
         for projector in self.projectors:
-            element.append(projector.to_xml())
+            element.append(child_xml(projector))
         return element
 
 
@@ -1442,12 +2294,7 @@ class Truss(BaseChildNodeExtended):
         if self.multipatch:
             attributes["multipatch"] = self.multipatch
         element = ElementTree.Element(type(self).__name__, attributes)
-        if self.multipatch is None:
-            if self.fixture_id is None:
-                self.fixture_id = "0"
-            if self.fixture_id_numeric is None:
-                self.fixture_id_numeric = 0
-        self.populate_xml(element)
+        self.populate_xml(element, default_ids=self.multipatch is None)
         if self.position:
             ElementTree.SubElement(element, "Position").text = self.position
         if self.function_:
@@ -1490,12 +2337,7 @@ class Support(BaseChildNodeExtended):
         if self.multipatch:
             attributes["multipatch"] = self.multipatch
         element = ElementTree.Element(type(self).__name__, attributes)
-        if self.multipatch is None:
-            if self.fixture_id is None:
-                self.fixture_id = "0"
-            if self.fixture_id_numeric is None:
-                self.fixture_id_numeric = 0
-        self.populate_xml(element)
+        self.populate_xml(element, default_ids=self.multipatch is None)
 
         if self.position:
             ElementTree.SubElement(element, "Position").text = self.position
@@ -1535,12 +2377,7 @@ class VideoScreen(BaseChildNodeExtended):
         if self.multipatch:
             attributes["multipatch"] = self.multipatch
         element = ElementTree.Element(type(self).__name__, attributes)
-        if self.multipatch is None:
-            if self.fixture_id is None:
-                self.fixture_id = "0"
-            if self.fixture_id_numeric is None:
-                self.fixture_id_numeric = 0
-        self.populate_xml(element)
+        self.populate_xml(element, default_ids=self.multipatch is None)
 
         if self.sources and len(self.sources) > 0:
             self.sources.to_xml(element)
@@ -1571,12 +2408,7 @@ class Projector(BaseChildNodeExtended):
         if self.multipatch:
             attributes["multipatch"] = self.multipatch
         element = ElementTree.Element(type(self).__name__, attributes)
-        if self.multipatch is None:
-            if self.fixture_id is None:
-                self.fixture_id = "0"
-            if self.fixture_id_numeric is None:
-                self.fixture_id_numeric = 0
-        self.populate_xml(element)
+        self.populate_xml(element, default_ids=self.multipatch is None)
 
         if self.projections and len(self.projections) > 0:
             self.projections.to_xml(element)
@@ -1956,3 +2788,32 @@ class Sources(BaseNode):
 
     def __len__(self):
         return len(self.sources)
+
+
+# the modules below import the node classes, so they come last
+from . import tracking as _tracking  # noqa: E402
+from . import fragments as _fragments  # noqa: E402
+from . import cow as _cow  # noqa: E402
+from .snapshot import save_snapshot, load_snapshot  # noqa: E402
+from .table import (  # noqa: E402
+    FixtureTable,
+    fixture_table,
+    import_fixtures,
+    read_patch_sheet,
+)
+from .diff import NodeChange, SceneDiff, diff_scenes  # noqa: E402
+from .merge import MergeConflict, MergeResult, merge_scenes  # noqa: E402
+from .observe import ChangeSet, Observer, batch_changes  # noqa: E402
+from .journal import Journal, Transaction  # noqa: E402
+from .loader import LoadResult, load_many  # noqa: E402
+from . import progress as _progress  # noqa: E402
+from .progress import CancelToken, Cancelled, Progress, Tracker  # noqa: E402
+from . import aio as _aio  # noqa: E402
+from .aio import load_async  # noqa: E402
+from .delta import (  # noqa: E402
+    DeltaError,
+    SceneDelta,
+    apply_delta,
+    make_delta,
+    resource_hashes,
+)
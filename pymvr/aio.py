@@ -0,0 +1,181 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# asyncio versions of loading and writing MVR files.
+#
+# Loading and writing run in steps (GeneralSceneDescription._loading and
+# GeneralSceneDescriptionWriter._writing): one step per layer when loading,
+# one per member or chunk of a streamed member when writing. Each step runs in
+# an executor, so the event loop is free in the meantime, and cancellation
+# takes effect between steps.
+
+import asyncio
+import inspect
+import io
+import os
+from concurrent.futures import Executor
+from typing import Any, BinaryIO, Callable, Generator, Iterator, Optional, Union
+
+from . import (
+    GeneralSceneDescription,
+    GeneralSceneDescriptionWriter,
+    SceneCache,
+)
+from .archive import COPY_CHUNK_SIZE
+from .progress import CancelToken, Progress, Tracker, tracker
+
+_DONE = object()
+
+
+def _step(steps: Iterator[None], step_tracker: Optional[Tracker]) -> Any:
+    if step_tracker is None:
+        return next(steps, _DONE)
+    with step_tracker.active():
+        result = next(steps, _DONE)
+    if result is not _DONE:
+        step_tracker.step()
+    return result
+
+
+async def _run(
+    steps: Iterator[None],
+    executor: Optional[Executor],
+    cleanup: Callable[[], None],
+    step_tracker: Optional[Tracker] = None,
+):
+    loop = asyncio.get_running_loop()
+    while True:
+        step = loop.run_in_executor(executor, _step, steps, step_tracker)
+        try:
+            result = await asyncio.shield(step)
+        except BaseException:
+            # a running step cannot be interrupted, clean up once it is done
+            await asyncio.wait([step])
+            await loop.run_in_executor(executor, cleanup)
+            raise
+        if result is _DONE:
+            return
+
+
+async def load_async(
+    path: Union[str, "os.PathLike", BinaryIO, bytes, bytearray, memoryview],
+    cache: Optional[SceneCache] = None,
+    workers: int = 1,
+    max_readers: int = 4,
+    executor: Optional[Executor] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+    cancel: Optional[CancelToken] = None,
+) -> GeneralSceneDescription:
+    """Open an MVR file (a file path, a seekable binary file object or the
+    data in memory) like GeneralSceneDescription(), without blocking the
+    event loop. The file is read in the executor (default executor of the
+    loop if None), one layer at a time. progress is called in the executor
+    threads."""
+
+    if isinstance(path, (bytes, bytearray, memoryview)):
+        path = io.BytesIO(bytes(path))
+    mvr = GeneralSceneDescription.__new__(GeneralSceneDescription)
+    steps = mvr._loading(path, cache, workers, max_readers)
+
+    def cleanup():
+        steps.close()
+        if mvr.__dict__.get("_package") is not None:
+            mvr.__exit__(None, None, None)
+
+    await _run(steps, executor, cleanup, tracker("load", progress, cancel))
+    return mvr
+
+
+class _AsyncStream(io.RawIOBase):
+    # non-seekable stream handing the written data to an asyncio stream
+    # (asyncio.StreamWriter or anything with an async write()), the writing
+    # thread waits until the data is sent
+
+    def __init__(self, target: Any, loop: "asyncio.AbstractEventLoop"):
+        self.target = target
+        self.loop = loop
+        self.discard = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = len(data)
+        if not self.discard:
+            asyncio.run_coroutine_threadsafe(
+                self._send(bytes(data)), self.loop
+            ).result()
+        return size
+
+    async def _send(self, data: bytes):
+        result = self.target.write(data)
+        if inspect.isawaitable(result):
+            await result
+        drain = getattr(self.target, "drain", None)
+        if drain is not None:
+            await drain()
+
+
+def _is_async_stream(target: Any) -> bool:
+    return hasattr(target, "drain") or inspect.iscoroutinefunction(
+        getattr(target, "write", None)
+    )
+
+
+def _flushed(steps: Iterator[None], stream: BinaryIO) -> Generator[None, None, None]:
+    yield from steps
+    stream.flush()
+
+
+async def write_mvr_async(
+    writer: GeneralSceneDescriptionWriter,
+    path: Union[str, "os.PathLike", BinaryIO, Any],
+    base=None,
+    executor: Optional[Executor] = None,
+    progress: Optional[Callable[[Progress], None]] = None,
+    cancel: Optional[CancelToken] = None,
+):
+    """writer.write_mvr(path, base) without blocking the event loop. path can
+    also be an asyncio stream: an asyncio.StreamWriter or an object with an
+    async write() (aiohttp responses...), written in chunks of
+    COPY_CHUNK_SIZE. A file path is written to a temporary file like
+    write_mvr() does, so a cancelled write leaves an existing file as it
+    was."""
+
+    loop = asyncio.get_running_loop()
+    step_tracker = tracker("write", progress, cancel)
+    if not isinstance(path, (str, os.PathLike)) and _is_async_stream(path):
+        stream = _AsyncStream(path, loop)
+        buffered = io.BufferedWriter(stream, COPY_CHUNK_SIZE)
+        steps = _flushed(writer._writing(buffered, base), buffered)
+
+        def cleanup():
+            stream.discard = True
+            steps.close()
+
+        await _run(steps, executor, cleanup, step_tracker)
+    else:
+        # closing the steps removes the temporary file of a file path
+        steps = writer._writing(path, base)
+        await _run(steps, executor, steps.close, step_tracker)
@@ -0,0 +1,301 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Helpers for writing members into the MVR zip archive.
+#
+# Members which are compressed already (deflated in worker threads, or copied
+# from another archive) are written as raw bytes. zipfile has no public API
+# for that, so this uses its internals, which are the same in CPython 3.8 to
+# 3.13. If they are missing, the members are written through
+# ZipFile.open(..., "w") instead, decompressing and compressing them again.
+
+import io
+import shutil
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from contextlib import contextmanager
+from typing import IO, Callable, Iterator, List, Optional
+
+# Formats which are compressed already, deflating them again only costs CPU
+STORED_EXTENSIONS = frozenset(
+    {
+        ".gdtf",
+        ".mvr",
+        ".zip",
+        ".png",
+        ".jpg",
+        ".jpeg",
+        ".gif",
+        ".webp",
+        ".glb",
+        ".mp4",
+        ".mov",
+        ".webm",
+        ".mkv",
+        ".mp3",
+        ".ogg",
+    }
+)
+
+# Members at least this large are deflated in worker threads
+PARALLEL_DEFLATE_THRESHOLD = 1024 * 1024
+
+COPY_CHUNK_SIZE = 1024 * 1024
+
+# zipfile internals used to write raw members, see raw_writes()
+RAW_WRITES = hasattr(zipfile.ZipFile, "_writecheck") and hasattr(
+    zipfile.ZipInfo, "FileHeader"
+)
+_ARCHIVE_INTERNALS = ("_lock", "_seekable", "_didModify", "start_dir", "fp")
+
+
+class ArchiveMember:
+    """A file inside of another opened MVR (or any zip) archive, to be used as
+    a source for the GeneralSceneDescriptionWriter. Data is streamed from the
+    archive, without temporary files."""
+
+    def __init__(self, archive, name: str):
+        # GeneralSceneDescription or zipfile.ZipFile
+        self.archive: "zipfile.ZipFile" = getattr(archive, "_package", archive)
+        self.name = name
+
+    @property
+    def info(self) -> "zipfile.ZipInfo":
+        return self.archive.getinfo(self.name)
+
+    def open(self) -> IO[bytes]:
+        return self.archive.open(self.name, "r")
+
+    def copy_to(self, target: "zipfile.ZipFile", arcname: Optional[str] = None):
+        copy_raw_member(self.archive, target, self.name, arcname)
+
+    def __str__(self):
+        return f"{self.name}"
+
+
+class ReaderPool:
+    """Pool of handles of one archive for reading members from several
+    threads at once. A zipfile.ZipFile can be used by one reader at a time,
+    so each reader gets its own handle, opened by opener when needed, up to
+    size handles. Without an opener (file objects, which cannot be opened
+    again), the shared handle is used by one reader at a time."""
+
+    def __init__(
+        self,
+        shared: "zipfile.ZipFile",
+        opener: Optional[Callable[[], "zipfile.ZipFile"]] = None,
+        size: int = 4,
+    ):
+        self.shared = shared
+        self.opener = opener
+        self.size = size if opener is not None else 1
+        self._slots = threading.Semaphore(self.size)
+        self._lock = threading.Lock()
+        self._idle: List["zipfile.ZipFile"] = []
+        self._closed = False
+
+    @contextmanager
+    def handle(self) -> Iterator["zipfile.ZipFile"]:
+        """Handle for the exclusive use of the caller"""
+        self._slots.acquire()
+        try:
+            archive = self._acquire()
+            try:
+                yield archive
+            finally:
+                self._release(archive)
+        finally:
+            self._slots.release()
+
+    def _acquire(self) -> "zipfile.ZipFile":
+        with self._lock:
+            if self._closed:
+                raise ValueError("Archive is closed")
+            if self._idle:
+                return self._idle.pop()
+        if self.opener is None:
+            return self.shared
+        return self.opener()
+
+    def _release(self, archive: "zipfile.ZipFile"):
+        with self._lock:
+            if not self._closed:
+                self._idle.append(archive)
+                return
+        if archive is not self.shared:
+            archive.close()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for archive in idle:
+            if archive is not self.shared:
+                archive.close()
+
+
+def deflate(data: bytes, level: Optional[int] = None) -> bytes:
+    """Raw deflate stream as stored in a zip member. zlib releases the GIL
+    while compressing, so this can run in worker threads."""
+
+    if level is None:
+        level = zlib.Z_DEFAULT_COMPRESSION
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def new_zip_info(
+    file_name: str, compress_type: int, compression_level: Optional[int] = None
+) -> "zipfile.ZipInfo":
+    zinfo = zipfile.ZipInfo(file_name, date_time=time.localtime(time.time())[:6])
+    zinfo.compress_type = compress_type
+    if hasattr(zinfo, "compress_level"):  # Python 3.13
+        zinfo.compress_level = compression_level  # type: ignore[attr-defined]
+    else:
+        zinfo._compresslevel = compression_level  # type: ignore[attr-defined]
+    zinfo.external_attr = 0o600 << 16
+    return zinfo
+
+
+def raw_writes(archive: "zipfile.ZipFile") -> bool:
+    """True if compressed members can be written to archive as they are"""
+    return RAW_WRITES and all(hasattr(archive, name) for name in _ARCHIVE_INTERNALS)
+
+
+def _write_member(archive: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo", source):
+    # fallback of the raw writes, source is a readable file object
+    with archive.open(
+        zinfo, "w", force_zip64=zinfo.file_size > zipfile.ZIP64_LIMIT
+    ) as target:
+        shutil.copyfileobj(source, target, COPY_CHUNK_SIZE)
+
+
+def _begin_member(archive: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo"):
+    # archive._lock must be held
+    if archive._seekable:  # type: ignore[attr-defined]
+        archive.fp.seek(archive.start_dir)  # type: ignore[union-attr]
+    zinfo.header_offset = archive.fp.tell()  # type: ignore[union-attr]
+    archive._writecheck(zinfo)  # type: ignore[attr-defined]
+    archive._didModify = True  # type: ignore[attr-defined]
+    zinfo.flag_bits &= ~0x08  # sizes are known, no data descriptor
+    archive.fp.write(zinfo.FileHeader(None))  # type: ignore[union-attr]
+
+
+def _end_member(archive: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo"):
+    archive.start_dir = archive.fp.tell()  # type: ignore[union-attr]
+    archive.filelist.append(zinfo)
+    archive.NameToInfo[zinfo.filename] = zinfo
+
+
+def write_raw_member(
+    archive: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo", raw_data: bytes
+):
+    """Append a member whose data is already in its final (compressed) form.
+    zinfo must carry CRC, file_size and compress_size of the member."""
+
+    if not raw_writes(archive):
+        if zinfo.compress_type == zipfile.ZIP_DEFLATED:
+            raw_data = zlib.decompress(raw_data, -15)
+        elif zinfo.compress_type != zipfile.ZIP_STORED:
+            raise NotImplementedError("Raw members must be stored or deflated")
+        _write_member(archive, zinfo, io.BytesIO(raw_data))
+        return
+    with archive._lock:  # type: ignore[attr-defined]
+        _begin_member(archive, zinfo)
+        archive.fp.write(raw_data)  # type: ignore[union-attr]
+        _end_member(archive, zinfo)
+
+
+def write_deflated_member(
+    archive: "zipfile.ZipFile", file_name: str, data: bytes, compressed: bytes
+):
+    """Append a member which was deflated beforehand, see deflate()"""
+
+    zinfo = new_zip_info(file_name, zipfile.ZIP_DEFLATED)
+    zinfo.CRC = zlib.crc32(data)
+    zinfo.file_size = len(data)
+    zinfo.compress_size = len(compressed)
+    write_raw_member(archive, zinfo, compressed)
+
+
+def _member_data_offset(archive: "zipfile.ZipFile", zinfo: "zipfile.ZipInfo") -> int:
+    # archive._lock must be held
+    fp = archive.fp
+    fp.seek(zinfo.header_offset)  # type: ignore[union-attr]
+    header = fp.read(30)  # type: ignore[union-attr]
+    if len(header) != 30 or header[:4] != b"PK\x03\x04":
+        raise zipfile.BadZipFile(f"Bad local file header of {zinfo.filename}")
+    name_length, extra_length = struct.unpack("<HH", header[26:30])
+    return zinfo.header_offset + 30 + name_length + extra_length
+
+
+def _copy_info(
+    info: "zipfile.ZipInfo", arcname: Optional[str] = None
+) -> "zipfile.ZipInfo":
+    zinfo = zipfile.ZipInfo(arcname or info.filename, date_time=info.date_time)
+    zinfo.compress_type = info.compress_type
+    zinfo.flag_bits = info.flag_bits & ~0x800
+    zinfo.CRC = info.CRC
+    zinfo.file_size = info.file_size
+    zinfo.compress_size = info.compress_size
+    zinfo.create_system = info.create_system
+    zinfo.internal_attr = info.internal_attr
+    zinfo.external_attr = info.external_attr
+    return zinfo
+
+
+def copy_raw_member(
+    source: "zipfile.ZipFile",
+    target: "zipfile.ZipFile",
+    name: str,
+    arcname: Optional[str] = None,
+):
+    """Copy a member from source to target archive byte-for-byte, without
+    decompressing and compressing the data again."""
+
+    info = source.getinfo(name)
+    zinfo = _copy_info(info, arcname)
+    if not raw_writes(source) or not raw_writes(target):
+        with source.open(info) as data:
+            _write_member(target, zinfo, data)
+        return
+
+    with source._lock:  # type: ignore[attr-defined]
+        position = _member_data_offset(source, info)
+    with target._lock:  # type: ignore[attr-defined]
+        _begin_member(target, zinfo)
+        remaining = info.compress_size
+        while remaining > 0:
+            with source._lock:  # type: ignore[attr-defined]
+                source.fp.seek(position)  # type: ignore[union-attr]
+                chunk = source.fp.read(min(remaining, COPY_CHUNK_SIZE))  # type: ignore[union-attr]
+            if not chunk:
+                raise zipfile.BadZipFile(f"Truncated member {info.filename}")
+            target.fp.write(chunk)  # type: ignore[union-attr]
+            position += len(chunk)
+            remaining -= len(chunk)
+        _end_member(target, zinfo)
@@ -0,0 +1,208 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Copy-on-write clones of nodes.
+#
+# clone() returns a view of a node: an empty object of the same class which
+# only refers to its source. Reading a field of the view copies just that
+# field from the source, with nested nodes turned into views again and lists
+# copied, so a clone costs one object and only grows along the paths which
+# are read. A view is materialized (all fields copied, the source dropped)
+# when it or something below it is changed.
+#
+# Sources must not change while views depend on them. While clones exist,
+# the tracking hooks (tracking.py) are installed and a change of a node, one
+# of its lists, a Matrix or a Color first materializes the views of the
+# changed node and of its parents, top down, so the views keep the content
+# the source had when they were created. This needs links from the nodes of
+# the source up to it: the first clone of a tree links it (tracking.link),
+# without hashing it. Changes which are not tracked (ElementTree elements
+# changed in place) are not seen by views either.
+#
+# Views can be read from several threads: copying fields holds a lock and the
+# source link is dropped only after all fields are copied, so a reader sees
+# either the source or the copied field.
+
+import threading
+import weakref
+from copy import deepcopy
+from enum import Enum
+from typing import Any, Dict, List
+from xml.etree import ElementTree
+
+from . import BaseNode
+from .value import Color, Matrix
+from . import tracking
+
+SOURCE = "_cow_source"
+VIEWS = "_cow_views"
+# the clone a nested view was created for, keeps the tracking hook installed
+ROOT = "_cow_root"
+
+_IMMUTABLE = (str, int, float, bool, bytes, type(None))
+
+_lock = threading.RLock()
+
+
+def clone(node: Any) -> Any:
+    """Copy-on-write clone of node and everything nested in it"""
+
+    tracking.set_before_change(before_change)
+    # links nodes to their parents, so changes of the source can be seen
+    tracking.link(node.__dict__.get(SOURCE, node))
+    with _lock:
+        view = view_of(node)
+    tracking.hold(view)
+    return view
+
+
+def view_of(node: Any) -> Any:
+    state = node.__dict__
+    source = state.get(SOURCE)
+    if source is not None:  # a view which was not used yet, share its source
+        node = source
+        state = node.__dict__
+    view = object.__new__(type(node))
+    view_state = view.__dict__
+    view_state[SOURCE] = node
+    digest = state.get("_content_hash")
+    if digest is not None:
+        view_state["_content_hash"] = digest
+    views = state.get(VIEWS)
+    if views is None:
+        state[VIEWS] = [weakref.ref(view)]
+    else:
+        if len(views) >= 16:
+            views[:] = [ref for ref in views if _pending(ref())]
+        views.append(weakref.ref(view))
+    return view
+
+
+def _pending(view: Any) -> bool:
+    return view is not None and SOURCE in view.__dict__
+
+
+def read(view: Any, name: str) -> Any:
+    """Field name of view, copied from its source if the view is not
+    materialized. Raises AttributeError if the source has no such field."""
+    state = view.__dict__
+    with _lock:
+        if name in state:  # copied by another thread meanwhile
+            return state[name]
+        source = state.get(SOURCE)
+        if source is None:
+            raise AttributeError(name)
+        value = state[name] = _copy(getattr(source, name), view, weakref.ref(view))
+        return value
+
+
+def source_of(obj: Any) -> Any:
+    """Source of a view which is not materialized, else obj"""
+    return obj.__dict__.get(SOURCE, obj)
+
+
+def state_of(obj: Any) -> Dict[str, Any]:
+    """Fields of obj, read from the source of a view without materializing"""
+    state = obj.__dict__
+    source = state.get(SOURCE)
+    return source.__dict__ if source is not None else state
+
+
+def materialize(view: Any):
+    """Copy the remaining fields of the source of view into it"""
+    state = view.__dict__
+    if SOURCE not in state:
+        return
+    with _lock:
+        source = state.get(SOURCE)
+        if source is None:  # materialized by another thread meanwhile
+            return
+        # link the copies to their parents like content_hash() does, so
+        # changes below drop the content hash the view shares with its source
+        parent = weakref.ref(view)
+        for key, value in list(source.__dict__.items()):
+            if key[0] != "_" and key not in state:
+                state[key] = _copy(value, view, parent)
+        del state[SOURCE]
+        state.pop(ROOT, None)
+
+
+def _copy(value: Any, owner: Any, parent: "weakref.ref") -> Any:
+    if isinstance(value, _IMMUTABLE) or isinstance(value, Enum):
+        return value
+    if isinstance(value, BaseNode):
+        view = view_of(value)
+        view_state = view.__dict__
+        view_state["_parent"] = parent
+        view_state[ROOT] = owner.__dict__.get(ROOT, owner)
+        return view
+    if isinstance(value, list):
+        return tracking.owned([_copy(item, owner, parent) for item in value], owner)
+    if isinstance(value, tuple):
+        return tuple(_copy(item, owner, parent) for item in value)
+    if isinstance(value, dict):
+        return {key: _copy(item, owner, parent) for key, item in value.items()}
+    if isinstance(value, ElementTree.Element) or not hasattr(value, "__dict__"):
+        return deepcopy(value)
+    # small value objects (Matrix, Color...) are copied right away
+    copied = object.__new__(type(value))
+    state = copied.__dict__
+    own_parent = weakref.ref(copied)
+    for key, item in list(value.__dict__.items()):
+        if key[0] != "_":
+            state[key] = _copy(item, copied, own_parent)
+    if isinstance(value, (Matrix, Color)):
+        state["_parent"] = parent
+        digest = value.__dict__.get("_content_hash")
+        if digest is not None:
+            state["_content_hash"] = digest
+    return copied
+
+
+def before_change(obj: Any):
+    """Called by the tracking hooks before obj (or one of its lists) changes,
+    materializes views which depend on obj or its parents"""
+
+    # parents first: materializing a view creates views of the children
+    path: List[Any] = []
+    seen = set()
+
+    def visit(node: Any):
+        seen.add(id(node))
+        for parent in tracking.parents(node):
+            if id(parent) not in seen:
+                visit(parent)
+        path.append(node)
+
+    visit(obj)
+    for node in path:
+        state = node.__dict__
+        if SOURCE in state:
+            materialize(node)
+        views = state.pop(VIEWS, None)
+        if views:
+            for ref in views:
+                view = ref()
+                if view is not None:
+                    materialize(view)
@@ -0,0 +1,545 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Scene deltas for synchronizing stations without resending the whole MVR.
+#
+# A delta lists, by uuid, the removed nodes, the added nodes (without their
+# nested nodes), the changed own fields of nodes and the new order of uuids in
+# each list of nodes (layers, child lists, AUXData lists) whose content or
+# order changed. Moves, additions and removals are all applied by rebuilding
+# those lists. Only added, changed and removed packed files (GDTFs, meshes...)
+# are in a delta, the added and changed ones with their data and SHA-256.
+# Members of two archives with the same CRC-32 and size are taken as equal,
+# only the differing ones are read and hashed.
+#
+# Applying is validated: the content hash of the scene must match the one the
+# delta was made from, the changes must fit the scene (known uuids, parents
+# which can hold the nodes, no cycles, no node left out) and the result must
+# have the content hash of the scene the delta was made for.
+
+import hashlib
+import zlib
+from copy import deepcopy
+from typing import Any, Dict, List, Mapping, Optional, Set, Tuple, Union
+
+from . import AUXData, ChildList, GeneralSceneDescription, Layer, Layers, Scene
+from .archive import COPY_CHUNK_SIZE
+from .cow import state_of
+from .diff import CHILD_LIST_FIELDS, _changed_fields, _scene, _walk
+from .merge import AUX_DATA_NAMES, CHILD_LIST_NAMES
+from .snapshot import load_snapshot, save_snapshot
+from .tracking import content_hash
+
+FORMAT = "pymvr-delta"
+FORMAT_VERSION = 1
+LAYERS = "layers"
+
+# (parent uuid or None, name of the list) of a list of nodes
+ListKey = Tuple[Optional[str], str]
+
+
+class DeltaError(ValueError):
+    """A delta does not fit the scene it is applied to"""
+
+
+class SceneDelta:
+    """Changes turning one scene into another, see make_delta(). orders holds
+    (parent uuid, list name, uuids) for each changed list of nodes, parent is
+    None for layers and AUXData lists. files holds the data of the packed
+    files which were added or changed, resources their SHA-256, and
+    removed_files the names of packed files which are gone."""
+
+    def __init__(self):
+        self.base_hash: Optional[bytes] = None
+        self.target_hash: Optional[bytes] = None
+        self.removed: List[str] = []
+        self.added: Dict[str, Any] = {}
+        self.fields: Dict[str, Dict[str, Any]] = {}
+        self.orders: List[Tuple[Optional[str], str, List[str]]] = []
+        self.resources: Dict[str, str] = {}
+        self.files: Dict[str, bytes] = {}
+        self.removed_files: List[str] = []
+
+    def __bool__(self):
+        return bool(
+            self.removed
+            or self.added
+            or self.fields
+            or self.orders
+            or self.files
+            or self.removed_files
+        )
+
+    def __repr__(self):
+        return (
+            f"SceneDelta(removed={len(self.removed)}, added={len(self.added)}, "
+            f"modified={len(self.fields)}, lists={len(self.orders)}, "
+            f"files={len(self.files)}, removed_files={len(self.removed_files)})"
+        )
+
+    def to_bytes(self) -> bytes:
+        """Compact binary form (pymvr snapshot format)"""
+        data = save_snapshot(
+            {
+                "format": FORMAT,
+                "version": FORMAT_VERSION,
+                "base_hash": self.base_hash,
+                "target_hash": self.target_hash,
+                "removed": self.removed,
+                "added": self.added,
+                "fields": self.fields,
+                "orders": [tuple(order) for order in self.orders],
+                "resources": self.resources,
+                "files": self.files,
+                "removed_files": self.removed_files,
+            }
+        )
+        assert data is not None
+        return data
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> "SceneDelta":
+        payload = load_snapshot(data)
+        if not isinstance(payload, dict) or payload.get("format") != FORMAT:
+            raise ValueError("Not a pymvr scene delta")
+        if payload.get("version") != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported scene delta version {payload.get('version')}"
+            )
+        delta = cls()
+        delta.base_hash = payload["base_hash"]
+        delta.target_hash = payload["target_hash"]
+        delta.removed = list(payload["removed"])
+        delta.added = dict(payload["added"])
+        delta.fields = dict(payload["fields"])
+        delta.orders = [
+            (parent, name, list(uuids)) for parent, name, uuids in payload["orders"]
+        ]
+        delta.resources = dict(payload["resources"])
+        delta.files = dict(payload["files"])
+        delta.removed_files = list(payload["removed_files"])
+        return delta
+
+    def add_files(self, writer):
+        """Add the included files to a GeneralSceneDescriptionWriter and leave
+        out the removed ones, the others can be copied from the previous MVR
+        (write_mvr(path, base=))"""
+        for name, data in self.files.items():
+            writer.add_file(data, name)
+        writer.removed_files.update(self.removed_files)
+
+
+def resource_hashes(mvr: GeneralSceneDescription) -> Dict[str, str]:
+    """SHA-256 of each packed file of an MVR, cached on the object"""
+    return {name: _member_hash(mvr, name) for name in _resources(mvr)}
+
+
+def _resources(mvr: GeneralSceneDescription) -> List[str]:
+    return [name for name in mvr.files() if name != "GeneralSceneDescription.xml"]
+
+
+def _member_hash(mvr: GeneralSceneDescription, name: str) -> str:
+    hashes = mvr.__dict__.setdefault("_resource_hashes", {})
+    result = hashes.get(name)
+    if result is None:
+        digest = hashlib.sha256()
+        with mvr.open_file(name) as f:
+            for chunk in iter(lambda: f.read(COPY_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        result = hashes[name] = digest.hexdigest()
+    return result
+
+
+def _same_member(
+    base: GeneralSceneDescription, target: GeneralSceneDescription, name: str
+) -> bool:
+    # CRC-32 and size from the central directories, nothing is read
+    base_info = base._package.getinfo(name)  # type: ignore[union-attr]
+    target_info = target._package.getinfo(name)  # type: ignore[union-attr]
+    return (base_info.CRC, base_info.file_size) == (
+        target_info.CRC,
+        target_info.file_size,
+    )
+
+
+def _list_name(node: Any) -> str:
+    if isinstance(node, Layer):
+        return LAYERS
+    name = CHILD_LIST_NAMES.get(type(node)) or AUX_DATA_NAMES.get(type(node))
+    if name is None:
+        raise DeltaError(f"{type(node).__name__} can not be in a list of nodes")
+    return name
+
+
+def _index(
+    scene,
+) -> Tuple[Dict[str, Tuple[Any, ListKey, int]], Dict[ListKey, List[str]]]:
+    """uuid: (node, key of its list, position in the list) and key: uuids of
+    each list"""
+    nodes: Dict[str, Tuple[Any, ListKey, int]] = {}
+    lists: Dict[ListKey, List[str]] = {}
+    for node, parent, _ in _walk(scene):
+        key = (parent, _list_name(node))
+        uuids = lists.setdefault(key, [])
+        nodes[node.uuid] = (node, key, len(uuids))
+        uuids.append(node.uuid)
+    return nodes, lists
+
+
+def _shallow(node: Any) -> Any:
+    """Copy of node sharing its fields, with an empty child list"""
+    state = {key: value for key, value in state_of(node).items() if key[0] != "_"}
+    if isinstance(state.get("child_list"), ChildList):
+        state["child_list"] = ChildList()
+    copy = object.__new__(type(node))
+    copy.__dict__.update(state)
+    return copy
+
+
+def _uuid(node: Any) -> str:
+    return state_of(node)["uuid"]
+
+
+def _lists(owner: Any) -> Dict[str, List[Any]]:
+    """Lists of nodes with uuid of a scene or a node, by name"""
+    if isinstance(owner, Scene):
+        lists: Dict[str, List[Any]] = {}
+        if owner.layers is not None:
+            lists[LAYERS] = owner.layers.layers
+        if owner.aux_data is not None:
+            for name in AUX_DATA_NAMES.values():
+                lists[name] = getattr(owner.aux_data, name)
+        return lists
+    child_list = getattr(owner, "child_list", None)
+    if not isinstance(child_list, ChildList):
+        return {}
+    return {name: getattr(child_list, name) for name in CHILD_LIST_FIELDS}
+
+
+class _Compare:
+    # Both scenes are walked together, nodes are matched by uuid within the
+    # same list and subtrees with equal content hashes are skipped, so clones
+    # are not copied and the cost grows with the changes. Nodes without a
+    # match in their list are collected with everything nested in them and
+    # matched by uuid afterwards: moved if found on both sides, otherwise
+    # added or removed.
+
+    def __init__(self, delta: SceneDelta):
+        self.delta = delta
+        self.base_rest: Dict[str, Any] = {}
+        self.target_rest: Dict[str, Any] = {}
+
+    def scenes(self, base: Scene, target: Scene):
+        stack: List[Tuple[Any, Any, Optional[str]]] = [(base, target, None)]
+        while stack:
+            old, new, parent = stack.pop()
+            if parent is not None:
+                self.fields(old, new, parent)
+            old_lists = _lists(old)
+            new_lists = _lists(new)
+            self.orders(old_lists, new_lists, parent)
+            for name, items in new_lists.items():
+                matches = {_uuid(item): item for item in old_lists.pop(name, ())}
+                for item in items:
+                    uuid = _uuid(item)
+                    match = matches.get(uuid)
+                    if match is None or type(match) is not type(item):
+                        self.collect(item, self.target_rest)
+                        continue
+                    del matches[uuid]
+                    if match is not item and content_hash(match) != content_hash(item):
+                        stack.append((match, item, uuid))
+                for item in matches.values():
+                    self.collect(item, self.base_rest)
+            for items in old_lists.values():
+                for item in items:
+                    self.collect(item, self.base_rest)
+
+        delta = self.delta
+        for uuid, node in self.target_rest.items():
+            old = self.base_rest.get(uuid)
+            if old is not None and type(old) is type(node):
+                self.fields(old, node, uuid)
+                self.orders(_lists(old), _lists(node), uuid)
+            else:
+                delta.added[uuid] = _shallow(node)
+                self.orders({}, _lists(node), uuid)
+        delta.removed = [
+            uuid for uuid in self.base_rest if uuid not in self.target_rest
+        ] + [uuid for uuid in delta.added if uuid in self.base_rest]
+
+    def collect(self, node: Any, rest: Dict[str, Any]):
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            rest[_uuid(node)] = node
+            for items in _lists(node).values():
+                stack.extend(items)
+
+    def fields(self, old: Any, new: Any, uuid: str):
+        if old is new or content_hash(old) == content_hash(new):
+            return
+        changes = {
+            field: value for field, (_, value) in _changed_fields(old, new).items()
+        }
+        old_child_list = getattr(old, "child_list", None)
+        new_child_list = getattr(new, "child_list", None)
+        if (old_child_list is None) != (new_child_list is None):
+            changes["child_list"] = None if new_child_list is None else ChildList()
+        if changes:
+            self.delta.fields[uuid] = changes
+
+    def orders(
+        self,
+        old_lists: Dict[str, List[Any]],
+        new_lists: Dict[str, List[Any]],
+        parent: Optional[str],
+    ):
+        for name, items in new_lists.items():
+            uuids = [_uuid(item) for item in items]
+            if uuids != [_uuid(item) for item in old_lists.get(name, ())]:
+                self.delta.orders.append((parent, name, uuids))
+
+
+def make_delta(
+    base,
+    target,
+    known: Optional[Mapping[str, str]] = None,
+    files: Optional[Mapping[str, bytes]] = None,
+) -> SceneDelta:
+    """Delta turning base into target (Scene or GeneralSceneDescription).
+
+    Packed files of a target GeneralSceneDescription and files (name: data)
+    are included if the receiver does not have them: known maps names to the
+    SHA-256 of the receiver's files, by default the packed files of a base
+    GeneralSceneDescription are compared. Files the receiver has and a target
+    GeneralSceneDescription does not are listed in removed_files."""
+
+    base_scene = _scene(base)
+    target_scene = _scene(target)
+    delta = SceneDelta()
+    if base_scene is not None:
+        delta.base_hash = content_hash(base_scene)
+    if target_scene is not None:
+        delta.target_hash = content_hash(target_scene)
+    if base_scene is not None and target_scene is not None:
+        _Compare(delta).scenes(base_scene, target_scene)
+
+    base_mvr = base if isinstance(base, GeneralSceneDescription) else None
+    if isinstance(known, Mapping):
+        base_mvr = None
+    else:
+        known = {}
+    base_files = set(known) if base_mvr is None else set(_resources(base_mvr))
+    if isinstance(target, GeneralSceneDescription):
+        names = _resources(target)
+        for name in names:
+            if name in base_files:
+                if base_mvr is not None:
+                    if _same_member(base_mvr, target, name):
+                        continue
+                elif known[name] == _member_hash(target, name):
+                    continue
+            data = target.read_file(name)
+            delta.resources[name] = hashlib.sha256(data).hexdigest()
+            delta.files[name] = data
+        delta.removed_files = sorted(base_files.difference(names))
+    for name, data in (files or {}).items():
+        data = bytes(data)
+        if name in delta.removed_files:
+            delta.removed_files.remove(name)
+        if name in base_files:
+            if base_mvr is not None:
+                info = base_mvr._package.getinfo(name)  # type: ignore[union-attr]
+                same = (info.CRC, info.file_size) == (zlib.crc32(data), len(data))
+            else:
+                same = known[name] == hashlib.sha256(data).hexdigest()
+            if same:
+                delta.resources.pop(name, None)
+                delta.files.pop(name, None)
+                continue
+        delta.resources[name] = hashlib.sha256(data).hexdigest()
+        delta.files[name] = data
+    return delta
+
+
+class _Apply:
+    # the scene is indexed and validated, the changes are made to work, which
+    # is the scene or a clone of it. Nodes of a clone are found by their path
+    # from the root, so only the changed branches of a clone are copied.
+
+    def __init__(self, scene, work, delta: SceneDelta):
+        self.work = work
+        self.delta = delta
+        self.nodes, _ = _index(scene)
+        self.removed = set(delta.removed)
+        # copies, the same delta can be applied to several scenes
+        self.added = {uuid: deepcopy(node) for uuid, node in delta.added.items()}
+        self.copies: Dict[str, Any] = {}
+        if work is scene:
+            self.copies = {uuid: entry[0] for uuid, entry in self.nodes.items()}
+
+    def validate(self):
+        delta = self.delta
+        nodes = self.nodes
+        removed = self.removed
+        for uuid in removed:
+            if uuid not in nodes:
+                raise DeltaError(f"Removed node {uuid} is not in the scene")
+        for uuid in delta.fields:
+            if uuid not in nodes or uuid in removed:
+                raise DeltaError(f"Changed node {uuid} is not in the scene")
+        for uuid in delta.added:
+            if uuid in nodes and uuid not in removed:
+                raise DeltaError(f"Added node {uuid} is in the scene already")
+
+        # parent of each node afterwards, the nodes of rebuilt lists must all
+        # be placed somewhere
+        parents: Dict[str, Optional[str]] = {
+            uuid: key[0] for uuid, (_, key, _) in nodes.items() if uuid not in removed
+        }
+        placed: Set[str] = set()
+        rebuilt: Set[ListKey] = set()
+        for parent, name, uuids in delta.orders:
+            key = (parent, name)
+            if key in rebuilt:
+                raise DeltaError(f"List {name} of {parent} is given twice")
+            rebuilt.add(key)
+            owner = self.node(parent) if parent is not None else None
+            if parent is not None and owner is None:
+                raise DeltaError(f"Parent {parent} is not in the scene")
+            if (
+                parent is None
+                and name != LAYERS
+                and name not in AUX_DATA_NAMES.values()
+            ):
+                raise DeltaError(f"Scene has no list {name}")
+            if owner is not None and (
+                name not in CHILD_LIST_NAMES.values()
+                or not hasattr(owner, "child_list")
+            ):
+                raise DeltaError(f"{type(owner).__name__} has no list {name}")
+            for uuid in uuids:
+                node = self.node(uuid)
+                if node is None:
+                    raise DeltaError(f"Node {uuid} is not in the scene")
+                if uuid in placed:
+                    raise DeltaError(f"Node {uuid} is placed twice")
+                if _list_name(node) != name:
+                    raise DeltaError(f"{type(node).__name__} can not be in {name}")
+                placed.add(uuid)
+                parents[uuid] = parent
+        for uuid, (_, key, _) in nodes.items():
+            if uuid in removed or uuid in placed:
+                continue
+            if key in rebuilt or key[0] in removed:
+                raise DeltaError(f"Node {uuid} is left out")
+        for uuid in delta.added:
+            if uuid not in placed:
+                raise DeltaError(f"Added node {uuid} is not placed")
+        for uuid in placed:
+            seen = {uuid}
+            parent = parents.get(uuid)
+            while parent is not None:
+                if parent in seen:
+                    raise DeltaError(f"Node {uuid} would be nested in itself")
+                seen.add(parent)
+                parent = parents.get(parent)
+
+    def node(self, uuid: Optional[str]) -> Optional[Any]:
+        if uuid in self.delta.added:
+            return self.added[uuid]
+        entry = self.nodes.get(uuid)  # type: ignore[arg-type]
+        if entry is None or uuid in self.removed:
+            return None
+        return entry[0]
+
+    def copy(self, uuid: str) -> Any:
+        """Node of work, to be looked up before work is changed"""
+        node = self.added.get(uuid)
+        if node is None:
+            node = self.copies.get(uuid)
+        if node is None:
+            _, key, position = self.nodes[uuid]
+            node = self.copies[uuid] = self.container(key)[position]
+        return node
+
+    def container(self, key: ListKey) -> List[Any]:
+        parent, name = key
+        scene = self.work
+        if parent is not None:
+            owner = self.copy(parent)
+            if owner.child_list is None:
+                owner.child_list = ChildList()
+            return getattr(owner.child_list, name)
+        if name == LAYERS:
+            if scene.layers is None:
+                scene.layers = Layers()
+            return scene.layers.layers
+        if scene.aux_data is None:
+            scene.aux_data = AUXData()
+        return getattr(scene.aux_data, name)
+
+    def apply(self):
+        delta = self.delta
+        # look everything up first, positions are those before the changes
+        changed = [(self.copy(uuid), fields) for uuid, fields in delta.fields.items()]
+        orders = [
+            ((parent, name), [self.copy(uuid) for uuid in uuids])
+            for parent, name, uuids in delta.orders
+        ]
+        for node, fields in changed:
+            for field, value in fields.items():
+                setattr(node, field, deepcopy(value))
+        for key, nodes in orders:
+            self.container(key)[:] = nodes
+
+
+def apply_delta(scene, delta: SceneDelta, in_place: bool = False, verify: bool = True):
+    """Apply a delta made by make_delta() to a Scene (or the scene of a
+    GeneralSceneDescription) and return the changed Scene. The changes are
+    applied to a copy-on-write clone, or to the scene itself with
+    in_place=True. Raises DeltaError if the delta does not fit the scene or,
+    with verify, if the content hashes before or after do not match; the
+    scene is not changed then."""
+
+    scene = _scene(scene)
+    if scene is None:
+        raise DeltaError("There is no scene to apply the delta to")
+    if verify and delta.base_hash is not None:
+        if content_hash(scene) != delta.base_hash:
+            raise DeltaError("The delta was made from a different scene")
+    check = verify and delta.target_hash is not None
+    # with a target hash to check, the changes are tried on a clone first so
+    # that a scene changed in place is left as it was if they do not match
+    work = scene if in_place and not check else scene.clone()
+    changes = _Apply(scene, work, delta)
+    changes.validate()
+    changes.apply()
+    if check and content_hash(work) != delta.target_hash:
+        raise DeltaError("The scene differs from the one the delta was made for")
+    if in_place and work is not scene:
+        _Apply(scene, scene, delta).apply()
+        work = scene
+    return work
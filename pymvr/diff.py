@@ -0,0 +1,246 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Structural diff of two scenes. Nodes with a uuid (layers, objects in child
+# lists and AUXData entries) are indexed by uuid in one pass over each scene,
+# then their own fields are compared (nested child lists are compared as nodes
+# of their own), so the cost grows linearly with the scene size.
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from . import ChildList, GeneralSceneDescription, Scene
+from . import tracking
+from .cow import state_of
+
+# attributes of a ChildList which hold objects with uuid
+CHILD_LIST_FIELDS = (
+    "fixtures",
+    "focus_points",
+    "group_objects",
+    "scene_objects",
+    "supports",
+    "trusses",
+    "video_screens",
+    "projectors",
+)
+AUX_DATA_FIELDS = ("classes", "symdefs", "positions", "mapping_definitions")
+
+
+class NodeChange:
+    """A node present in both scenes which was moved and/or modified. fields
+    maps attribute names to (old, new) values."""
+
+    def __init__(
+        self,
+        uuid: str,
+        old: Any,
+        new: Any,
+        old_parent: Optional[str],
+        new_parent: Optional[str],
+        fields: Dict[str, Tuple[Any, Any]],
+    ):
+        self.uuid = uuid
+        self.old = old
+        self.new = new
+        self.old_parent = old_parent
+        self.new_parent = new_parent
+        self.fields = fields
+
+    @property
+    def moved(self) -> bool:
+        return self.old_parent != self.new_parent
+
+    @property
+    def modified(self) -> bool:
+        return bool(self.fields)
+
+    def __repr__(self):
+        changes = list(self.fields)
+        if self.moved:
+            changes.insert(0, f"moved {self.old_parent} -> {self.new_parent}")
+        return (
+            f"NodeChange({type(self.new).__name__} {self.uuid}: {', '.join(changes)})"
+        )
+
+
+class SceneDiff:
+    """Result of diff_scenes(). added and removed hold the nodes, moved and
+    modified hold NodeChange objects (a node can be in both). Parents are
+    uuids of the enclosing layer or object, None for AUXData entries."""
+
+    def __init__(self):
+        self.added: List[Any] = []
+        self.removed: List[Any] = []
+        self.moved: List[NodeChange] = []
+        self.modified: List[NodeChange] = []
+        self.parents: Dict[str, Optional[str]] = {}  # uuid of added node: parent
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.moved or self.modified)
+
+    def __repr__(self):
+        return (
+            f"SceneDiff(added={len(self.added)}, removed={len(self.removed)}, "
+            f"moved={len(self.moved)}, modified={len(self.modified)})"
+        )
+
+
+def _scene(obj) -> Optional[Scene]:
+    if isinstance(obj, GeneralSceneDescription):
+        return obj.scene
+    return obj
+
+
+def _walk(scene) -> Iterator[Tuple[Any, Optional[str], List[Any]]]:
+    """Yield (node, parent_uuid, list holding the node) for all nodes with
+    uuid, parents before their children"""
+
+    scene = _scene(scene)
+    if scene is None:
+        return
+    if scene.aux_data is not None:
+        for name in AUX_DATA_FIELDS:
+            container = getattr(scene.aux_data, name)
+            for node in container:
+                yield node, None, container
+    if scene.layers is None:
+        return
+    layers = scene.layers.layers
+    stack: List[Tuple[Any, Optional[str], List[Any]]] = [
+        (layer, None, layers) for layer in reversed(layers)
+    ]
+    while stack:
+        node, parent, container = stack.pop()
+        yield node, parent, container
+        child_list = getattr(node, "child_list", None)
+        if isinstance(child_list, ChildList):
+            for name in reversed(CHILD_LIST_FIELDS):
+                children = getattr(child_list, name)
+                stack.extend(
+                    (child, node.uuid, children) for child in reversed(children)
+                )
+
+
+def iter_nodes(scene) -> Iterator[Tuple[Any, Optional[str]]]:
+    """Yield (node, parent_uuid) for all nodes with uuid in the scene"""
+
+    for node, parent, _ in _walk(scene):
+        yield node, parent
+
+
+def _same_state(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    try:
+        if old == new:  # fast for nodes holding only plain values
+            return True
+    except (AttributeError, TypeError):
+        # a custom __eq__ comparing to a different type, compared field by
+        # field below
+        pass
+    if old.keys() != new.keys():
+        old_keys = {key for key in old if key[0] != "_"}
+        if old_keys != {key for key in new if key[0] != "_"}:
+            return False
+    for key, value in old.items():
+        if key[0] != "_" and not _same(value, new[key]):
+            return False
+    return True
+
+
+def _same(old: Any, new: Any) -> bool:
+    """Deep comparison of field values. Nodes, Matrix and Color compare field
+    by field, lists item by item (plain lists equal NodeLists), elements by
+    their XML. Identical objects are the same without comparing further."""
+
+    if old is new:
+        return True
+    if type(old) is not type(new):
+        if isinstance(old, list) and isinstance(new, list):  # NodeList
+            return len(old) == len(new) and all(map(_same, old, new))
+        return False
+    if hasattr(old, "__dict__"):  # nodes, Matrix, Color
+        return _same_state(state_of(old), state_of(new))
+    if old == new:
+        return True
+    if isinstance(old, (list, tuple)):  # NodeList too
+        return len(old) == len(new) and all(map(_same, old, new))
+    if type(old) is ElementTree.Element:
+        return ElementTree.tostring(old) == ElementTree.tostring(new)
+    return False
+
+
+def _changed_fields(old: Any, new: Any) -> Dict[str, Tuple[Any, Any]]:
+    """Own fields which differ, nested child lists are compared on their own"""
+
+    fields = {}
+    old_state = state_of(old)
+    new_state = state_of(new)
+    same_keys = old_state.keys() == new_state.keys()
+    for key in old_state if same_keys else {**old_state, **new_state}:
+        old_value = old_state.get(key)
+        new_value = new_state.get(key)
+        if old_value is new_value or (
+            type(old_value) is str and old_value == new_value
+        ):
+            continue
+        if key[0] == "_":
+            continue
+        if isinstance(old_value, ChildList) or isinstance(new_value, ChildList):
+            continue
+        if not _same(old_value, new_value):
+            fields[key] = (old_value, new_value)
+    if type(old) is not type(new):
+        fields["type"] = (type(old).__name__, type(new).__name__)
+    return fields
+
+
+def diff_scenes(old, new) -> SceneDiff:
+    """Compare two scenes (Scene or GeneralSceneDescription) by uuid"""
+
+    old_index = {node.uuid: (node, parent) for node, parent in iter_nodes(old)}
+    diff = SceneDiff()
+    seen = set()
+    for node, parent in iter_nodes(new):
+        uuid = node.uuid
+        seen.add(uuid)
+        match = old_index.get(uuid)
+        if match is None:
+            diff.added.append(node)
+            diff.parents[uuid] = parent
+            continue
+        old_node, old_parent = match
+        if old_node is node and old_parent == parent:
+            continue
+        old_hash = tracking.cached_hash(old_node)
+        if old_hash is not None and old_hash == tracking.cached_hash(node):
+            fields: Dict[str, Tuple[Any, Any]] = {}  # both hashed and equal
+        else:
+            fields = _changed_fields(old_node, node)
+        change = NodeChange(uuid, old_node, node, old_parent, parent, fields)
+        if change.moved:
+            diff.moved.append(change)
+        if change.modified:
+            diff.modified.append(change)
+    diff.removed = [node for uuid, (node, _) in old_index.items() if uuid not in seen]
+    return diff
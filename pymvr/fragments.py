@@ -0,0 +1,160 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Cached XML fragments for incremental saves.
+#
+# While a scene is serialized with GeneralSceneDescriptionWriter(incremental=
+# True), layers, child list entries and AUXData entries are not converted to
+# XML directly, child_xml() puts a placeholder element in their place. Once
+# the document is turned into bytes, each placeholder is replaced by the
+# serialized node, which is taken from the node's cache if the content hash
+# of the node and its depth in the document are unchanged. A node is dirty
+# when its content hash was dropped by a change below it (see tracking), so
+# only the changed nodes and their parents are serialized again.
+#
+# Outside of incremental saves and progress reports, child_writer() gives
+# the lists of children the to_xml() of the nodes, so plain saves do not pay
+# for the placeholders.
+#
+# Opaque XML (raw UserData of a read file, extra children of Data) is put in
+# the document the same way, written verbatim without copying or
+# re-indenting it.
+
+import operator
+import re
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Tuple, Union
+from xml.etree import ElementTree
+
+from . import progress, tracking
+from .cow import source_of
+
+TAG = "pymvr-fragment"
+INDENT = "    "
+
+_PLACEHOLDER = re.compile(rb'<pymvr-fragment ref="(\d+)" />')
+_state = threading.local()
+
+
+def child_xml(node: Any) -> "ElementTree.Element":
+    tracker = progress.current()
+    if tracker is not None:
+        tracker.node()
+    nodes = getattr(_state, "nodes", None)
+    if nodes is None:
+        return node.to_xml()
+    nodes.append(node)
+    return ElementTree.Element(TAG, ref=str(len(nodes) - 1))
+
+
+_direct = operator.methodcaller("to_xml")
+
+
+def child_writer() -> Callable[[Any], "ElementTree.Element"]:
+    """child_xml() while a writer collects placeholders or progress is
+    tracked, the to_xml() of the node otherwise. Looked up once per list of
+    children."""
+    if getattr(_state, "nodes", None) is None and progress.current() is None:
+        return _direct
+    return child_xml
+
+
+def collecting() -> bool:
+    """True while a writer serializes with placeholders"""
+    return getattr(_state, "nodes", None) is not None
+
+
+def opaque(xml: Union[bytes, "ElementTree.Element"]) -> "ElementTree.Element":
+    """Element for serialized XML or an element which the writer puts in the
+    document verbatim, without indenting it"""
+    nodes = getattr(_state, "nodes", None)
+    if nodes is None:
+        return ElementTree.fromstring(xml) if isinstance(xml, bytes) else xml
+    nodes.append(xml)
+    return ElementTree.Element(TAG, ref=str(len(nodes) - 1))
+
+
+class FragmentWriter:
+    """Serializes placeholder nodes of one document, reusing cached bytes"""
+
+    def __init__(self):
+        self.nodes: List[Any] = []
+        self.reused = 0
+        self.built = 0
+
+    def collect(self, function, *args):
+        """Call function (a to_xml) with placeholders for nested nodes"""
+        previous = getattr(_state, "nodes", None)
+        _state.nodes = self.nodes
+        try:
+            return function(*args)
+        finally:
+            _state.nodes = previous
+
+    def splice(self, data: bytes, element: "ElementTree.Element", depth: int) -> bytes:
+        """Replace placeholders in data, the serialized element at depth"""
+        depths: Dict[int, int] = {}
+        stack: List[Tuple["ElementTree.Element", int]] = [(element, depth)]
+        while stack:
+            parent, level = stack.pop()
+            for child in parent:
+                if child.tag == TAG:
+                    depths[int(child.get("ref", ""))] = level + 1
+                else:
+                    stack.append((child, level + 1))
+        if not depths:
+            return data
+
+        def replace(match: "re.Match") -> bytes:
+            ref = int(match.group(1))
+            return self.fragment(self.nodes[ref], depths[ref])
+
+        return _PLACEHOLDER.sub(replace, data)
+
+    def fragment(self, node: Any, depth: int) -> bytes:
+        if type(node) is bytes:
+            return node
+        if isinstance(node, ElementTree.Element):
+            return ElementTree.tostring(node, encoding="UTF-8", xml_declaration=False)
+        # an unchanged clone is serialized as its source, without copying it
+        node = source_of(node)
+        cached = node.__dict__.get("_xml_fragment")
+        if (
+            cached is not None
+            and cached[1] == depth
+            and cached[0] == tracking.content_hash(node)
+        ):
+            self.reused += 1
+            return cached[2]
+        self.built += 1
+        digest = tracking.content_hash(node)
+        element = self.collect(node.to_xml)
+        element.tail = None
+        if sys.version_info >= (3, 9):
+            ElementTree.indent(element, space=INDENT, level=depth)
+        data = ElementTree.tostring(element, encoding="UTF-8", xml_declaration=False)
+        data = self.splice(data, element, depth)
+        node.__dict__["_xml_fragment"] = (digest, depth, data)
+        return data
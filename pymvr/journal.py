@@ -0,0 +1,182 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Undo/redo journal of a scene.
+#
+# The journal listens to the tracked changes (see tracking.py) of nodes below
+# its root and keeps what was replaced: the old value of an attribute, or the
+# items a NodeList slice held. Undoing puts the old values back through the
+# same attributes and lists, so the content hashes, clones and listeners stay
+# up to date, and costs as much as the change did.
+
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Deque, Iterator, List, Optional, Tuple
+
+from . import tracking
+from .observe import batch_changes
+from .tracking import MISSING
+
+
+class Transaction:
+    """Changes undone and redone together"""
+
+    def __init__(self, label: Optional[str] = None):
+        self.label = label
+        # (target, key, old, new) as given to the tracking listeners
+        self.changes: List[Tuple[Any, Any, Any, Any]] = []
+
+    def __len__(self):
+        return len(self.changes)
+
+    def __str__(self):
+        return f"{self.label or 'Transaction'} ({len(self.changes)} changes)"
+
+
+class Journal:
+    """Records changes of root (usually a Scene) and everything in it, made
+    through attributes and lists of the nodes. Changes outside of
+    transaction() are undone one by one. At most limit transactions are kept,
+    None keeps all of them.
+
+    Changes which are not tracked (ElementTree elements changed in place) are
+    not recorded. Call close() when the journal is not needed anymore."""
+
+    def __init__(self, root: Any, limit: Optional[int] = 100):
+        self.root = root
+        self.limit = limit
+        self.undo_stack: Deque[Transaction] = deque(maxlen=limit)
+        self.redo_stack: List[Transaction] = []
+        self._current: Optional[Transaction] = None
+        self._replaying = False
+        # links all nodes to their parents and wraps their lists
+        tracking.track(root)
+        tracking.add_listener(self._record)
+
+    def close(self):
+        tracking.remove_listener(self._record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def can_undo(self) -> bool:
+        return bool(self.undo_stack)
+
+    @property
+    def can_redo(self) -> bool:
+        return bool(self.redo_stack)
+
+    @contextmanager
+    def transaction(self, label: Optional[str] = None) -> Iterator[Transaction]:
+        """Group the changes made in the with block into one undo step. If
+        the block raises, its changes are undone. Nested transactions are
+        part of the outer one."""
+
+        if self._current is not None:
+            yield self._current
+            return
+        transaction = self._current = Transaction(label)
+        with batch_changes():
+            try:
+                yield transaction
+            except BaseException:
+                self._current = None
+                self._apply(transaction, undo=True)
+                raise
+            self._current = None
+            self._push(transaction)
+
+    def undo(self) -> bool:
+        """Undo the last transaction, False if there is nothing to undo"""
+        self._check_idle()
+        if not self.undo_stack:
+            return False
+        transaction = self.undo_stack.pop()
+        self._apply(transaction, undo=True)
+        self.redo_stack.append(transaction)
+        return True
+
+    def redo(self) -> bool:
+        """Redo the last undone transaction, False if there is nothing to redo"""
+        self._check_idle()
+        if not self.redo_stack:
+            return False
+        transaction = self.redo_stack.pop()
+        self._apply(transaction, undo=False)
+        self.undo_stack.append(transaction)
+        return True
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+
+    def _check_idle(self):
+        if self._current is not None:
+            raise RuntimeError("Can not undo or redo inside of a transaction")
+
+    def _record(self, target: Any, key: Any, old: Any, new: Any):
+        if self._replaying or not tracking.is_within(
+            tracking.owner_of(target), self.root
+        ):
+            return
+        # link what was added, so its own changes are recorded too
+        items = new if isinstance(key, slice) or isinstance(new, list) else (new,)
+        for item in items:
+            if isinstance(item, tracking._tracked_types):
+                tracking.track(item)
+        if self._current is not None:
+            self._current.changes.append((target, key, old, new))
+        else:
+            transaction = Transaction()
+            transaction.changes.append((target, key, old, new))
+            self._push(transaction)
+
+    def _push(self, transaction: Transaction):
+        if transaction.changes:
+            self.undo_stack.append(transaction)
+            self.redo_stack.clear()
+
+    def _apply(self, transaction: Transaction, undo: bool):
+        self._replaying = True
+        try:
+            with batch_changes():
+                self._replay(transaction, undo)
+        finally:
+            self._replaying = False
+
+    def _replay(self, transaction: Transaction, undo: bool):
+        changes = reversed(transaction.changes) if undo else transaction.changes
+        for target, key, old, new in changes:
+            present, value = (new, old) if undo else (old, new)
+            if isinstance(key, slice):
+                target[key.start : key.start + len(present)] = value
+            elif value is MISSING:
+                del target.__dict__[key]
+                tracking.invalidate(target)
+            else:
+                setattr(target, key, value)
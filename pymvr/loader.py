@@ -0,0 +1,156 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Loading many MVR files in worker processes.
+
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+from . import GeneralSceneDescription
+from .snapshot import load_snapshot, save_snapshot
+
+
+class LoadResult:
+    """Outcome of loading one file: value is the result of the function given
+    to load_many() or the GeneralSceneDescription, error the exception raised
+    while loading the file"""
+
+    def __init__(self, path: str, value: Any = None, error: Optional[Exception] = None):
+        self.path = path
+        self.value = value
+        self.error = error
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self):
+        return f"{self.path}: {self.error if self.error is not None else 'ok'}"
+
+
+def _picklable(error: Exception) -> Exception:
+    try:
+        pickle.dumps(error)
+    except Exception:
+        return RuntimeError(f"{type(error).__name__}: {error}")
+    return error
+
+
+def _load_one(
+    path: str, function: Optional[Callable[[Any], Any]], remote: bool
+) -> LoadResult:
+    try:
+        with GeneralSceneDescription(path) as mvr:
+            # a snapshot is much faster to send back than a pickle
+            value = function(mvr) if function is not None else save_snapshot(mvr)
+        if remote and function is not None:
+            # fail this file only, not the whole chunk, on an unpicklable value
+            pickle.dumps(value)
+    except Exception as error:
+        return LoadResult(path, error=_picklable(error))
+    return LoadResult(path, value)
+
+
+def _load_chunk(
+    paths: List[str], function: Optional[Callable[[Any], Any]], remote: bool = True
+) -> List[LoadResult]:
+    return [_load_one(path, function, remote) for path in paths]
+
+
+def _chunks(paths: Iterable[str], size: int) -> Iterator[List[str]]:
+    iterator = iter(paths)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def load_many(
+    paths: Iterable[Union[str, "os.PathLike"]],
+    workers: Optional[int] = None,
+    chunksize: int = 1,
+    function: Optional[Callable[[Any], Any]] = None,
+) -> Iterator[LoadResult]:
+    """Load MVR files in a pool of worker processes and yield a LoadResult
+    for each file as soon as its chunk of chunksize files is done, in
+    completion order. workers defaults to the number of CPUs, workers=1 loads
+    the files in this process.
+
+    function is called in the worker with the opened GeneralSceneDescription
+    and its (picklable) return value is sent back, use it to return small
+    summaries or data from packed files. Without it, the parsed
+    GeneralSceneDescription is sent back, without access to packed files.
+
+    Errors are reported per file, a value which cannot be pickled fails its
+    file. If a worker process dies, the files of the
+    chunks which were being loaded fail with BrokenProcessPool and the
+    remaining files are loaded in a new pool."""
+
+    names = (os.fspath(path) for path in paths)
+    chunks = _chunks(names, max(1, chunksize))
+    if workers == 1:
+        for chunk in chunks:
+            for result in _load_chunk(chunk, function, remote=False):
+                yield _finish(result, function)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending: Dict["Future", List[str]] = {}
+    try:
+        while True:
+            # a few chunks ahead per worker, so results do not pile up
+            for chunk in islice(chunks, 2 * workers - len(pending)):
+                pending[executor.submit(_load_chunk, chunk, function)] = chunk
+            if not pending:
+                return
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            broken = False
+            for future in done:
+                chunk = pending.pop(future)
+                try:
+                    results = future.result()
+                except Exception as error:
+                    broken = broken or isinstance(error, BrokenProcessPool)
+                    results = [LoadResult(path, error=error) for path in chunk]
+                for result in results:
+                    yield _finish(result, function)
+            if broken:
+                executor.shutdown(wait=False)
+                executor = ProcessPoolExecutor(max_workers=workers)
+    finally:
+        for future in pending:  # the consumer stopped early
+            future.cancel()
+        executor.shutdown(wait=True)
+
+
+def _finish(result: LoadResult, function: Optional[Callable[[Any], Any]]) -> LoadResult:
+    if result.ok and function is None:
+        result.value = load_snapshot(result.value)
+    return result
@@ -0,0 +1,302 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Three-way merge of scenes. Changes between base and theirs are replayed on a
+# copy of ours, nodes are matched by uuid through indexes built in one pass
+# over each scene. A field changed on both sides to different values is a
+# conflict, ours is kept unless resolve="theirs".
+
+from copy import deepcopy
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import (
+    ChildList,
+    Class,
+    FocusPoint,
+    Fixture,
+    GroupObject,
+    Layer,
+    MappingDefinition,
+    Position,
+    Projector,
+    SceneObject,
+    Support,
+    Symdef,
+    Truss,
+    VideoScreen,
+)
+from .diff import _changed_fields, _same, _scene, _walk
+from .snapshot import load_snapshot, save_snapshot
+
+
+def _copy(obj: Any) -> Any:
+    # snapshot round trip is much faster than deepcopy for large trees
+    try:
+        return load_snapshot(save_snapshot(obj))
+    except TypeError:  # attributes which snapshots do not support
+        return deepcopy(obj)
+
+
+# where nodes of a type live in their parent ChildList
+CHILD_LIST_NAMES = {
+    Fixture: "fixtures",
+    FocusPoint: "focus_points",
+    GroupObject: "group_objects",
+    SceneObject: "scene_objects",
+    Support: "supports",
+    Truss: "trusses",
+    VideoScreen: "video_screens",
+    Projector: "projectors",
+}
+AUX_DATA_NAMES = {
+    Class: "classes",
+    Symdef: "symdefs",
+    Position: "positions",
+    MappingDefinition: "mapping_definitions",
+}
+
+# field names used for structural conflicts
+PARENT = "parent"
+DELETED = "deleted"
+ADDED = "added"
+
+
+class MergeConflict:
+    """A field (or PARENT, DELETED, ADDED) of the node with the uuid was
+    changed differently in ours and theirs"""
+
+    def __init__(self, uuid: str, field: str, base: Any, ours: Any, theirs: Any):
+        self.uuid = uuid
+        self.field = field
+        self.base = base
+        self.ours = ours
+        self.theirs = theirs
+
+    def __repr__(self):
+        return (
+            f"MergeConflict({self.uuid} {self.field}: {self.ours!r} != {self.theirs!r})"
+        )
+
+
+class MergeResult:
+    def __init__(self, scene, conflicts: List[MergeConflict]):
+        self.scene = scene
+        self.conflicts = conflicts
+
+    def __repr__(self):
+        return f"MergeResult({len(self.conflicts)} conflicts)"
+
+
+class _Merge:
+    def __init__(self, scene, resolve: str):
+        self.scene = scene
+        self.resolve = resolve
+        self.conflicts: List[MergeConflict] = []
+        # uuid: (node, parent uuid, list holding the node)
+        self.index: Dict[str, Tuple[Any, Optional[str], List[Any]]] = {
+            node.uuid: (node, parent, container)
+            for node, parent, container in _walk(scene)
+        }
+
+    def conflict(
+        self, uuid: str, field: str, base: Any, ours: Any, theirs: Any
+    ) -> bool:
+        """Record a conflict, True if theirs should win"""
+        self.conflicts.append(MergeConflict(uuid, field, base, ours, theirs))
+        return self.resolve == "theirs"
+
+    def container(self, node: Any, parent: Optional[str]) -> Optional[List[Any]]:
+        """List in the merged scene where the node belongs under the parent"""
+
+        aux_name = AUX_DATA_NAMES.get(type(node))
+        if aux_name is not None:
+            return getattr(self.scene.aux_data, aux_name)
+        if isinstance(node, Layer):
+            return self.scene.layers.layers
+        entry = self.index.get(parent) if parent is not None else None
+        name = CHILD_LIST_NAMES.get(type(node))
+        if entry is None or name is None or not hasattr(entry[0], "child_list"):
+            return None
+        owner = entry[0]
+        if owner.child_list is None:
+            owner.child_list = ChildList()
+        return getattr(owner.child_list, name)
+
+    def insert(self, node: Any, parent: Optional[str], base_uuids) -> bool:
+        container = self.container(node, parent)
+        if container is None:
+            return False
+        node = _copy(node)
+        container.append(node)
+        # nested nodes which exist in base are placed by their own move
+        dropped = set()
+        for nested, nested_parent, nested_container in list(_walk_node(node)):
+            if nested_parent in dropped:
+                dropped.add(nested.uuid)
+            elif nested.uuid in base_uuids or nested.uuid in self.index:
+                nested_container.remove(nested)
+                dropped.add(nested.uuid)
+            else:
+                self.index[nested.uuid] = (nested, nested_parent, nested_container)
+        self.index[node.uuid] = (node, parent, container)
+        return True
+
+    def remove(self, uuid: str):
+        node, _, container = self.index.pop(uuid)
+        container.remove(node)
+        for nested, _, _ in _walk_node(node):
+            self.index.pop(nested.uuid, None)
+
+    def move(self, uuid: str, parent: Optional[str]) -> bool:
+        node, _, container = self.index[uuid]
+        target = self.container(node, parent)
+        if target is None or _contains(node, parent):
+            return False
+        container.remove(node)
+        target.append(node)
+        self.index[uuid] = (node, parent, target)
+        return True
+
+
+def _walk_node(node: Any):
+    """Nodes nested in the child list of node, with parent uuid and list"""
+
+    child_list = getattr(node, "child_list", None)
+    if not isinstance(child_list, ChildList):
+        return
+    for name in CHILD_LIST_NAMES.values():
+        children = getattr(child_list, name)
+        for child in children:
+            yield child, node.uuid, children
+            yield from _walk_node(child)
+
+
+def _contains(node: Any, uuid: Optional[str]) -> bool:
+    return node.uuid == uuid or any(i.uuid == uuid for i, _, _ in _walk_node(node))
+
+
+def merge_scenes(
+    base, ours, theirs, resolve: str = "ours", in_place: bool = False
+) -> MergeResult:
+    """Three-way merge of scenes (Scene or GeneralSceneDescription) matched by
+    uuid. Returns a MergeResult with the merged Scene and the list of
+    conflicts. Conflicting changes keep ours, or theirs with resolve="theirs".
+
+    The merged scene is a copy, with in_place=True the changes are applied to
+    ours directly, which saves copying large scenes."""
+
+    if resolve not in ("ours", "theirs"):
+        raise ValueError(f"resolve must be 'ours' or 'theirs', not {resolve!r}")
+    base_index = {node.uuid: (node, parent) for node, parent, _ in _walk(base)}
+    ours_index = {node.uuid: (node, parent) for node, parent, _ in _walk(ours)}
+    merged_scene = _scene(ours) if in_place else _copy(_scene(ours))
+    merge = _Merge(merged_scene, resolve)
+
+    theirs_uuids = set()
+    moves: List[Tuple[str, Optional[str], Optional[str]]] = []
+    for node, parent, _ in _walk(theirs):
+        uuid = node.uuid
+        theirs_uuids.add(uuid)
+        base_entry = base_index.get(uuid)
+        ours_entry = ours_index.get(uuid)
+
+        if base_entry is None:  # added in theirs
+            if ours_entry is None:
+                if uuid not in merge.index and not merge.insert(
+                    node, parent, base_index
+                ):
+                    merge.conflict(uuid, PARENT, None, None, parent)
+            elif _changed_fields(ours_entry[0], node):
+                if merge.conflict(uuid, ADDED, None, ours_entry[0], node):
+                    _replace_fields(
+                        merge, uuid, node, _changed_fields(ours_entry[0], node)
+                    )
+            continue
+
+        base_node, base_parent = base_entry
+        if ours_entry is None:  # deleted in ours
+            if _changed_fields(base_node, node) and merge.conflict(
+                uuid, DELETED, base_node, None, node
+            ):
+                merge.insert(node, parent, base_index)
+            continue
+
+        ours_node, ours_parent = ours_entry
+        if parent != base_parent and parent != ours_parent:
+            if ours_parent == base_parent:
+                moves.append((uuid, parent, base_parent))
+            elif merge.conflict(uuid, PARENT, base_parent, ours_parent, parent):
+                moves.append((uuid, parent, ours_parent))
+
+        if node is base_node:
+            continue
+        changes = {}
+        for field, (base_value, theirs_value) in _changed_fields(
+            base_node, node
+        ).items():
+            ours_value = getattr(ours_node, field, None)
+            if _same(ours_value, base_value):
+                changes[field] = theirs_value
+            elif not _same(ours_value, theirs_value):
+                if merge.conflict(uuid, field, base_value, ours_value, theirs_value):
+                    changes[field] = theirs_value
+        if changes and uuid in merge.index:
+            target = merge.index[uuid][0]
+            for field, value in changes.items():
+                setattr(target, field, deepcopy(value))
+
+    for uuid, parent, previous in moves:
+        if uuid in merge.index and not merge.move(uuid, parent):
+            merge.conflict(uuid, PARENT, previous, previous, parent)
+
+    # deleted in theirs, children first so that a kept child keeps its parents
+    keep = set()
+    for uuid, (_, parent) in ours_index.items():
+        if uuid not in base_index:  # added in ours
+            while parent is not None and parent not in keep:
+                keep.add(parent)
+                parent = ours_index[parent][1] if parent in ours_index else None
+    for uuid in reversed(list(base_index)):
+        if uuid in theirs_uuids or uuid not in merge.index:
+            continue
+        base_node = base_index[uuid][0]
+        ours_node = ours_index[uuid][0]
+        modified = ours_node is not base_node and _changed_fields(base_node, ours_node)
+        if (modified or uuid in keep) and not merge.conflict(
+            uuid, DELETED, base_node, ours_node, None
+        ):
+            parent = merge.index[uuid][1]
+            while parent is not None and parent not in keep:
+                keep.add(parent)
+                parent = merge.index[parent][1] if parent in merge.index else None
+            continue
+        merge.remove(uuid)
+
+    return MergeResult(merged_scene, merge.conflicts)
+
+
+def _replace_fields(merge: _Merge, uuid: str, node: Any, fields: Dict[str, Any]):
+    target = merge.index[uuid][0]
+    for field in fields:
+        setattr(target, field, deepcopy(getattr(node, field, None)))
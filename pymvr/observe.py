@@ -0,0 +1,228 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Change notifications.
+#
+# An Observer listens to the tracked changes (see tracking.py) below its root
+# and reports them as a ChangeSet: nodes added to and removed from lists, and
+# the fields of nodes which were modified. Within batch_changes() (and journal
+# transactions, undo and redo) the changes are collected and coalesced, and
+# every observer is called once at the end of the outermost batch.
+
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set, Tuple
+
+from . import BaseNode
+from . import tracking
+
+# batches are per thread: depth of batch_changes() and the changes collected
+# for each observer, keyed by its id
+_state = threading.local()
+
+
+class ChangeSet:
+    """Coalesced changes. Nodes added or removed in a batch are reported as
+    such, without the changes of their fields or of the nodes nested in them.
+    Nodes added and removed again are not reported at all."""
+
+    def __init__(self):
+        # keyed by id(), some nodes (Geometry3D) compare by value; dicts keep
+        # the order in which nodes changed first
+        self._added: Dict[int, Any] = {}
+        self._removed: Dict[int, Any] = {}
+        self._modified: Dict[int, Tuple[Any, Set[str]]] = {}
+
+    @property
+    def added(self) -> List[Any]:
+        return list(self._added.values())
+
+    @property
+    def removed(self) -> List[Any]:
+        return list(self._removed.values())
+
+    @property
+    def modified(self) -> List[Tuple[Any, Set[str]]]:
+        """Modified nodes with the names of their changed fields"""
+        return list(self._modified.values())
+
+    def fields(self, node: Any) -> Set[str]:
+        """Names of the changed fields of node, empty if it was not modified"""
+        entry = self._modified.get(id(node))
+        return set(entry[1]) if entry is not None else set()
+
+    def __bool__(self):
+        return bool(self._added or self._removed or self._modified)
+
+    def __len__(self):
+        return len(self._added) + len(self._removed) + len(self._modified)
+
+    def __repr__(self):
+        return (
+            f"<ChangeSet added={len(self._added)} removed={len(self._removed)} "
+            f"modified={len(self._modified)}>"
+        )
+
+    def add(self, node: Any):
+        key = id(node)
+        if key in self._removed:
+            del self._removed[key]  # moved, its old and new list are modified
+        else:
+            self._added[key] = node
+        self._modified.pop(key, None)
+
+    def remove(self, node: Any):
+        key = id(node)
+        if key in self._added:
+            del self._added[key]
+        else:
+            self._removed[key] = node
+        self._modified.pop(key, None)
+
+    def prune(self):
+        """Drop modifications of nodes nested in added or removed nodes"""
+        if not (self._added or self._removed):
+            return
+        for key, (node, _) in list(self._modified.items()):
+            parent = node.__dict__.get("_parent")
+            ancestor = parent() if parent is not None else None
+            while ancestor is not None:
+                if id(ancestor) in self._added or id(ancestor) in self._removed:
+                    del self._modified[key]
+                    break
+                parent = ancestor.__dict__.get("_parent")
+                ancestor = parent() if parent is not None else None
+
+    def modify(self, node: Any, field: str):
+        key = id(node)
+        if key in self._added or key in self._removed:
+            return
+        entry = self._modified.get(key)
+        if entry is None:
+            self._modified[key] = (node, {field})
+        else:
+            entry[1].add(field)
+
+
+def _field_of(owner: Any, value: Any) -> Optional[str]:
+    for key, item in owner.__dict__.items():
+        if item is value and key[0] != "_":
+            return key
+    for key, item in owner.__dict__.items():  # rows of a Matrix
+        if isinstance(item, list) and any(row is value for row in item):
+            return key
+    return None
+
+
+class Observer:
+    """Calls callback with a ChangeSet when root (usually a Scene) or anything
+    in it changes through attributes and lists of the nodes. Changes of a
+    Matrix or Color are reported as a change of the field of the node which
+    holds it. Call close() to stop observing."""
+
+    def __init__(self, root: Any, callback: Callable[[ChangeSet], None]):
+        self.root = root
+        self.callback = callback
+        # links all nodes to their parents and wraps their lists
+        tracking.track(root)
+        tracking.add_listener(self._record)
+
+    def close(self):
+        tracking.remove_listener(self._record)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def _record(self, target: Any, key: Any, old: Any, new: Any):
+        owner = tracking.owner_of(target)
+        if not tracking.is_within(owner, self.root):
+            return
+        pending = getattr(_state, "pending", None)
+        if pending is None:
+            changes = ChangeSet()
+        else:
+            entry = pending.get(id(self))
+            if entry is None:
+                entry = pending[id(self)] = (self, ChangeSet())
+            changes = entry[1]
+        if isinstance(key, slice):
+            for item in old:
+                if isinstance(item, BaseNode):
+                    changes.remove(item)
+            for item in new:
+                if isinstance(item, BaseNode):
+                    tracking.track(item)  # links it, see Journal
+                    changes.add(item)
+            field = _field_of(owner, target)
+        else:
+            if isinstance(new, tracking._tracked_types):
+                tracking.track(new)
+            elif isinstance(new, list):
+                for item in new:
+                    if isinstance(item, tracking._tracked_types):
+                        tracking.track(item)
+            field = key
+        # Matrix and Color are fields of a node
+        while field is not None and not isinstance(owner, BaseNode):
+            parent = owner.__dict__.get("_parent")
+            value, owner = owner, parent() if parent is not None else None
+            field = _field_of(owner, value) if owner is not None else None
+        if field is not None and owner is not None:
+            changes.modify(owner, field)
+        if pending is None:
+            self._deliver(changes)
+
+    def flush(self):
+        """Deliver the changes collected in the batch of this thread now"""
+        pending = getattr(_state, "pending", None)
+        entry = pending.pop(id(self), None) if pending is not None else None
+        if entry is not None:
+            self._deliver(entry[1])
+
+    def _deliver(self, changes: ChangeSet):
+        changes.prune()
+        if changes:
+            self.callback(changes)
+
+
+@contextmanager
+def batch_changes() -> Iterator[None]:
+    """Collect the changes made in the with block and deliver them to the
+    observers once, at the end of the outermost batch of the thread"""
+
+    depth = getattr(_state, "depth", 0)
+    if depth == 0:
+        _state.pending = {}
+    _state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _state.depth = depth
+        if depth == 0:
+            pending, _state.pending = _state.pending, None
+            for observer, changes in pending.values():
+                observer._deliver(changes)
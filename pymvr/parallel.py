@@ -0,0 +1,87 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Parallel building of the layers of one scene.
+#
+# Building the nodes from the parsed XML is the slow part of loading a large
+# scene. On free-threaded Python builds, the layers are built in worker
+# threads. Worker processes do not help: loading their results (snapshots or
+# pickles) in the parent costs about as much as building the nodes.
+#
+# The loading thread takes the layers in order, so loading still yields after
+# each layer (progress, load_async). The tracker of the loading thread is
+# handed to the workers, which count their nodes and check for cancellation.
+
+import sys
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List, Optional
+from xml.etree.ElementTree import Element
+
+from . import Layer
+from .progress import Tracker
+
+
+def free_threaded() -> bool:
+    """True when running without the GIL"""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def read_layers(
+    elements: List["Element"], workers: int, tracker: Optional["Tracker"] = None
+) -> Iterator["Layer"]:
+    """Layer objects of the Layer elements in order, built by workers threads
+    on free-threaded builds, one by one otherwise. The workers count their
+    nodes towards tracker and check its cancel token."""
+
+    if workers > 1 and not free_threaded():
+        warnings.warn(
+            "workers > 1 needs a free-threaded Python build, "
+            "the layers are built one by one",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+    if workers < 2 or len(elements) < 2 or not free_threaded():
+        for element in elements:
+            yield Layer(xml_node=element)
+        return
+
+    def build(element: "Element") -> "Layer":
+        # the tracker of the loading thread is thread local
+        if tracker is None:
+            return Layer(xml_node=element)
+        with tracker.active():
+            return Layer(xml_node=element)
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    futures = [executor.submit(build, element) for element in elements]
+    try:
+        for future in futures:
+            yield future.result()
+    finally:
+        # stopped early (cancelled or failed), do not build the other layers
+        for future in futures:
+            future.cancel()
+        executor.shutdown(wait=True)
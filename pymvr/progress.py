@@ -0,0 +1,170 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Progress reports and cooperative cancellation of loading and saving.
+#
+# Loading and writing run in steps (see aio.py). While a step runs with a
+# Tracker installed (thread local), the nodes read from child lists and the
+# nodes serialized count towards the progress and check the CancelToken, the
+# progress callback is called after each step. Without a callback and a token
+# no tracker is installed. _installed counts the installed trackers of all
+# threads, while it is 0 the checks are a global lookup.
+
+import threading
+from contextlib import contextmanager
+from typing import Callable, Generator, Iterator, Optional
+
+_state = threading.local()
+_DONE = object()
+_lock = threading.Lock()
+# number of trackers installed in all threads, see current()
+_installed = 0
+
+
+class Cancelled(Exception):
+    """Raised when loading or saving was stopped with a CancelToken"""
+
+
+class CancelToken:
+    """Cancels an operation from another thread (a UI or a request handler),
+    the operation raises Cancelled at its next check"""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise Cancelled()
+
+
+class Progress:
+    """State of a load or save, passed to the progress callback. bytes_done
+    counts the bytes of the GeneralSceneDescription.xml read when loading and
+    the bytes written to the archive when saving. Totals are None when not
+    known (yet)."""
+
+    def __init__(self, operation: str):
+        self.operation = operation
+        self.bytes_done = 0
+        self.bytes_total: Optional[int] = None
+        self.nodes = 0
+        self.layers_done = 0
+        self.layers_total: Optional[int] = None
+        self.files_done = 0
+        self.files_total: Optional[int] = None
+
+    def __repr__(self):
+        return (
+            f"<Progress {self.operation} bytes={self.bytes_done}/{self.bytes_total}"
+            f" nodes={self.nodes} layers={self.layers_done}/{self.layers_total}"
+            f" files={self.files_done}/{self.files_total}>"
+        )
+
+
+class Tracker:
+    def __init__(
+        self,
+        operation: str,
+        callback: Optional[Callable[[Progress], None]] = None,
+        cancel: Optional[CancelToken] = None,
+    ):
+        self.progress = Progress(operation)
+        self.callback = callback
+        self.cancel = cancel
+
+    def node(self):
+        self.progress.nodes += 1
+        if self.cancel is not None:
+            self.cancel.check()
+
+    def step(self):
+        if self.cancel is not None:
+            self.cancel.check()
+        if self.callback is not None:
+            self.callback(self.progress)
+
+    @contextmanager
+    def active(self) -> Iterator["Tracker"]:
+        global _installed
+        previous = getattr(_state, "tracker", None)
+        _state.tracker = self
+        with _lock:
+            _installed += 1
+        try:
+            yield self
+        finally:
+            with _lock:
+                _installed -= 1
+            _state.tracker = previous
+
+
+def tracker(
+    operation: str,
+    callback: Optional[Callable[[Progress], None]],
+    cancel: Optional[CancelToken],
+) -> Optional[Tracker]:
+    if callback is None and cancel is None:
+        return None
+    return Tracker(operation, callback, cancel)
+
+
+def current() -> Optional[Tracker]:
+    """Tracker of the running step, None if progress is not tracked"""
+    if not _installed:
+        return None
+    return getattr(_state, "tracker", None)
+
+
+def layer_done():
+    """Called after each layer is serialized"""
+    step_tracker = current()
+    if step_tracker is not None:
+        step_tracker.progress.layers_done += 1
+        step_tracker.step()
+
+
+def run(steps: Generator[None, None, None], step_tracker: Optional[Tracker]):
+    """Run all steps, reporting progress and checking for cancellation after
+    each one. Cancelled is thrown into the steps, so they clean up."""
+    if step_tracker is None:
+        for _ in steps:
+            pass
+        return
+    while True:
+        with step_tracker.active():
+            if next(steps, _DONE) is _DONE:
+                return
+        try:
+            step_tracker.step()
+        except Cancelled as error:
+            with step_tracker.active():
+                steps.throw(error)
+            raise
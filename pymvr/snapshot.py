@@ -0,0 +1,442 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Compact binary snapshots of the pymvr object model, for handing scenes
+# between processes and services without going through XML.
+#
+# Layout: MAGIC, format version byte and one encoded value. Every value starts
+# with a tag byte. Strings are written once and referred to by their index in
+# the string table afterwards, so repeated gdtf_spec, gdtf_mode, classing and
+# attribute names cost a few bytes. Nodes are written as a shape (class name
+# and attribute names, defined on first use) followed by the attribute values
+# only. Matrices are packed as 12 doubles and addresses as three varints. Only
+# pymvr classes can be created when loading.
+
+import enum
+import os
+import struct
+import sys
+from typing import Any, Dict, List, Optional, Tuple, Union
+from xml.etree import ElementTree
+
+from . import value as _value
+from .cow import state_of
+from .tracking import NodeList
+from . import Address, BaseNode, GeneralSceneDescription
+
+MAGIC = b"PYMVRSNP"
+FORMAT_VERSION = 1
+
+_NONE = 0
+_TRUE = 1
+_FALSE = 2
+_INT = 3
+_FLOAT = 4
+_STR = 5
+_STR_REF = 6
+_LIST = 7
+_TUPLE = 8
+_DICT = 9
+_NODE = 10
+_MATRIX = 11
+_MATRIX_DEFAULT = 12
+_MATRIX_LIST = 13
+_COLOR = 14
+_ADDRESS = 15
+_ENUM = 16
+_ELEMENT = 17
+_BYTES = 18
+_SHAPE = 19
+
+_DOUBLE = struct.Struct("<d")
+_MATRIX_DOUBLES = _value.MATRIX_DOUBLES
+_ADDRESS_FIELDS = {"dmx_break", "universe", "address"}
+
+_classes: Dict[str, type] = {}
+
+
+def _snapshot_classes() -> Dict[str, type]:
+    """Classes which can be created when loading a snapshot"""
+    if not _classes:
+        for name, obj in vars(sys.modules[__package__]).items():
+            if isinstance(obj, type) and (
+                issubclass(obj, (BaseNode, enum.Enum))
+                or obj in (GeneralSceneDescription, _value.Matrix, _value.Color)
+            ):
+                _classes[name] = obj
+    return _classes
+
+
+class _Writer:
+    def __init__(self):
+        self.out = bytearray()
+        self.strings: Dict[str, int] = {}
+        self.shapes: Dict[Tuple[Any, ...], int] = {}
+
+    def varint(self, number: int):
+        out = self.out
+        while number > 0x7F:
+            out.append((number & 0x7F) | 0x80)
+            number >>= 7
+        out.append(number)
+
+    def signed(self, number: int):
+        self.varint(number << 1 if number >= 0 else ((-number) << 1) - 1)
+
+    def string(self, text: str):
+        index = self.strings.get(text)
+        if index is not None:
+            self.out.append(_STR_REF)
+            self.varint(index)
+            return
+        self.strings[text] = len(self.strings)
+        data = text.encode("utf-8")
+        self.out.append(_STR)
+        self.varint(len(data))
+        self.out += data
+
+    def value(self, obj: Any):
+        out = self.out
+        obj_type = type(obj)
+        if obj_type is str:
+            self.string(obj)
+        elif obj is None:
+            out.append(_NONE)
+        elif obj_type is bool:
+            out.append(_TRUE if obj else _FALSE)
+        elif obj_type is int:
+            out.append(_INT)
+            self.signed(obj)
+        elif obj_type is float:
+            out.append(_FLOAT)
+            out += _DOUBLE.pack(obj)
+        elif obj_type is list or obj_type is NodeList:
+            out.append(_LIST)
+            self.varint(len(obj))
+            for item in obj:
+                self.value(item)
+        elif obj_type is _value.Matrix:
+            self.matrix(obj)
+        elif obj_type is _value.Color:
+            out.append(_COLOR)
+            self.value(obj.x)
+            self.value(obj.y)
+            self.value(obj.Y)
+        elif isinstance(obj, (BaseNode, GeneralSceneDescription)):
+            self.node(obj)
+        elif isinstance(obj, enum.Enum):
+            out.append(_ENUM)
+            self.string(obj_type.__name__)
+            self.string(obj.name)
+        elif obj_type is tuple:
+            out.append(_TUPLE)
+            self.varint(len(obj))
+            for item in obj:
+                self.value(item)
+        elif obj_type is dict:
+            out.append(_DICT)
+            self.varint(len(obj))
+            for key, item in obj.items():
+                self.value(key)
+                self.value(item)
+        elif isinstance(obj, ElementTree.Element):
+            data = ElementTree.tostring(obj, encoding="utf-8")
+            out.append(_ELEMENT)
+            self.varint(len(data))
+            out += data
+        elif isinstance(obj, (bytes, bytearray)):
+            out.append(_BYTES)
+            self.varint(len(obj))
+            out += obj
+        else:
+            raise TypeError(f"Cannot snapshot {obj_type.__name__}")
+
+    def matrix(self, obj: "_value.Matrix"):
+        rows = obj.matrix
+        packed = _value.pack_matrix(rows)
+        if packed is not None:
+            self.out.append(_MATRIX)
+            self.out += packed
+        elif repr(rows) == _value.DEFAULT_MATRIX:
+            self.out.append(_MATRIX_DEFAULT)
+        else:
+            self.out.append(_MATRIX_LIST)
+            self.value(rows)
+
+    def node(self, obj: Any):
+        state = [(k, v) for k, v in state_of(obj).items() if not k.startswith("_")]
+        if type(obj) is Address and {k for k, _ in state} == _ADDRESS_FIELDS:
+            if all(type(v) is int for _, v in state):
+                self.out.append(_ADDRESS)
+                self.signed(obj.dmx_break)
+                self.signed(obj.address)
+                self.signed(obj.universe)
+                return
+        shape = (type(obj), *(key for key, _ in state))
+        index = self.shapes.get(shape)
+        if index is None:
+            self.shapes[shape] = len(self.shapes)
+            self.out.append(_SHAPE)
+            self.string(type(obj).__name__)
+            self.varint(len(state))
+            for key, _ in state:
+                self.string(key)
+        else:
+            self.out.append(_NODE)
+            self.varint(index)
+        for _, item in state:
+            self.value(item)
+
+
+class _Reader:
+    def __init__(self, data: Union[bytes, bytearray, memoryview]):
+        self.data = bytes(data)
+        self.position = 0
+        self.strings: List[str] = []
+        self.shapes: List[Tuple[Any, Tuple[str, ...]]] = []
+        self.classes = _snapshot_classes()
+        # indexed by tag
+        self.handlers = [
+            self._none,
+            self._true,
+            self._false,
+            self.signed,
+            self._float,
+            self._str,
+            self._str_ref,
+            self._list,
+            self._tuple,
+            self._dict,
+            self._node,
+            self._matrix,
+            self._matrix_default,
+            self._matrix_list,
+            self._color,
+            self._address,
+            self._enum,
+            self._element,
+            self._bytes,
+            self._shape,
+        ]
+
+    def varint(self) -> int:
+        data = self.data
+        position = self.position
+        result = 0
+        shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                break
+            shift += 7
+        self.position = position
+        return result
+
+    def signed(self) -> int:
+        number = self.varint()
+        return (number >> 1) if not number & 1 else -((number + 1) >> 1)
+
+    def raw(self, length: int) -> bytes:
+        start = self.position
+        self.position = start + length
+        if self.position > len(self.data):
+            raise ValueError("Truncated pymvr snapshot")
+        return self.data[start : self.position]
+
+    def string(self) -> str:
+        text = self.value()
+        if type(text) is not str:
+            raise ValueError("Invalid pymvr snapshot, string expected")
+        return text
+
+    def value(self) -> Any:
+        tag = self.data[self.position]
+        self.position += 1
+        try:
+            handler = self.handlers[tag]
+        except IndexError:
+            raise ValueError(f"Invalid pymvr snapshot, unknown tag {tag}")
+        return handler()
+
+    def _small(self) -> int:
+        # most counts and indexes fit into one byte
+        byte = self.data[self.position]
+        if byte < 0x80:
+            self.position += 1
+            return byte
+        return self.varint()
+
+    def _none(self):
+        return None
+
+    def _true(self):
+        return True
+
+    def _false(self):
+        return False
+
+    def _float(self) -> float:
+        position = self.position
+        self.position = position + 8
+        return _DOUBLE.unpack_from(self.data, position)[0]
+
+    def _str(self) -> str:
+        text = self.raw(self.varint()).decode("utf-8")
+        self.strings.append(text)
+        return text
+
+    def _str_ref(self) -> str:
+        return self.strings[self._small()]
+
+    def _list(self) -> list:
+        value = self.value
+        return [value() for _ in range(self._small())]
+
+    def _tuple(self) -> tuple:
+        value = self.value
+        return tuple([value() for _ in range(self._small())])
+
+    def _dict(self) -> dict:
+        value = self.value
+        return {value(): value() for _ in range(self._small())}
+
+    def _matrix(self) -> "_value.Matrix":
+        position = self.position
+        self.position = position + 96
+        c = _MATRIX_DOUBLES.unpack_from(self.data, position)
+        matrix = _value.Matrix.__new__(_value.Matrix)
+        matrix.matrix = [
+            [c[0], c[1], c[2], 0],
+            [c[3], c[4], c[5], 0],
+            [c[6], c[7], c[8], 0],
+            [c[9], c[10], c[11], 0],
+        ]
+        return matrix
+
+    def _matrix_default(self) -> "_value.Matrix":
+        return _value.Matrix(0)
+
+    def _matrix_list(self) -> "_value.Matrix":
+        return _value.Matrix(self.value())
+
+    def _color(self) -> "_value.Color":
+        color = _value.Color.__new__(_value.Color)
+        color.x = self.value()
+        color.y = self.value()
+        color.Y = self.value()
+        return color
+
+    def _address(self) -> Address:
+        address = Address.__new__(Address)
+        address.__dict__.update(
+            dmx_break=self.signed(), address=self.signed(), universe=self.signed()
+        )
+        return address
+
+    def _enum(self) -> enum.Enum:
+        enum_class = self._class(self.string())
+        return enum_class[self.string()]
+
+    def _element(self) -> ElementTree.Element:
+        return ElementTree.fromstring(self.raw(self.varint()))
+
+    def _bytes(self) -> bytes:
+        return self.raw(self.varint())
+
+    def _class(self, name: str) -> Any:
+        cls = self.classes.get(name)
+        if cls is None:
+            raise ValueError(f"Invalid pymvr snapshot, unknown class {name}")
+        return cls
+
+    def _shape(self) -> Any:
+        cls = self._class(self.string())
+        keys = tuple(self.string() for _ in range(self.varint()))
+        self.shapes.append((cls, keys))
+        return self._create(cls, keys)
+
+    def _node(self) -> Any:
+        try:
+            cls, keys = self.shapes[self._small()]
+        except IndexError:
+            raise ValueError("Invalid pymvr snapshot, unknown node shape")
+        return self._create(cls, keys)
+
+    def _create(self, cls: Any, keys: Tuple[str, ...]) -> Any:
+        if cls is GeneralSceneDescription:
+            obj = cls()
+        else:
+            obj = cls.__new__(cls)
+        value = self.value
+        obj.__dict__.update(zip(keys, [value() for _ in keys]))
+        return obj
+
+
+def save_snapshot(
+    obj: Any, target: Union[str, "os.PathLike", Any, None] = None
+) -> Optional[bytes]:
+    """Serialize a pymvr object (GeneralSceneDescription, Scene, Layer,
+    Fixture...) into the binary snapshot format. Returns the bytes if no
+    target is given, otherwise writes them to the target file path or binary
+    stream."""
+
+    writer = _Writer()
+    writer.out += MAGIC
+    writer.out.append(FORMAT_VERSION)
+    writer.value(obj)
+    data = bytes(writer.out)
+    if target is None:
+        return data
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as f:
+            f.write(data)
+    else:
+        target.write(data)
+    return None
+
+
+def load_snapshot(source: Union[bytes, bytearray, memoryview, str, "os.PathLike", Any]):
+    """Load an object saved by save_snapshot() from bytes, a file path or a
+    binary stream"""
+
+    data: Union[bytes, bytearray, memoryview]
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            data = f.read()
+    elif isinstance(source, (bytes, bytearray, memoryview)):
+        data = source
+    else:
+        data = source.read()
+    reader = _Reader(data)
+    if reader.raw(len(MAGIC)) != MAGIC:
+        raise ValueError("Not a pymvr snapshot")
+    version = reader.raw(1)[0]
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported pymvr snapshot version {version}")
+    try:
+        return reader.value()
+    except (IndexError, struct.error):
+        raise ValueError("Truncated pymvr snapshot")
@@ -0,0 +1,476 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Columnar views of the fixtures in a scene and bulk import of fixtures from
+# columns or CSV patch sheets, for reporting and paperwork over large rigs.
+# Columns are NumPy arrays if NumPy is installed, otherwise array.array for
+# numbers and lists for text.
+
+import csv
+import math
+import os
+from array import array
+from copy import deepcopy
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Union
+
+from . import (
+    Address,
+    Addresses,
+    Alignments,
+    ChildList,
+    Color,
+    Connections,
+    CustomCommands,
+    Fixture,
+    Mappings,
+    Matrix,
+    Overwrites,
+    Protocols,
+)
+
+try:
+    import numpy  # type: ignore[import-not-found, unused-ignore]
+except ImportError:  # pragma: no cover - depends on the environment
+    numpy = None  # type: ignore[assignment]
+
+# MVR matrix is stored as u, v, w vectors and the offset o
+MATRIX_COLUMNS = (
+    "u_x",
+    "u_y",
+    "u_z",
+    "v_x",
+    "v_y",
+    "v_z",
+    "w_x",
+    "w_y",
+    "w_z",
+    "o_x",
+    "o_y",
+    "o_z",
+)
+TEXT_COLUMNS = ("uuid", "name", "gdtf_spec", "gdtf_mode", "fixture_id", "layer")
+INTEGER_COLUMNS = ("fixture_id_numeric", "dmx_break", "universe", "address")
+FLOAT_COLUMNS = MATRIX_COLUMNS + ("color_x", "color_y", "color_Y")
+COLUMNS = TEXT_COLUMNS + INTEGER_COLUMNS + FLOAT_COLUMNS
+
+# used for missing integers (no FixtureIDNumeric, no DMX address)
+MISSING = -1
+_IMMUTABLE = (str, int, float, bool, type(None))
+# empty containers of a new Fixture, created for each imported row
+_CONTAINERS = {
+    "protocols": Protocols,
+    "mappings": Mappings,
+    "alignments": Alignments,
+    "custom_commands": CustomCommands,
+    "overwrites": Overwrites,
+    "connections": Connections,
+}
+_NAN = float("nan")
+
+
+class FixtureTable:
+    """Fixtures of a scene flattened into columns, see fixture_table().
+
+    Integer columns use -1 for missing values, float columns NaN. Colors
+    given as text are converted, a fixture without a color has NaN color
+    columns, which import_fixtures() turns into the default color as a
+    Fixture created without a color has. Only the first DMX address of a
+    fixture is included."""
+
+    def __init__(self, columns: Dict[str, Any]):
+        self.columns = columns
+
+    def __getitem__(self, name: str) -> Any:
+        return self.columns[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns["uuid"])
+
+    def __repr__(self):
+        return f"FixtureTable({len(self)} fixtures)"
+
+
+def _iter_fixtures(scene) -> Iterator[Any]:
+    """Yield (layer_name, fixture) in document order, including fixtures
+    nested in group objects and child lists of other objects"""
+
+    for layer in scene.layers or []:
+        stack: List[Any] = [layer.child_list]
+        while stack:
+            child_list = stack.pop()
+            if child_list is None:
+                continue
+            nested: List[Any] = []
+            for fixture in child_list.fixtures:
+                yield layer.name, fixture
+                nested.append(fixture.child_list)
+            for group in (
+                child_list.group_objects,
+                child_list.scene_objects,
+                child_list.supports,
+                child_list.trusses,
+                child_list.video_screens,
+                child_list.projectors,
+            ):
+                for item in group:
+                    nested.append(item.child_list)
+            stack.extend(reversed(nested))
+
+
+def fixture_table(scene, use_numpy: bool = True) -> FixtureTable:
+    """Flatten all Fixtures of a Scene into a FixtureTable in one pass. Set
+    use_numpy=False to get array.array/list columns even if NumPy is
+    installed."""
+
+    text: Dict[str, List[Any]] = {name: [] for name in TEXT_COLUMNS}
+    integers = {name: array("q") for name in INTEGER_COLUMNS}
+    matrices = array("d")
+    colors = array("d")
+
+    uuids, names, specs, modes, ids, layers = (text[i] for i in TEXT_COLUMNS)
+    numeric_ids, breaks, universes, addresses = (integers[i] for i in INTEGER_COLUMNS)
+
+    for layer_name, fixture in _iter_fixtures(scene):
+        uuids.append(fixture.uuid)
+        names.append(fixture.name)
+        specs.append(fixture.gdtf_spec)
+        modes.append(fixture.gdtf_mode)
+        ids.append(fixture.fixture_id)
+        layers.append(layer_name)
+
+        numeric_id = fixture.fixture_id_numeric
+        numeric_ids.append(MISSING if numeric_id is None else numeric_id)
+
+        dmx = fixture.addresses.addresses if fixture.addresses else None
+        if dmx:
+            breaks.append(dmx[0].dmx_break)
+            universes.append(dmx[0].universe)
+            addresses.append(dmx[0].address)
+        else:
+            breaks.append(MISSING)
+            universes.append(MISSING)
+            addresses.append(MISSING)
+
+        rows = fixture.matrix.matrix if fixture.matrix is not None else None
+        try:
+            u, v, w, o = rows[:4]  # type: ignore[index]
+            matrices.extend(
+                (u[0], u[1], u[2], v[0], v[1], v[2], w[0], w[1], w[2], o[0], o[1], o[2])
+            )
+        except (TypeError, ValueError, IndexError):
+            matrices.extend((_NAN,) * 12)
+
+        color = fixture.color
+        if isinstance(color, str) and color:
+            color = Color(str_repr=color)  # written like this by to_xml()
+        if isinstance(color, Color):
+            colors.extend(
+                (
+                    _NAN if color.x is None else color.x,
+                    _NAN if color.y is None else color.y,
+                    _NAN if color.Y is None else color.Y,
+                )
+            )
+        else:
+            colors.extend((_NAN, _NAN, _NAN))
+
+    columns: Dict[str, Any] = {}
+    if use_numpy and numpy is not None:
+        for name, values in text.items():
+            column = numpy.empty(len(values), dtype=object)
+            column[:] = values
+            columns[name] = column
+        for name, numbers in integers.items():
+            columns[name] = numpy.frombuffer(numbers, dtype=numpy.int64)
+        matrix_block = numpy.frombuffer(matrices, dtype=numpy.float64).reshape(-1, 12)
+        for index, name in enumerate(MATRIX_COLUMNS):
+            columns[name] = matrix_block[:, index]
+        color_block = numpy.frombuffer(colors, dtype=numpy.float64).reshape(-1, 3)
+        for index, name in enumerate(("color_x", "color_y", "color_Y")):
+            columns[name] = color_block[:, index]
+    else:
+        columns.update(text)
+        columns.update(integers)
+        for index, name in enumerate(MATRIX_COLUMNS):
+            columns[name] = matrices[index::12]
+        for index, name in enumerate(("color_x", "color_y", "color_Y")):
+            columns[name] = colors[index::3]
+    return FixtureTable({name: columns[name] for name in COLUMNS})
+
+
+def _uuid4_batch(count: int) -> List[str]:
+    # one urandom call instead of one per uuid.uuid4()
+    data = bytearray(os.urandom(16 * count))
+    data[6::16] = bytes((byte & 0x0F) | 0x40 for byte in data[6::16])
+    data[8::16] = bytes((byte & 0x3F) | 0x80 for byte in data[8::16])
+    text = data.hex()
+    return [
+        f"{text[i : i + 8]}-{text[i + 8 : i + 12]}-{text[i + 12 : i + 16]}-"
+        f"{text[i + 16 : i + 20]}-{text[i + 20 : i + 32]}"
+        for i in range(0, 32 * count, 32)
+    ]
+
+
+def _to_list(column: Any) -> List[Any]:
+    # NumPy arrays and array.array give back plain Python numbers
+    if hasattr(column, "tolist"):
+        return column.tolist()
+    return list(column)
+
+
+def _split_address(value: Any):
+    """Absolute DMX address (1041) or "universe.address" (3.17) into
+    (universe, address), (MISSING, MISSING) if empty"""
+
+    if value is None or value == "":
+        return MISSING, MISSING
+    if isinstance(value, str):
+        if "." in value:
+            universe, address = value.split(".", 1)
+            return int(universe), int(address)
+        value = int(value)
+    if value <= 0:
+        return MISSING, MISSING
+    return (value - 1) // 512 + 1, (value - 1) % 512 + 1
+
+
+def _split_addresses(column: Any):
+    if (
+        numpy is not None
+        and isinstance(column, numpy.ndarray)
+        and column.dtype.kind in "iu"
+    ):
+        values = column.astype(numpy.int64)
+        valid = values > 0
+        universes = numpy.where(valid, (values - 1) // 512 + 1, MISSING)
+        addresses = numpy.where(valid, (values - 1) % 512 + 1, MISSING)
+        return universes.tolist(), addresses.tolist()
+    pairs = [_split_address(value) for value in _to_list(column)]
+    return [pair[0] for pair in pairs], [pair[1] for pair in pairs]
+
+
+def _new(cls, state: Dict[str, Any]):
+    # skips __init__, state must be a new dict
+    obj = cls.__new__(cls)
+    obj.__dict__ = state
+    return obj
+
+
+def import_fixtures(
+    child_list: ChildList,
+    columns: Union[Mapping[str, Any], FixtureTable],
+    defaults: Optional[Mapping[str, Any]] = None,
+) -> List[Fixture]:
+    """Create fixtures from columns (names as in fixture_table(), a
+    FixtureTable or the result of read_patch_sheet()) and append them to the
+    child_list in one pass.
+
+    If there is no universe column, the address column may hold absolute DMX
+    addresses (1041) or "universe.address" (3.17). Missing numbers are -1 or
+    None, missing uuids are generated. defaults are Fixture attributes of all
+    rows (gdtf_spec, gdtf_mode, classing...), columns take precedence. Each
+    fixture gets its own copy of mutable defaults.
+    The layer column is ignored."""
+
+    columns = dict(columns.columns if isinstance(columns, FixtureTable) else columns)
+    unknown = set(columns) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown fixture columns: {', '.join(sorted(unknown))}")
+    count = max((len(column) for column in columns.values()), default=0)
+
+    def column(name: str, default: Any = None) -> List[Any]:
+        if name in columns:
+            values = _to_list(columns[name])
+            if len(values) != count:
+                raise ValueError(f"Column {name} has {len(values)} rows, not {count}")
+            return values
+        return [default] * count
+
+    if "universe" not in columns and "address" in columns:
+        universes, addresses = _split_addresses(columns["address"])
+    else:
+        universes, addresses = column("universe", 1), column("address", MISSING)
+    breaks = column("dmx_break", 0)
+
+    uuids = column("uuid")
+    missing_uuids = [i for i, value in enumerate(uuids) if not value]
+    for index, value in zip(missing_uuids, _uuid4_batch(len(missing_uuids))):
+        uuids[index] = value
+
+    def present(value: Any) -> bool:
+        if isinstance(value, float) and math.isnan(value):
+            return False
+        return value is not None and value != ""
+
+    defaults = defaults or {}
+    template = Fixture().__dict__
+    template.update(defaults)
+    # other values are built for each row, or copied if they are mutable
+    containers = [(key, cls) for key, cls in _CONTAINERS.items() if key not in defaults]
+    copied = [
+        key
+        for key, value in template.items()
+        if key not in ("matrix", "color", "addresses")
+        and key not in dict(containers)
+        and not isinstance(value, _IMMUTABLE)
+    ]
+    template_color = template["color"].__dict__
+    template_matrix = template["matrix"].matrix
+    keys = ("name", "gdtf_spec", "gdtf_mode", "fixture_id")
+    text = [
+        [value if present(value) else template[key] for value in column(key)]
+        for key in keys
+    ]
+    numeric_ids = [
+        int(value) if present(value) and value != MISSING else None
+        for value in column("fixture_id_numeric")
+    ]
+    identity = [template_matrix[i // 3][i % 3] for i in range(12)]
+    matrix = None
+    if any(name in columns for name in MATRIX_COLUMNS):
+        matrix = list(
+            zip(
+                *(
+                    [value if present(value) else identity[i] for value in column(name)]
+                    for i, name in enumerate(MATRIX_COLUMNS)
+                )
+            )
+        )
+    color = None
+    if any(name in columns for name in ("color_x", "color_y", "color_Y")):
+        color = list(
+            zip(
+                *(
+                    [
+                        value if present(value) else template_color[key]
+                        for value in column(name)
+                    ]
+                    for key, name in zip(
+                        ("x", "y", "Y"), ("color_x", "color_y", "color_Y")
+                    )
+                )
+            )
+        )
+
+    fixtures: List[Fixture] = []
+    append = fixtures.append
+    for row, (uuid, name, gdtf_spec, gdtf_mode, fixture_id) in enumerate(
+        zip(uuids, *text)
+    ):
+        state = template.copy()
+        for key in copied:
+            state[key] = deepcopy(template[key])
+        state["uuid"] = uuid
+        state["name"] = name
+        state["gdtf_spec"] = gdtf_spec
+        state["gdtf_mode"] = gdtf_mode
+        state["fixture_id"] = fixture_id
+        if numeric_ids[row] is not None:
+            state["fixture_id_numeric"] = numeric_ids[row]
+
+        m = matrix[row] if matrix is not None else identity
+        state["matrix"] = _new(
+            Matrix,
+            {
+                "matrix": [
+                    [m[0], m[1], m[2], 0],
+                    [m[3], m[4], m[5], 0],
+                    [m[6], m[7], m[8], 0],
+                    [m[9], m[10], m[11], 0],
+                ]
+            },
+        )
+        if color is not None:
+            x, y, Y = color[row]
+            state["color"] = _new(Color, {"x": x, "y": y, "Y": Y})
+        else:
+            state["color"] = _new(Color, template_color.copy())
+
+        universe, address = universes[row], addresses[row]
+        if present(address) and address != MISSING:
+            dmx = [
+                _new(
+                    Address,
+                    {
+                        "dmx_break": int(breaks[row] or 0),
+                        "address": int(address),
+                        "universe": int(universe)
+                        if present(universe) and universe != MISSING
+                        else 1,
+                    },
+                )
+            ]
+            state["addresses"] = _new(Addresses, {"addresses": dmx, "networks": []})
+        elif "addresses" in defaults:
+            state["addresses"] = deepcopy(template["addresses"])
+        else:
+            state["addresses"] = _new(Addresses, {"addresses": [], "networks": []})
+        for key, cls in containers:
+            state[key] = _new(cls, {"children": []})
+        append(_new(Fixture, state))
+
+    child_list.fixtures.extend(fixtures)
+    return fixtures
+
+
+def read_patch_sheet(
+    source: Union[str, "os.PathLike", IO[str]], delimiter: str = ","
+) -> Dict[str, List[Any]]:
+    """Read a CSV patch sheet into columns for import_fixtures(). The header
+    row names the columns (see fixture_table()), rows are streamed. Numbers
+    are converted, empty cells become None."""
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, newline="", encoding="utf-8-sig") as f:
+            return read_patch_sheet(f, delimiter)
+
+    reader = csv.reader(source, delimiter=delimiter)
+    header = [name.strip() for name in next(reader, [])]
+    unknown = set(header) - set(COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown patch sheet columns: {', '.join(sorted(unknown))}")
+    cells: List[List[str]] = [[] for _ in header]
+    appends = [values.append for values in cells]
+    for row in reader:
+        if not row:
+            continue
+        for append, cell in zip(appends, row):
+            append(cell.strip())
+        for append in appends[len(row) :]:
+            append("")
+
+    columns: Dict[str, List[Any]] = {}
+    for name, values in zip(header, cells):
+        if name in FLOAT_COLUMNS:
+            columns[name] = [float(i) if i else None for i in values]
+        elif name in INTEGER_COLUMNS and not (
+            name == "address" and "universe" not in header
+        ):
+            columns[name] = [int(i) if i else None for i in values]
+        else:
+            columns[name] = [i or None for i in values]
+    return columns
@@ -0,0 +1,603 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# Mutation tracking and content hashes of nodes.
+#
+# content_hash() of a node is a digest of its type, its fields and the hashes
+# of nested nodes, so equal subtrees have equal hashes and the hash of a scene
+# changes when anything below it changes. Hashes are cached on the nodes.
+#
+# Nodes are parsed and constructed with plain lists, so loading and saving
+# scenes which are never hashed or tracked costs nothing extra. The first
+# content_hash() or track() of a node replaces its lists (and the rows of its
+# Matrix) by NodeList, and lists assigned to tracked nodes are wrapped too. A
+# NodeList reports changes to its owner. Nested nodes, Matrix and Color get
+# weak references to the objects holding them, when they are assigned, added
+# to a NodeList or hashed. A value held by several owners links to all of
+# them. A change then drops the cached hashes from the changed object up to
+# the roots, so only changed branches are hashed again. Lists nested in other
+# values (dicts...) stay plain, nodes holding them are hashed but not cached,
+# as changes of those lists can not be seen. Listeners (see add_listener) are
+# told about every tracked change, for journals and change notifications.
+#
+# Tracking assignments costs time on every attribute set (parsing gets about
+# 25% slower), so the __setattr__ hook is only installed while it is in use:
+# while objects with cached hashes, clones (see cow.py) or listeners are
+# alive (see hold). Python looks __setattr__ up on the class, so the hook is
+# installed on BaseNode, Matrix and Color and slows down every scene in the
+# process meanwhile, not only the hashed or tracked ones. Removing the hook starts a new generation of hashes, as
+# changes made without it are not seen, hashes cached before are not used.
+#
+# While clones exist, cow.py sets before_change and needs links from every
+# node below a cloned source up to it. link() walks a tree once and marks the
+# nodes with the current epoch, the hook then links whatever is added to a
+# marked node, so cloning the same tree again does not walk it. Removing the
+# hook starts a new epoch.
+
+import hashlib
+import struct
+import threading
+import weakref
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+from . import BaseNode
+from .value import Color, Matrix
+
+_tracked_types = (BaseNode, Color, Matrix)
+_installed = False
+# objects and listeners which need the hook, see hold()
+_users = 0
+_generation = 0
+# marks of nodes linked by link(), see set_before_change()
+_epoch = 0
+MARK = "_tracked"
+_lock = threading.RLock()
+HOLD = "_tracking_hold"
+
+# set by cow.clone(), called with the node before it or its lists change
+before_change: Optional[Callable[[Any], None]] = None
+
+
+def set_before_change(callback: Callable[[Any], None]):
+    """Call callback before tracked changes until the hook is removed"""
+    global before_change, _epoch
+    with _lock:
+        if before_change is None:
+            # nodes linked before were not followed by the hook
+            _epoch += 1
+            before_change = callback
+
+
+# listeners get (target, key, old, new) after each tracked change. For an
+# attribute of a node, Matrix or Color, key is the attribute name and old is
+# MISSING if it was not set. For a NodeList, new is the list of items now at
+# slice key, which replaced the items in old.
+_listeners: List[Callable[[Any, Any, Any, Any], None]] = []
+MISSING = object()
+
+
+def add_listener(listener: Callable[[Any, Any, Any, Any], None]):
+    _acquire()
+    _listeners.append(listener)
+
+
+def remove_listener(listener: Callable[[Any, Any, Any, Any], None]):
+    _listeners.remove(listener)
+    _release()
+
+
+def _notify(target: Any, key: Any, old: Any, new: Any):
+    for listener in list(_listeners):
+        listener(target, key, old, new)
+
+
+def owner_of(target: Any) -> Any:
+    """Node, Matrix or Color a listener target belongs to"""
+    if type(target) is NodeList:
+        return _owner_of(target)
+    return target
+
+
+def _owner_of(items: "NodeList") -> Any:
+    ref = getattr(items, "_owner", None)
+    return ref() if ref is not None else None
+
+
+def owned(items, owner: Any) -> "NodeList":
+    """NodeList of items linked to owner"""
+    result = NodeList(items)
+    result._owner = weakref.ref(owner)
+    return result
+
+
+def parents(obj: Any) -> List[Any]:
+    """Live objects holding obj"""
+    state = obj.__dict__
+    refs = state.get("_parents", ())
+    parent = state.get("_parent")
+    if parent is not None:
+        refs = refs + (parent,)
+    return [owner for owner in (ref() for ref in refs) if owner is not None]
+
+
+def is_within(obj: Any, root: Any) -> bool:
+    """True if obj is root or nested in it, following the parent links"""
+    while obj is not None:
+        if obj is root:
+            return True
+        parent = obj.__dict__.get("_parent")
+        obj = parent() if parent is not None else None
+    return False
+
+
+def _index(index: int, length: int) -> int:
+    # position an insert() at index ends up at
+    if index < 0:
+        return max(0, length + index)
+    return min(index, length)
+
+
+class NodeList(list):
+    """List which invalidates the content hash of its owner when changed.
+    Lists of nodes are replaced by NodeList linked to the node when it is
+    hashed or tracked, see owned()."""
+
+    # unset until the list is linked to its owner, see _owner_of()
+    __slots__ = ("_owner",)
+    _owner: "weakref.ref"
+
+    def __reduce__(self):
+        # copies and pickles are plain lists, wrapped again by their owner
+        return list, (list(self),)
+
+    def _changing(self):
+        if before_change is not None:
+            owner = _owner_of(self)
+            if owner is not None:
+                before_change(owner)
+
+    def _replaced(self, start: int, old: list, new: list):
+        """Items in old at start were replaced by the items in new"""
+        ref = getattr(self, "_owner", None)
+        owner = ref() if ref is not None else None
+        if owner is not None:
+            for item in new:
+                if isinstance(item, _tracked_types):
+                    _link(item, ref)  # type: ignore[arg-type]
+            _follow(owner, new)
+            invalidate(owner)
+        if _listeners:
+            _notify(self, slice(start, start + len(new)), old, new)
+
+    def _rewritten(self, old: list):
+        # the whole list changed (sort, reverse, extended slices...)
+        self._replaced(0, old, list(self) if _listeners else [])
+
+    def append(self, item):
+        self._changing()
+        super().append(item)
+        self._replaced(len(self) - 1, [], [item])
+
+    def extend(self, items):
+        self._changing()
+        items = list(items)
+        start = len(self)
+        super().extend(items)
+        self._replaced(start, [], items)
+
+    def insert(self, index, item):
+        self._changing()
+        start = _index(index, len(self))
+        super().insert(index, item)
+        self._replaced(start, [], [item])
+
+    def remove(self, item):
+        self._changing()
+        index = self.index(item)
+        old = [list.__getitem__(self, index)]
+        super().__delitem__(index)
+        self._replaced(index, old, [])
+
+    def pop(self, index=-1):
+        self._changing()
+        start = index + len(self) if index < 0 else index
+        item = super().pop(index)
+        self._replaced(start, [item], [])
+        return item
+
+    def clear(self):
+        self._changing()
+        old = list(self)
+        super().clear()
+        self._replaced(0, old, [])
+
+    def sort(self, *args, **kwargs):
+        self._changing()
+        old = list(self) if _listeners else []
+        super().sort(*args, **kwargs)
+        self._rewritten(old)
+
+    def reverse(self):
+        self._changing()
+        old = list(self) if _listeners else []
+        super().reverse()
+        self._rewritten(old)
+
+    def __setitem__(self, index, item):
+        self._changing()
+        if not isinstance(index, slice):
+            start = index + len(self) if index < 0 else index
+            old = [list.__getitem__(self, index)]
+            super().__setitem__(index, item)
+            self._replaced(start, old, [item])
+            return
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            old = list(self) if _listeners else []
+            super().__setitem__(index, item)
+            self._rewritten(old)
+            return
+        items = list(item)
+        old = list.__getitem__(self, slice(start, max(start, stop)))
+        super().__setitem__(index, items)
+        self._replaced(start, old, items)
+
+    def __delitem__(self, index):
+        self._changing()
+        if not isinstance(index, slice):
+            start = index + len(self) if index < 0 else index
+            old = [list.__getitem__(self, index)]
+            super().__delitem__(index)
+            self._replaced(start, old, [])
+            return
+        start, stop, step = index.indices(len(self))
+        if step != 1:
+            old = list(self) if _listeners else []
+            super().__delitem__(index)
+            self._rewritten(old)
+            return
+        old = list.__getitem__(self, slice(start, max(start, stop)))
+        super().__delitem__(index)
+        self._replaced(start, old, [])
+
+    def __iadd__(self, items):  # type: ignore[misc]
+        self.extend(items)
+        return self
+
+    def __imul__(self, count):  # type: ignore[misc]
+        self._changing()
+        old = list(self) if _listeners else []
+        result = super().__imul__(count)
+        self._rewritten(old)
+        return result
+
+
+def _link(value: Any, parent: "weakref.ref"):
+    """Link value to one more object holding it"""
+    state = value.__dict__
+    current = state.get("_parent")
+    if current is not None and current is not parent:
+        previous = current()
+        if previous is not None and previous is not parent():
+            # shared value, changes drop the hashes of all owners
+            others = tuple(
+                ref
+                for ref in state.get("_parents", ())
+                if ref() is not None and ref() is not parent()
+            )
+            state["_parents"] = others + (current,)
+    state["_parent"] = parent
+
+
+def _wrap(value: list, owner: Any) -> "NodeList":
+    parent = weakref.ref(owner)
+    for item in value:
+        if isinstance(item, _tracked_types):
+            _link(item, parent)
+    # nested lists (Matrix rows) report to the same owner
+    result = NodeList(
+        _wrap(item, owner) if type(item) is list else item for item in value
+    )
+    result._owner = parent
+    return result
+
+
+def track(root: Any):
+    """Link all objects and lists below root (usually a Scene) to the objects
+    holding them, replacing plain lists by NodeList. Journals and observers call it, so that changes of everything
+    below their root are seen."""
+
+    if not _held(root):
+        hold(root)
+    link(root)
+
+
+def link(root: Any):
+    """track() without keeping the hook installed. While clones exist, a
+    tree is walked once and kept linked by the hook afterwards."""
+
+    epoch = _epoch if before_change is not None else None
+    if epoch is None or root.__dict__.get(MARK) != epoch:
+        _walk([root], epoch)
+
+
+def _walk(objects: List[Any], epoch: Optional[int]):
+    if epoch is not None:
+        for obj in objects:
+            obj.__dict__[MARK] = epoch
+    stack = list(objects)
+    while stack:
+        obj = stack.pop()
+        state = obj.__dict__
+        parent = weakref.ref(obj)
+        for key, value in list(state.items()):
+            if key[0] == "_":
+                continue
+            if isinstance(value, list):
+                if type(value) is list:
+                    value = state[key] = _wrap(value, obj)
+                else:
+                    _own(value, parent)  # type: ignore[arg-type]
+                items = value
+            elif isinstance(value, _tracked_types):
+                items = (value,)
+            else:
+                continue
+            for item in items:
+                if isinstance(item, _tracked_types):
+                    _link(item, parent)
+                    if epoch is None:
+                        stack.append(item)
+                    elif item.__dict__.get(MARK) != epoch:
+                        item.__dict__[MARK] = epoch
+                        stack.append(item)
+
+
+def _follow(owner: Any, values: Any):
+    # values were added to owner, link the nodes below them if owner was
+    # linked by link() for clones
+    if before_change is not None and owner.__dict__.get(MARK) == _epoch:
+        _walk(
+            [
+                value
+                for value in values
+                if isinstance(value, _tracked_types)
+                and value.__dict__.get(MARK) != _epoch
+            ],
+            _epoch,
+        )
+
+
+def _own(items: "NodeList", owner: "weakref.ref"):
+    if getattr(items, "_owner", None) is not owner:
+        items._owner = owner
+    for item in items:
+        if type(item) is NodeList:
+            _own(item, owner)
+
+
+def _tracked_setattr(self, name: str, value: Any):
+    if name[0] == "_":
+        object.__setattr__(self, name, value)
+        return
+    if before_change is not None:
+        before_change(self)
+    old = self.__dict__.get(name, MISSING) if _listeners else None
+    if type(value) is list:
+        value = _wrap(value, self)
+    elif type(value) is NodeList:
+        _own(value, weakref.ref(self))
+    object.__setattr__(self, name, value)
+    if isinstance(value, _tracked_types):
+        _link(value, weakref.ref(self))
+        if type(value) is Matrix and type(value.matrix) is list:
+            value.__dict__["matrix"] = _wrap(value.matrix, value)
+        _follow(self, (value,))
+    elif isinstance(value, list):
+        _follow(self, value)
+    invalidate(self)
+    if _listeners:
+        _notify(self, name, old, value)
+
+
+def _acquire():
+    global _users, _installed
+    with _lock:
+        _users += 1
+        if not _installed:
+            for cls in _tracked_types:
+                cls.__setattr__ = _tracked_setattr  # type: ignore[method-assign, assignment]
+            _installed = True
+
+
+def _release():
+    global _users, _installed, _generation, _epoch, before_change
+    with _lock:
+        _users -= 1
+        if _users == 0 and _installed:
+            for cls in _tracked_types:
+                del cls.__setattr__
+            _installed = False
+            _generation += 1
+            _epoch += 1
+            before_change = None
+
+
+def hold(obj: Any):
+    """Keep the tracking hook installed while obj is alive"""
+    with _lock:
+        if HOLD not in obj.__dict__:
+            obj.__dict__[HOLD] = weakref.finalize(obj, _release)
+            _acquire()
+
+
+def release(obj: Any):
+    """Undo hold(obj) before obj is gone"""
+    finalizer = obj.__dict__.pop(HOLD, None)
+    if finalizer is not None:
+        finalizer()
+
+
+def _held(obj: Any) -> bool:
+    while obj is not None:
+        state = obj.__dict__
+        if HOLD in state:
+            return True
+        parent = state.get("_parent")
+        obj = parent() if parent is not None else None
+    return False
+
+
+def invalidate(obj: Any):
+    """Drop cached content hashes of obj and its parents. Called on changes
+    made through attributes and lists, call it after changing values which
+    can not be tracked, like ElementTree elements."""
+
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        state = obj.__dict__
+        if state.get("_content_hash") is None:
+            continue  # parents were invalidated already
+        state["_content_hash"] = None
+        parent = state.get("_parent")
+        if parent is not None:
+            stack.append(parent())
+        for parent in state.get("_parents", ()):
+            stack.append(parent())
+        while stack and stack[-1] is None:
+            stack.pop()
+
+
+def cached_hash(obj: Any) -> Optional[bytes]:
+    """Content hash of obj if it is cached and current, None otherwise"""
+    entry = obj.__dict__.get("_content_hash")
+    if entry is not None and entry[0] == _generation:
+        return entry[1]
+    return None
+
+
+_DOUBLE = struct.Struct("<d")
+
+
+def _update(digest, value: Any, owner: "weakref.ref", generation: int) -> bool:
+    # False if value holds plain lists, its hash can not be cached
+    if value is None:
+        digest.update(b"N")
+        return True
+    value_type = type(value)
+    if value_type is str:
+        data = value.encode("utf-8")
+        digest.update(b"s%d:" % len(data))
+        digest.update(data)
+    elif value_type is bool:
+        digest.update(b"T" if value else b"F")
+    elif value_type is float or (value_type is int and -(2**53) <= value <= 2**53):
+        # 1 and 1.0 are the same value, Matrix(0) holds ints
+        digest.update(b"f")
+        digest.update(_DOUBLE.pack(value))
+    elif value_type is int:
+        digest.update(b"i%d;" % value)
+    elif isinstance(value, (list, tuple)):
+        # changes of plain lists can not be seen
+        cacheable = value_type is not list
+        if value_type is NodeList and getattr(value, "_owner", None) is not owner:
+            value._owner = owner  # type: ignore[union-attr]
+        digest.update(b"[%d:" % len(value))
+        for item in value:
+            cacheable = _update(digest, item, owner, generation) and cacheable
+        digest.update(b"]")
+        return cacheable
+    elif isinstance(value, _tracked_types):
+        _link(value, owner)
+        digest.update(b"#")
+        result, cacheable = _hash(value, generation)
+        digest.update(result)
+        return cacheable
+    elif isinstance(value, Enum):
+        return _update(
+            digest, f"{type(value).__name__}.{value.name}", owner, generation
+        )
+    elif isinstance(value, ElementTree.Element):
+        digest.update(b"x")
+        digest.update(ElementTree.tostring(value))
+    elif isinstance(value, dict):
+        cacheable = True
+        digest.update(b"{%d:" % len(value))
+        for key in sorted(value, key=repr):
+            cacheable = _update(digest, key, owner, generation) and cacheable
+            cacheable = _update(digest, value[key], owner, generation) and cacheable
+        digest.update(b"}")
+        return cacheable
+    elif hasattr(value, "__dict__"):  # other value objects, not cached
+        _update(digest, type(value).__name__, owner, generation)
+        fields = {k: v for k, v in vars(value).items() if k[0] != "_"}
+        return _update(digest, fields, owner, generation)
+    else:
+        _update(digest, f"{type(value).__name__}:{value!r}", owner, generation)
+    return True
+
+
+def _hash(obj: Any, generation: int) -> Tuple[bytes, bool]:
+    state = obj.__dict__
+    entry = state.get("_content_hash")
+    if entry is not None and entry[0] == generation:
+        return entry[1], True
+    source = state.get("_cow_source")
+    if source is not None:  # unused clone, same content as its source
+        result, cacheable = _hash(source, generation)
+        if cacheable:
+            state["_content_hash"] = (generation, result)
+        return result, cacheable
+    owner = weakref.ref(obj)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(type(obj).__name__.encode("utf-8"))
+    cacheable = True
+    # list() copies the keys at once, other threads reading the same nodes
+    # add _content_hash and _parent entries meanwhile
+    for key in sorted(key for key in list(state) if key[0] != "_"):
+        digest.update(b"\0")
+        digest.update(key.encode("utf-8"))
+        value = state[key]
+        if type(value) is list:  # first hash, changes are seen from now on
+            value = state[key] = _wrap(value, obj)
+        cacheable = _update(digest, value, owner, generation) and cacheable
+    result = digest.digest()
+    if cacheable:
+        state["_content_hash"] = (generation, result)
+    return result, cacheable
+
+
+def content_hash(obj: Any) -> bytes:
+    """16 byte digest of the content of a node, Matrix or Color, cached until
+    the node or anything nested in it changes"""
+
+    cached = cached_hash(obj)
+    if cached is not None:
+        return cached
+    if not _held(obj):
+        hold(obj)
+    return _hash(obj, _generation)[0]
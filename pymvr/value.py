@@ -22,9 +22,12 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
-from typing import List, Union
+import struct
+from typing import List, Optional, Union
 from xml.etree import ElementTree
 
+MATRIX_DOUBLES = struct.Struct("<12d")
+
 
 # Data type that only allows a specific set of values, if given a value
 # which is not permitted, the value will be set to the default
@@ -47,6 +50,10 @@ class Enum:
 
 
 class Color:
+    # see tracking.py
+    _parent = None
+    _content_hash = None
+
     def __init__(
         self,
         x: Union[float, None] = 0.3127,
@@ -68,6 +75,16 @@ class Color:
                 self.y = 0.3290
                 self.Y = 100.00
 
+    def __reduce__(self):
+        # compact pickles, the white point is stored as no arguments
+        state = (self.x, self.y, self.Y)
+        if state == _WHITE and all(type(value) is float for value in state):
+            return Color, ()
+        return Color, state
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k[0] != "_"}
+
     def __str__(self):
         return f"{self.x}, {self.y}, {self.Y}"
 
@@ -91,6 +108,10 @@ class Rotation:
 
 
 class Matrix:
+    # see tracking.py
+    _parent = None
+    _content_hash = None
+
     def __init__(self, str_repr):
         if str_repr == "0" or str_repr == 0:
             self.matrix = [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [0, 0, 0, 0]]
@@ -110,10 +131,30 @@ class Matrix:
             ]
 
     def __eq__(self, other):
+        if not isinstance(other, Matrix):
+            return NotImplemented
         return self.matrix == other.matrix
 
     def __ne__(self, other):
-        return self.matrix == other.matrix
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return self.matrix != other.matrix
+
+    __hash__ = None  # type: ignore[assignment]  # mutable
+
+    def __reduce__(self):
+        # compact pickles, the 12 used values are packed as doubles
+        packed = pack_matrix(self.matrix)
+        if packed is None:
+            if repr(self.matrix) == DEFAULT_MATRIX:
+                return Matrix, (0,)
+            return Matrix, (self.matrix,)
+        if packed[:72] == _IDENTITY_PACKED:
+            return unpack_translation, (packed[72:],)
+        return unpack_matrix, (packed,)
+
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k[0] != "_"}
 
     def __str__(self):
         return f"{self.matrix}"
@@ -128,6 +169,42 @@ class Matrix:
         matrix.text = matrix_str
 
 
+_WHITE = (0.3127, 0.3290, 100.00)
+DEFAULT_MATRIX = repr(Matrix(0).matrix)
+# rotation part of packed matrices, only the translation is pickled
+_IDENTITY_PACKED = struct.pack("<9d", 1.0, 0.0, 0.0, 0.0, 1.0, 0.0, 0.0, 0.0, 1.0)
+
+
+def pack_matrix(rows) -> Optional[bytes]:
+    """The 12 values of a matrix as read from XML (floats, last column 0) as
+    doubles, None for other matrices"""
+    try:
+        (xx, xy, xz, xw), (yx, yy, yz, yw), (zx, zy, zz, zw), (ox, oy, oz, ow) = rows
+    except (TypeError, ValueError):
+        return None
+    values = (xx, xy, xz, yx, yy, yz, zx, zy, zz, ox, oy, oz)
+    last = (xw, yw, zw, ow)
+    if set(map(type, values)) != {float} or set(map(type, last)) != {int} or any(last):
+        return None
+    return MATRIX_DOUBLES.pack(*values)
+
+
+def unpack_matrix(data: bytes) -> "Matrix":
+    c = MATRIX_DOUBLES.unpack(data)
+    return Matrix(
+        [
+            [c[0], c[1], c[2], 0],
+            [c[3], c[4], c[5], 0],
+            [c[6], c[7], c[8], 0],
+            [c[9], c[10], c[11], 0],
+        ]
+    )
+
+
+def unpack_translation(data: bytes) -> "Matrix":
+    return unpack_matrix(_IDENTITY_PACKED + data)
+
+
 # A node link represents a link to another node in the XML tree, starting from
 # start_point and traversing the tree with a decimal-point notation in str_link.
 # There isn't yet a standard for how start_point is formatted so the only useful
@@ -0,0 +1,581 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+# MVR-xchange over TCP (DIN SPEC 15801, TCP mode) for asyncio.
+#
+# Every message is a packet: a header of six big endian fields (magic number,
+# version, package number, package count, package type and payload length)
+# followed by the payload. JSON messages are sent in one packet, MVR files in
+# a sequence of packets of chunk_size bytes. Stations are connected by
+# address, mDNS discovery and the WebSocket mode are not covered.
+#
+# A connection carries messages in both directions. Each side sends requests
+# (MVR_JOIN, MVR_COMMIT, MVR_REQUEST, MVR_LEAVE) one at a time and gets the
+# responses in order. The reader task of the connection hands responses to
+# the waiting request, streams received files into its target and queues the
+# requests of the other station, which are answered in order by another task.
+
+import asyncio
+import inspect
+import json
+import os
+import struct
+import tempfile
+import uuid as py_uuid
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+from . import GeneralSceneDescription
+from .aio import load_async
+from .archive import COPY_CHUNK_SIZE
+
+PACKAGE_HEADER = 778682
+PACKAGE_VERSION = 1
+PACKAGE_JSON = 0
+PACKAGE_FILE = 1
+HEADER = struct.Struct("!IIIIIQ")
+
+# larger JSON messages and file packets are refused
+MAX_MESSAGE_SIZE = 1024 * 1024
+MAX_PACKET_SIZE = 64 * 1024 * 1024
+# received files are kept in memory up to this size, on disk when larger
+SPOOL_SIZE = 16 * 1024 * 1024
+
+
+class XchangeError(Exception):
+    """A request was refused or the other station broke the protocol"""
+
+
+def pack_message(message: Dict[str, Any]) -> bytes:
+    """JSON message as a packet"""
+    payload = json.dumps(message).encode("utf-8")
+    header = HEADER.pack(
+        PACKAGE_HEADER, PACKAGE_VERSION, 0, 1, PACKAGE_JSON, len(payload)
+    )
+    return header + payload
+
+
+def pack_file_header(number: int, count: int, size: int) -> bytes:
+    """Header of the packet number (of count) of a file, size bytes long"""
+    return HEADER.pack(
+        PACKAGE_HEADER, PACKAGE_VERSION, number, count, PACKAGE_FILE, size
+    )
+
+
+async def read_packet(reader: "asyncio.StreamReader") -> Tuple[int, int, int, bytes]:
+    """Package type, number, count and payload of the next packet"""
+    header = await reader.readexactly(HEADER.size)
+    magic, _, number, count, package_type, size = HEADER.unpack(header)
+    if magic != PACKAGE_HEADER:
+        raise XchangeError("Not an MVR-xchange packet")
+    if number >= count:
+        raise XchangeError(f"Package number {number} of {count}")
+    limit = MAX_MESSAGE_SIZE if package_type == PACKAGE_JSON else MAX_PACKET_SIZE
+    if size > limit:
+        raise XchangeError(f"Packet of {size} bytes is too large")
+    return package_type, number, count, await reader.readexactly(size)
+
+
+class Commit:
+    """An MVR file offered by a station, announced with MVR_COMMIT or listed in
+    the Files of MVR_JOIN. for_stations limits the stations it is meant for,
+    empty for all."""
+
+    def __init__(
+        self,
+        file_uuid: str,
+        station_uuid: str,
+        file_size: int = 0,
+        comment: str = "",
+        file_name: str = "",
+        ver_major: int = 1,
+        ver_minor: int = 6,
+        for_stations: Optional[List[str]] = None,
+    ):
+        self.file_uuid = file_uuid
+        self.station_uuid = station_uuid
+        self.file_size = file_size
+        self.comment = comment
+        self.file_name = file_name
+        self.ver_major = ver_major
+        self.ver_minor = ver_minor
+        self.for_stations = for_stations if for_stations is not None else []
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "FileUUID": self.file_uuid,
+            "StationUUID": self.station_uuid,
+            "FileSize": self.file_size,
+            "Comment": self.comment,
+            "FileName": self.file_name,
+            "verMajor": self.ver_major,
+            "verMinor": self.ver_minor,
+            "ForStationsUUID": self.for_stations,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any], station_uuid: str = "") -> "Commit":
+        file_uuid = data.get("FileUUID")
+        if not isinstance(file_uuid, str):
+            raise XchangeError("Commit without a FileUUID")
+        return cls(
+            file_uuid,
+            data.get("StationUUID") or station_uuid,
+            int(data.get("FileSize", 0)),
+            data.get("Comment", ""),
+            data.get("FileName", ""),
+            int(data.get("verMajor", 1)),
+            int(data.get("verMinor", 6)),
+            list(data.get("ForStationsUUID", [])),
+        )
+
+    def __str__(self):
+        return f"{self.file_name or self.file_uuid} ({self.comment})"
+
+
+class Connection:
+    """Connection with another station, see Station.join()"""
+
+    def __init__(
+        self,
+        station: "Station",
+        reader: "asyncio.StreamReader",
+        writer: "asyncio.StreamWriter",
+    ):
+        self.station = station
+        self.reader = reader
+        self.writer = writer
+        # StationUUID, StationName and Provider of the other station
+        self.station_uuid: Optional[str] = None
+        self.station_name = ""
+        self.provider = ""
+        self._send_lock = asyncio.Lock()
+        self._request_lock = asyncio.Lock()
+        self._response: Optional["asyncio.Future"] = None
+        self._target: Optional[BinaryIO] = None
+        self._next_package = 0
+        self._requests: "asyncio.Queue" = asyncio.Queue()
+        self._reading = asyncio.ensure_future(self._read())
+        self._serving = asyncio.ensure_future(self._serve())
+
+    @property
+    def closed(self) -> bool:
+        return self._reading.done()
+
+    async def send(self, message: Dict[str, Any]):
+        async with self._send_lock:
+            self.writer.write(pack_message(message))
+            await self.writer.drain()
+
+    async def send_file(self, source: Union[str, "os.PathLike", bytes], size: int):
+        """Send a file in packets of the station's chunk_size"""
+        chunk_size = self.station.chunk_size
+        count = max(1, -(-size // chunk_size))
+        loop = asyncio.get_running_loop()
+        async with self._send_lock:
+            if isinstance(source, bytes):
+                view = memoryview(source)
+                for number in range(count):
+                    chunk = view[number * chunk_size : (number + 1) * chunk_size]
+                    self.writer.write(pack_file_header(number, count, len(chunk)))
+                    self.writer.write(chunk)
+                    await self.writer.drain()
+                return
+            with open(source, "rb") as f:
+                for number in range(count):
+                    expected = min(chunk_size, size - number * chunk_size)
+                    data = await loop.run_in_executor(None, f.read, chunk_size)
+                    if len(data) != max(expected, 0):
+                        # the other station waits for the announced packets
+                        self.close()
+                        raise XchangeError(f"{source} changed while being sent")
+                    self.writer.write(pack_file_header(number, count, len(data)))
+                    self.writer.write(data)
+                    await self.writer.drain()
+
+    async def request(
+        self, message: Dict[str, Any], target: Optional[BinaryIO] = None
+    ) -> Any:
+        """Send a request and wait for the response, the JSON message, or
+        target once a file was received into it"""
+        async with self._request_lock:
+            if self.closed:
+                raise ConnectionError("Connection is closed")
+            self._response = asyncio.get_running_loop().create_future()
+            self._target = target
+            self._next_package = 0
+            try:
+                await self.send(message)
+                return await self._response
+            except asyncio.CancelledError:
+                # the late response would be taken for the next one
+                self.close()
+                raise
+            finally:
+                self._response = None
+                self._target = None
+
+    def close(self):
+        self.writer.close()
+        self._serving.cancel()
+
+    async def wait_closed(self):
+        await asyncio.gather(self._reading, self._serving, return_exceptions=True)
+
+    async def _read(self):
+        error: BaseException = ConnectionError("Connection closed")
+        try:
+            while True:
+                package_type, number, count, payload = await read_packet(self.reader)
+                if package_type == PACKAGE_FILE:
+                    self._receive(number, count, payload)
+                    continue
+                message = json.loads(payload)
+                if not isinstance(message, dict):
+                    raise XchangeError("Message is not a JSON object")
+                if str(message.get("Type", "")).endswith("_RET"):
+                    if self._response is not None and not self._response.done():
+                        self._response.set_result(message)
+                else:
+                    self._requests.put_nowait(message)
+        except (asyncio.IncompleteReadError, OSError) as reason:
+            error = ConnectionError(f"Connection closed: {reason}")
+        except (XchangeError, ValueError) as reason:
+            error = reason
+        finally:
+            if self._response is not None and not self._response.done():
+                self._response.set_exception(error)
+            self.close()
+            self.station._disconnected(self)
+
+    def _receive(self, number: int, count: int, payload: bytes):
+        response = self._response
+        if response is None or response.done() or self._target is None:
+            raise XchangeError("File packet without a request")
+        if number != self._next_package:
+            raise XchangeError(f"Package {number} instead of {self._next_package}")
+        self._target.write(payload)
+        self._next_package += 1
+        if self._next_package == count:
+            response.set_result(self._target)
+
+    async def _serve(self):
+        while True:
+            message = await self._requests.get()
+            kind = str(message.get("Type", ""))
+            try:
+                await self.station._handle(self, kind, message)
+            except (XchangeError, ValueError, OSError) as error:
+                if self.writer.is_closing():
+                    return
+                await self.send(
+                    {"Type": f"{kind}_RET", "OK": False, "Message": str(error)}
+                )
+
+
+class Station:
+    """MVR-xchange station. With start(), other stations can connect to it,
+    join() connects to another station. Both ends of a connection can commit
+    files to and request files from the other one.
+
+    Files committed by other stations are listed in commits, on_commit is
+    called (or awaited) with each newly announced Commit. Received files are
+    kept in memory up to spool_size bytes, on disk when larger."""
+
+    def __init__(
+        self,
+        name: str = "pymvr",
+        station_uuid: Optional[str] = None,
+        provider: str = "pymvr",
+        on_commit: Optional[Callable[[Commit], Any]] = None,
+        chunk_size: int = COPY_CHUNK_SIZE,
+        spool_size: int = SPOOL_SIZE,
+    ):
+        self.name = name
+        self.station_uuid = station_uuid or str(py_uuid.uuid4())
+        self.provider = provider
+        self.ver_major = 1
+        self.ver_minor = 6
+        self.on_commit = on_commit
+        self.chunk_size = chunk_size
+        self.spool_size = spool_size
+        # files of this station and their sources
+        self.files: Dict[str, Commit] = {}
+        self._sources: Dict[str, Union[str, "os.PathLike", bytes]] = {}
+        # files of other stations
+        self.commits: Dict[str, Commit] = {}
+        # joined stations by their StationUUID
+        self.peers: Dict[str, Connection] = {}
+        self._connections: Set[Connection] = set()
+        self._callbacks: Set["asyncio.Future"] = set()
+        self._server: Optional["asyncio.AbstractServer"] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> Tuple[str, int]:
+        """Accept connections of other stations, returns the address"""
+        self._server = await asyncio.start_server(self._accept, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def join(self, host: str, port: int) -> Connection:
+        """Connect to the station at host:port, its files are added to
+        commits"""
+        reader, writer = await asyncio.open_connection(host, port)
+        connection = self._connect(reader, writer)
+        try:
+            reply = await connection.request(self._join_message("MVR_JOIN"))
+            _check(reply, "MVR_JOIN_RET")
+            self._joined(connection, reply)
+        except BaseException:
+            connection.close()
+            raise
+        return connection
+
+    async def commit(
+        self,
+        source: Union[str, "os.PathLike", bytes],
+        comment: str = "",
+        file_name: str = "",
+        file_uuid: Optional[str] = None,
+        for_stations: Optional[List[str]] = None,
+    ) -> Commit:
+        """Offer an MVR file (path or bytes) and announce it to the joined
+        stations, to those in for_stations if given. Stations which do not
+        respond are disconnected."""
+        if isinstance(source, (bytes, bytearray, memoryview)):
+            source = bytes(source)
+            size = len(source)
+        else:
+            size = os.path.getsize(source)
+            if not file_name:
+                file_name = os.path.basename(source)
+        commit = Commit(
+            file_uuid or str(py_uuid.uuid4()),
+            self.station_uuid,
+            size,
+            comment,
+            file_name,
+            self.ver_major,
+            self.ver_minor,
+            list(for_stations or []),
+        )
+        self.files[commit.file_uuid] = commit
+        self._sources[commit.file_uuid] = source
+        message = {"Type": "MVR_COMMIT", **commit.to_json()}
+        peers = [
+            connection
+            for station_uuid, connection in self.peers.items()
+            if not for_stations or station_uuid in for_stations
+        ]
+        replies = await asyncio.gather(
+            *(connection.request(message) for connection in peers),
+            return_exceptions=True,
+        )
+        for connection, reply in zip(peers, replies):
+            if isinstance(reply, asyncio.CancelledError):
+                raise reply
+            if isinstance(reply, BaseException):
+                connection.close()
+        return commit
+
+    async def request(
+        self,
+        file_uuid: Optional[str] = None,
+        station_uuid: Optional[str] = None,
+        target: Optional[BinaryIO] = None,
+    ) -> BinaryIO:
+        """Download a file committed by another station into target (a
+        writable binary file), a temporary file if None. Without a
+        file_uuid, the last file of the station is sent."""
+        if station_uuid is None:
+            if file_uuid is None or file_uuid not in self.commits:
+                raise KeyError(f"Unknown file {file_uuid}")
+            station_uuid = self.commits[file_uuid].station_uuid
+        connection = self.peers.get(station_uuid)
+        if connection is None:
+            raise KeyError(f"Station {station_uuid} is not joined")
+        spooled = target is None
+        if target is None:
+            target = tempfile.SpooledTemporaryFile(max_size=self.spool_size)  # type: ignore[assignment]
+        message: Dict[str, Any] = {
+            "Type": "MVR_REQUEST",
+            "FromStationUUID": [self.station_uuid],
+        }
+        if file_uuid is not None:
+            message["FileUUID"] = file_uuid
+        try:
+            reply = await connection.request(message, target)
+        except BaseException:
+            if spooled:
+                target.close()  # type: ignore[union-attr]
+            raise
+        if isinstance(reply, dict):
+            if spooled:
+                target.close()  # type: ignore[union-attr]
+            _check(reply, "MVR_REQUEST_RET")
+            raise XchangeError("No file received")
+        if spooled:
+            target.seek(0)  # type: ignore[union-attr]
+        return target  # type: ignore[return-value]
+
+    async def load(
+        self,
+        file_uuid: Optional[str] = None,
+        station_uuid: Optional[str] = None,
+        **kwargs,
+    ) -> GeneralSceneDescription:
+        """Download and open a file, kwargs are passed to load_async()"""
+        received = await self.request(file_uuid, station_uuid)
+        try:
+            mvr = await load_async(received, **kwargs)
+        except BaseException:
+            received.close()
+            raise
+        # closing the opened file removes the received file
+        mvr.close_on_exit(received)
+        return mvr
+
+    async def leave(self):
+        """Send MVR_LEAVE to the joined stations and disconnect"""
+        message = {"Type": "MVR_LEAVE", "FromStationUUID": self.station_uuid}
+        peers = list(self.peers.values())
+        await asyncio.gather(
+            *(connection.request(message) for connection in peers),
+            return_exceptions=True,
+        )
+        for connection in peers:
+            connection.close()
+
+    async def close(self):
+        """Leave, stop accepting connections and close all connections"""
+        await self.leave()
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        connections = list(self._connections)
+        for connection in connections:
+            connection.close()
+        await asyncio.gather(*(connection.wait_closed() for connection in connections))
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    def _connect(self, reader, writer) -> Connection:
+        connection = Connection(self, reader, writer)
+        self._connections.add(connection)
+        return connection
+
+    async def _accept(self, reader, writer):
+        self._connect(reader, writer)
+
+    def _disconnected(self, connection: Connection):
+        self._connections.discard(connection)
+        if connection.station_uuid is not None:
+            if self.peers.get(connection.station_uuid) is connection:
+                del self.peers[connection.station_uuid]
+
+    def _join_message(self, kind: str) -> Dict[str, Any]:
+        message: Dict[str, Any] = {"Type": kind}
+        if kind.endswith("_RET"):
+            message.update(OK=True, Message="")
+        message.update(
+            Provider=self.provider,
+            StationName=self.name,
+            StationUUID=self.station_uuid,
+            verMajor=self.ver_major,
+            verMinor=self.ver_minor,
+            Files=[commit.to_json() for commit in self.files.values()],
+        )
+        return message
+
+    def _joined(self, connection: Connection, message: Dict[str, Any]):
+        station_uuid = message.get("StationUUID")
+        if not isinstance(station_uuid, str):
+            raise XchangeError("Join without a StationUUID")
+        connection.station_uuid = station_uuid
+        connection.station_name = message.get("StationName", "")
+        connection.provider = message.get("Provider", "")
+        previous = self.peers.get(station_uuid)
+        if previous is not None and previous is not connection:
+            previous.close()
+        self.peers[station_uuid] = connection
+        for data in message.get("Files", []):
+            self._add_commit(Commit.from_json(data, station_uuid))
+
+    def _add_commit(self, commit: Commit):
+        if commit.for_stations and self.station_uuid not in commit.for_stations:
+            return
+        known = commit.file_uuid in self.commits
+        self.commits[commit.file_uuid] = commit
+        if self.on_commit is None or known:
+            return
+        result = self.on_commit(commit)
+        if inspect.isawaitable(result):
+            # may request the file, which needs the reader of the connection
+            task = asyncio.ensure_future(result)
+            self._callbacks.add(task)
+            task.add_done_callback(self._callbacks.discard)
+
+    async def _handle(self, connection: Connection, kind: str, message: Dict[str, Any]):
+        if kind == "MVR_JOIN":
+            self._joined(connection, message)
+            await connection.send(self._join_message("MVR_JOIN_RET"))
+        elif kind == "MVR_COMMIT":
+            commit = Commit.from_json(message, connection.station_uuid or "")
+            await connection.send({"Type": "MVR_COMMIT_RET", "OK": True, "Message": ""})
+            self._add_commit(commit)
+        elif kind == "MVR_REQUEST":
+            file_uuid = message.get("FileUUID")
+            if file_uuid is None and self.files:
+                file_uuid = list(self.files)[-1]
+            if file_uuid not in self.files:
+                raise XchangeError(f"Unknown file {file_uuid}")
+            await connection.send_file(
+                self._sources[file_uuid], self.files[file_uuid].file_size
+            )
+        elif kind == "MVR_LEAVE":
+            await connection.send({"Type": "MVR_LEAVE_RET", "OK": True, "Message": ""})
+            connection.close()
+            self.commits = {
+                file_uuid: commit
+                for file_uuid, commit in self.commits.items()
+                if commit.station_uuid != connection.station_uuid
+            }
+
+
+def _check(reply: Dict[str, Any], kind: str):
+    if reply.get("Type") != kind:
+        raise XchangeError(f"Expected {kind}, got {reply.get('Type')}")
+    if not reply.get("OK", False):
+        raise XchangeError(reply.get("Message") or f"{kind} refused")
@@ -0,0 +1,163 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import io
+import os
+import threading
+from pathlib import Path
+
+import pytest
+
+import pymvr
+from pymvr.tracking import content_hash
+
+tests_path = Path(__file__).parent
+
+
+class SlowSource:
+    """Readable stream of many small chunks, sets started on the first read"""
+
+    def __init__(self, chunks=1000):
+        self.chunks = chunks
+        self.started = threading.Event()
+
+    def read(self, size=-1):
+        self.started.set()
+        if self.chunks == 0:
+            return b""
+        self.chunks -= 1
+        return b"x" * 1000
+
+
+class AsyncSink:
+    """aiohttp like response with an async write()"""
+
+    def __init__(self):
+        self.data = bytearray()
+        self.writes = 0
+
+    async def write(self, data):
+        self.writes += 1
+        self.data += data
+
+
+def test_load_async():
+    path = tests_path / "scene_objects.mvr"
+    with pymvr.GeneralSceneDescription(path) as expected:
+        expected_hash = content_hash(expected.scene)
+
+    async def main():
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        task = asyncio.ensure_future(ticker())
+        from_path = await pymvr.load_async(path)
+        from_bytes = await pymvr.load_async(path.read_bytes())
+        task.cancel()
+        return from_path, from_bytes, ticks
+
+    from_path, from_bytes, ticks = asyncio.run(main())
+    assert ticks > 0  # the event loop kept running
+    for mvr in (from_path, from_bytes):
+        with mvr:
+            assert content_hash(mvr.scene) == expected_hash
+            assert mvr.user_data is not None
+            assert mvr.read_file("GeneralSceneDescription.xml")
+
+
+def test_load_async_cancel():
+    data = (tests_path / "capture_demo_show.mvr").read_bytes()
+
+    async def main():
+        task = asyncio.ensure_future(pymvr.load_async(data))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+
+def test_write_mvr_async(tmp_path, monkeypatch):
+    with pymvr.GeneralSceneDescription(tests_path / "scene_objects.mvr") as mvr:
+        scene = mvr.scene
+
+    def writer():
+        mvr_writer = pymvr.GeneralSceneDescriptionWriter()
+        mvr_writer.serialize_scene(scene)
+        mvr_writer.add_file(b"model" * 1000, "model.3ds")
+        mvr_writer.add_file(SlowSource(5), "stream.3ds")
+        return mvr_writer
+
+    sink = AsyncSink()
+    path = tmp_path / "async.mvr"
+    replaced = []
+    replace = os.replace
+    monkeypatch.setattr(
+        os, "replace", lambda *args: replaced.append(args) or replace(*args)
+    )
+
+    async def main():
+        await writer().write_mvr_async(path)
+        await writer().write_mvr_async(sink)
+
+    asyncio.run(main())
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["async.mvr"]
+    # one temporary file, moved once
+    assert len(replaced) == 1
+    # written fixture ids get their defaults, compare with a synchronous save
+    expected = io.BytesIO()
+    writer().write_mvr(expected)
+    expected.seek(0)
+    with pymvr.GeneralSceneDescription(expected) as written:
+        expected_hash = content_hash(written.scene)
+    for source in (path, io.BytesIO(bytes(sink.data))):
+        with pymvr.GeneralSceneDescription(source) as written:
+            assert content_hash(written.scene) == expected_hash
+            assert written.read_file("model.3ds") == b"model" * 1000
+            assert written.read_file("stream.3ds") == b"x" * 5000
+
+
+def test_write_mvr_async_cancel(tmp_path):
+    source = SlowSource()
+    mvr_writer = pymvr.GeneralSceneDescriptionWriter()
+    mvr_writer.serialize_scene(pymvr.Scene())
+    mvr_writer.add_file(source, "stream.3ds")
+
+    async def main():
+        task = asyncio.ensure_future(mvr_writer.write_mvr_async(tmp_path / "out.mvr"))
+        await asyncio.get_running_loop().run_in_executor(None, source.started.wait)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+    assert source.chunks > 0
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,124 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+
+import pytest
+
+import pymvr
+from pymvr.tracking import content_hash
+
+tests_path = Path(__file__).parent
+
+FILES = {f"meshes/model_{index}.3ds": os.urandom(200_000) for index in range(8)}
+
+
+@pytest.fixture
+def mvr_path(tmp_path):
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    writer.serialize_scene(pymvr.Scene())
+    for name, data in FILES.items():
+        writer.add_file(data, name)
+    path = tmp_path / "files.mvr"
+    writer.write_mvr(path)
+    return path
+
+
+def read_concurrently(mvr, rounds=20):
+    names = list(FILES) * rounds
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(zip(names, executor.map(mvr.read_file, names)))
+
+
+@pytest.mark.parametrize("source", ["path", "bytes", "file object"])
+def test_concurrent_read_file(mvr_path, source):
+    with ExitStack() as stack:
+        if source == "path":
+            mvr = pymvr.GeneralSceneDescription(mvr_path, max_readers=3)
+        elif source == "bytes":
+            mvr = pymvr.GeneralSceneDescription.from_bytes(mvr_path.read_bytes())
+        else:
+            file = stack.enter_context(open(mvr_path, "rb"))
+            mvr = pymvr.GeneralSceneDescription(file)
+        stack.enter_context(mvr)
+        assert sorted(mvr.files()) == sorted(["GeneralSceneDescription.xml", *FILES])
+        for name, data in read_concurrently(mvr):
+            assert data == FILES[name]
+        with mvr.open_file("meshes/model_0.3ds") as f:
+            assert f.read(10) == FILES["meshes/model_0.3ds"][:10]
+        with pytest.raises(KeyError):
+            mvr.read_file("missing.gdtf")
+        if source == "path":
+            assert len(mvr._readers._idle) <= 3
+
+    with pytest.raises(ValueError):
+        mvr.read_file("meshes/model_0.3ds")
+
+
+def test_read_file_without_archive():
+    mvr = pymvr.GeneralSceneDescription.from_xml(
+        b'<GeneralSceneDescription verMajor="1" verMinor="6"><Scene/></GeneralSceneDescription>'
+    )
+    assert mvr.files() == []
+    with pytest.raises(KeyError):
+        mvr.read_file("model.3ds")
+
+
+@pytest.fixture
+def switching():
+    # switch threads very often, so races show up
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    yield
+    sys.setswitchinterval(interval)
+
+
+def test_concurrent_lazy_reads(switching):
+    with pymvr.GeneralSceneDescription(tests_path / "scene_objects.mvr") as mvr:
+        expected = content_hash(mvr.scene)
+
+        # raw UserData is parsed once, all threads get the same list
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            data = list(executor.map(lambda _: mvr.user_data.data, range(32)))
+        assert all(item is data[0] for item in data)
+
+        # clones are materialized once while being read from many threads
+        for _ in range(5):
+            clone = mvr.scene.clone()
+
+            def read(_, clone=clone):
+                names = []
+                for layer in clone.layers:
+                    for obj in layer.child_list.scene_objects:
+                        names.append((obj.name, obj.uuid, str(obj.matrix)))
+                return names, content_hash(clone)
+
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = list(executor.map(read, range(16)))
+            assert all(result == results[0] for result in results)
+            assert results[0][1] == expected
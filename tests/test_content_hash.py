@@ -0,0 +1,153 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import copy
+import gc
+import pickle
+from pathlib import Path
+
+import pymvr
+from pymvr import tracking
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name="basic_fixture.mvr"):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read.scene
+
+
+def test_equal_content_equal_hash():
+    scene = read("scene_objects.mvr")
+    assert scene.content_hash() == read("scene_objects.mvr").content_hash()
+    assert scene.content_hash() != read().content_hash()
+    copied = pymvr.load_snapshot(pymvr.save_snapshot(scene))
+    assert copied.content_hash() == scene.content_hash()
+    assert len(scene.content_hash()) == 16
+
+
+def test_hash_invalidated_on_change():
+    scene = read()
+    layer = scene.layers[0]
+    fixture = layer.child_list.fixtures[0]
+    original = scene.content_hash()
+    layer_hash = layer.content_hash()
+    fixture_hash = fixture.content_hash()
+
+    fixture.gdtf_mode = "Other"
+    assert fixture.content_hash() != fixture_hash
+    assert layer.content_hash() != layer_hash
+    assert scene.content_hash() != original
+    fixture.gdtf_mode = read().layers[0].child_list.fixtures[0].gdtf_mode
+    assert scene.content_hash() == original
+
+    # values changed in place
+    fixture.matrix.matrix[3][0] += 1
+    assert scene.content_hash() != original
+    fixture.matrix.matrix[3][0] -= 1
+    fixture.addresses.addresses[0].universe += 1
+    assert scene.content_hash() != original
+    fixture.addresses.addresses[0].universe -= 1
+    assert scene.content_hash() == original
+
+    # lists
+    added = pymvr.Fixture(name="Added")
+    layer.child_list.fixtures.append(added)
+    assert scene.content_hash() != original
+    added.name = "Renamed"
+    renamed = scene.content_hash()
+    layer.child_list.fixtures.remove(added)
+    assert scene.content_hash() == original
+    layer.child_list.fixtures += [added]
+    assert scene.content_hash() == renamed
+
+
+def test_copies_do_not_share_tracking():
+    scene = read()
+    original = scene.content_hash()
+    for copied in (copy.deepcopy(scene), pickle.loads(pickle.dumps(scene))):
+        fixture = copied.layers[0].child_list.fixtures[0]
+        assert copied.content_hash() == original
+        fixture.name = "Changed in copy"
+        assert copied.content_hash() != original
+        assert scene.content_hash() == original
+
+
+def test_shared_values():
+    matrix = pymvr.Matrix(0)
+    color = pymvr.Color()
+    a = pymvr.Fixture(name="a", matrix=matrix, color=color)
+    b = pymvr.Fixture(name="b", matrix=matrix, color=color)
+    a_hash, b_hash = a.content_hash(), b.content_hash()
+
+    matrix.matrix[3][0] = 7.0
+    assert a.content_hash() != a_hash
+    assert b.content_hash() != b_hash
+    matrix.matrix[3][0] = 0
+    assert (a.content_hash(), b.content_hash()) == (a_hash, b_hash)
+
+    color.x = 0.5
+    assert a.content_hash() != a_hash
+    assert b.content_hash() != b_hash
+
+
+def test_lists_are_replaced_when_hashed():
+    scene = read()
+    fixture = scene.layers[0].child_list.fixtures[0]
+    fixtures = scene.layers[0].child_list.fixtures
+    # parsing does not pay for tracking
+    assert type(fixtures) is list
+    assert type(fixture.matrix.matrix[0]) is list
+
+    original = scene.content_hash()
+    assert scene.layers[0].child_list.fixtures == fixtures
+    assert type(scene.layers[0].child_list.fixtures) is tracking.NodeList
+    assert type(fixture.matrix.matrix[0]) is tracking.NodeList
+
+    scene.layers[0].child_list.fixtures.append(pymvr.Fixture(name="new"))
+    assert scene.content_hash() != original
+    fixture.matrix.matrix[3][0] = 7.0
+    assert scene.content_hash() != original
+
+
+def test_hook_installed_while_used():
+    scene = read()
+    gc.collect()  # objects of other tests
+    users = tracking._users
+    scene.content_hash()
+    assert tracking._users == users + 1
+    assert "__setattr__" in vars(pymvr.BaseNode)
+
+    del scene
+    gc.collect()
+    assert tracking._users == users
+    if users == 0:
+        assert "__setattr__" not in vars(pymvr.BaseNode)
+
+
+def test_matrix_equality():
+    assert pymvr.Matrix(0) == pymvr.Matrix(0)
+    assert not pymvr.Matrix(0) != pymvr.Matrix(0)
+    assert pymvr.Matrix(0) != pymvr.Matrix("{1,0,0}{0,1,0}{0,0,1}{5,0,0}")
+    assert pymvr.Matrix(0) != None  # noqa: E711
@@ -0,0 +1,235 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import hashlib
+from pathlib import Path
+
+import pytest
+
+import pymvr
+from pymvr.tracking import content_hash
+
+tests_path = Path(__file__).parent
+
+
+def load_demo():
+    return pymvr.GeneralSceneDescription(tests_path / "capture_demo_show.mvr")
+
+
+def edit(scene):
+    """Rename, move, reorder, remove and add nodes of the demo scene"""
+    layers = scene.layers
+    fixtures = layers[1].child_list.fixtures
+    fixtures[0].name = "Renamed"
+    fixtures[2].matrix = pymvr.Matrix(
+        [[1, 0, 0, 0], [0, 1, 0, 0], [0, 0, 1, 0], [5, 6, 7, 1]]
+    )
+    moved = fixtures.pop(1)
+    layers[4].child_list.fixtures.insert(0, moved)
+    layers[4].child_list.fixtures.reverse()
+    group = pymvr.GroupObject(
+        name="Group",
+        child_list=pymvr.ChildList(
+            fixtures=[fixtures.pop(), pymvr.Fixture(name="New")]
+        ),
+    )
+    layers.insert(
+        0, pymvr.Layer(name="New", child_list=pymvr.ChildList(group_objects=[group]))
+    )
+    layers.remove(layers[-1])
+    scene.aux_data.classes.append(pymvr.Class(name="New class"))
+
+
+def test_delta_round_trip():
+    with load_demo() as sender, load_demo() as receiver:
+        target = sender.scene.clone()
+        edit(target)
+        delta = pymvr.make_delta(sender, target)
+        assert delta.removed and delta.added and delta.fields and delta.orders
+        assert not delta.files  # no packed file changed
+
+        data = delta.to_bytes()
+        received = pymvr.SceneDelta.from_bytes(data)
+        original = content_hash(receiver.scene)
+        scene = pymvr.apply_delta(receiver, received)
+        assert content_hash(scene) == content_hash(target)
+        assert not pymvr.diff_scenes(scene, target)
+        assert content_hash(receiver.scene) == original
+
+        # the same delta again, in place
+        pymvr.apply_delta(receiver.scene, received, in_place=True)
+        assert content_hash(receiver.scene) == content_hash(target)
+
+        # nothing to send between equal scenes
+        assert not pymvr.make_delta(sender.scene.clone(), sender.scene)
+
+
+def test_delta_validation():
+    with load_demo() as sender, load_demo() as receiver:
+        target = sender.scene.clone()
+        edit(target)
+        delta = pymvr.make_delta(sender.scene, target)
+        edited = receiver.scene.clone()
+        edited.layers[2].name = "Other"
+        with pytest.raises(pymvr.DeltaError, match="different scene"):
+            pymvr.apply_delta(edited, delta)
+
+        broken = pymvr.SceneDelta.from_bytes(delta.to_bytes())
+        broken.removed.append("not-there")
+        with pytest.raises(pymvr.DeltaError, match="not in the scene"):
+            pymvr.apply_delta(receiver, broken)
+        # fields do not match the target
+        broken = pymvr.SceneDelta.from_bytes(delta.to_bytes())
+        uuid = next(iter(broken.fields))
+        broken.fields[uuid]["name"] = "Something else"
+        with pytest.raises(pymvr.DeltaError, match="differs"):
+            pymvr.apply_delta(receiver, broken)
+        assert content_hash(receiver.scene) == delta.base_hash
+
+        # a wrong base is only found by the target hash, in place
+        with pytest.raises(pymvr.DeltaError, match="differs"):
+            pymvr.apply_delta(receiver, broken, in_place=True)
+        unchecked = pymvr.SceneDelta.from_bytes(delta.to_bytes())
+        unchecked.base_hash = None
+        before = edited.clone()
+        original = content_hash(edited)
+        with pytest.raises(pymvr.DeltaError, match="differs"):
+            pymvr.apply_delta(edited, unchecked, in_place=True)
+        assert content_hash(edited) == original
+        assert not pymvr.diff_scenes(before, edited)
+        assert content_hash(receiver.scene) == delta.base_hash
+
+
+def test_delta_sees_changes_of_shared_values():
+    with load_demo() as sender:
+        target = sender.scene.clone()
+        fixtures = target.layers[1].child_list.fixtures
+        matrix = fixtures[0].matrix
+        fixtures[1].matrix = matrix
+        assert fixtures[0].uuid not in pymvr.make_delta(sender, target).fields
+
+        # both fixtures were hashed, the change drops both hashes
+        matrix.matrix[3][0] = 42.0
+        delta = pymvr.make_delta(sender, target)
+        assert fixtures[0].uuid in delta.fields
+        assert fixtures[1].uuid in delta.fields
+
+
+def test_delta_structure_checks():
+    inner = pymvr.GroupObject(name="Inner")
+    outer = pymvr.GroupObject(
+        name="Outer", child_list=pymvr.ChildList(group_objects=[inner])
+    )
+    fixture = pymvr.Fixture(name="Fixture")
+    inner.child_list = pymvr.ChildList(fixtures=[fixture])
+    layer = pymvr.Layer(child_list=pymvr.ChildList(group_objects=[outer]))
+    scene = pymvr.Scene(layers=pymvr.Layers(layers=[layer]))
+
+    def check(orders, message, removed=()):
+        delta = pymvr.SceneDelta()
+        delta.orders = orders
+        delta.removed = list(removed)
+        with pytest.raises(pymvr.DeltaError, match=message):
+            pymvr.apply_delta(scene, delta)
+
+    # the outer group into its own child
+    check(
+        [
+            (layer.uuid, "group_objects", []),
+            (inner.uuid, "group_objects", [outer.uuid]),
+        ],
+        "nested in itself",
+    )
+    check([(layer.uuid, "group_objects", [])], "left out")
+    check([(inner.uuid, "fixtures", [])], "left out", removed=[outer.uuid])
+    check([(layer.uuid, "fixtures", [outer.uuid])], "can not be in fixtures")
+    check(
+        [(layer.uuid, "group_objects", [outer.uuid, outer.uuid])],
+        "placed twice",
+    )
+
+    # a valid move: the fixture up into the outer group
+    delta = pymvr.SceneDelta()
+    delta.orders = [
+        (inner.uuid, "fixtures", []),
+        (outer.uuid, "fixtures", [fixture.uuid]),
+    ]
+    moved = pymvr.apply_delta(scene, delta)
+    assert [
+        f.name for f in moved.layers[0].child_list.group_objects[0].child_list.fixtures
+    ] == ["Fixture"]
+    assert inner.child_list.fixtures == [fixture]
+
+
+def test_delta_resources(tmp_path):
+    def write(path, files):
+        writer = pymvr.GeneralSceneDescriptionWriter()
+        with load_demo() as mvr:
+            writer.serialize_scene(mvr.scene)
+        for data, name in files:
+            writer.add_file(data, name)
+        writer.write_mvr(path)
+
+    write(
+        tmp_path / "base.mvr",
+        [(b"gdtf", "a.gdtf"), (b"mesh", "b.glb"), (b"old", "e.png")],
+    )
+    write(
+        tmp_path / "target.mvr",
+        [(b"gdtf", "a.gdtf"), (b"new mesh", "b.glb"), (b"more", "c.3ds")],
+    )
+    with pymvr.GeneralSceneDescription(tmp_path / "base.mvr") as base:
+        with pymvr.GeneralSceneDescription(tmp_path / "target.mvr") as target:
+            delta = pymvr.make_delta(base, target, files={"d.txt": b"extra"})
+            # only changed files are in the delta, unchanged ones are not read
+            assert "_resource_hashes" not in vars(base)
+            assert sorted(delta.resources) == ["b.glb", "c.3ds", "d.txt"]
+            assert delta.resources["b.glb"] == hashlib.sha256(b"new mesh").hexdigest()
+            assert delta.files == {
+                "b.glb": b"new mesh",
+                "c.3ds": b"more",
+                "d.txt": b"extra",
+            }
+            assert delta.removed_files == ["e.png"]
+
+            # the same with the hashes of the receiver's files
+            known = pymvr.resource_hashes(base)
+            assert pymvr.make_delta(base, target, known=known).files == {
+                "b.glb": b"new mesh",
+                "c.3ds": b"more",
+            }
+
+        # the receiver writes the new files and copies the others
+        scene = pymvr.apply_delta(base, pymvr.SceneDelta.from_bytes(delta.to_bytes()))
+        writer = pymvr.GeneralSceneDescriptionWriter()
+        writer.serialize_scene(scene)
+        delta.add_files(writer)
+        writer.write_mvr(tmp_path / "updated.mvr", base=base)
+    with pymvr.GeneralSceneDescription(tmp_path / "updated.mvr") as updated:
+        assert updated.read_file("a.gdtf") == b"gdtf"
+        assert updated.read_file("b.glb") == b"new mesh"
+        assert "e.png" not in updated.files()
+        hashes = pymvr.resource_hashes(updated)
+        assert sorted(hashes) == ["a.gdtf", "b.glb", "c.3ds", "d.txt"]
+        assert all(hashes[name] == digest for name, digest in delta.resources.items())
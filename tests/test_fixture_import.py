@@ -0,0 +1,116 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+from pathlib import Path
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+PATCH_SHEET = """name,fixture_id,fixture_id_numeric,address,o_x,o_z
+Spot 1,101,101,1.1,1000,5000
+Spot 2,102,,2.17,2000,5000
+Wash 1,201,201,1041,,
+"""
+
+
+def test_import_patch_sheet(tmp_path):
+    csv_path = tmp_path / "patch.csv"
+    csv_path.write_text(PATCH_SHEET, encoding="utf-8")
+    child_list = pymvr.ChildList()
+    fixtures = pymvr.import_fixtures(
+        child_list,
+        pymvr.read_patch_sheet(csv_path),
+        defaults={"gdtf_spec": "Generic@Spot.gdtf", "gdtf_mode": "Standard"},
+    )
+    assert child_list.fixtures == fixtures
+    assert [i.name for i in fixtures] == ["Spot 1", "Spot 2", "Wash 1"]
+    assert [i.fixture_id_numeric for i in fixtures] == [101, None, 201]
+    assert [str(i.addresses.addresses[0]) for i in fixtures] == [
+        "B: 0, U: 1, A: 1",
+        "B: 0, U: 2, A: 17",
+        "B: 0, U: 3, A: 17",
+    ]
+    assert fixtures[1].matrix.matrix[3] == [2000.0, 0, 5000.0, 0]
+    assert fixtures[2].matrix.matrix == pymvr.Matrix(0).matrix
+    assert all(i.gdtf_mode == "Standard" for i in fixtures)
+    assert len({i.uuid for i in fixtures}) == 3
+    assert fixtures[0].addresses is not fixtures[1].addresses
+
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    layer = pymvr.Layer(name="Patch", child_list=child_list)
+    pymvr.Scene(layers=pymvr.Layers(layers=[layer])).to_xml(writer.xml_root)
+    mvr_path = tmp_path / "patch.mvr"
+    writer.write_mvr(mvr_path)
+    with pymvr.GeneralSceneDescription(mvr_path) as mvr_read:
+        read_fixtures = mvr_read.scene.layers[0].child_list.fixtures
+        assert [i.uuid for i in read_fixtures] == [i.uuid for i in fixtures]
+        assert read_fixtures[2].addresses.addresses[0].universe == 3
+
+
+def test_import_fixture_table_round_trip():
+    with pymvr.GeneralSceneDescription(tests_path / "basic_fixture.mvr") as mvr_read:
+        table = pymvr.fixture_table(mvr_read.scene, use_numpy=False)
+    child_list = pymvr.ChildList()
+    pymvr.import_fixtures(child_list, table)
+    scene = pymvr.Scene(
+        layers=pymvr.Layers(layers=[pymvr.Layer(child_list=child_list)])
+    )
+    imported = pymvr.fixture_table(scene, use_numpy=False)
+    for name in pymvr.table.COLUMNS:
+        if name != "layer":
+            assert list(imported[name]) == list(table[name]), name
+
+
+def test_import_does_not_share_values():
+    protocols = pymvr.Protocols(children=[pymvr.Protocol(geometry="Beam")])
+    fixtures = pymvr.import_fixtures(
+        pymvr.ChildList(),
+        {"name": ["Spot 1", "Spot 2"]},
+        defaults={"protocols": protocols, "gobo": pymvr.Gobo(filename="image.png")},
+    )
+    first, second = fixtures
+    for name in ("matrix", "color", "addresses", "protocols", "mappings", "gobo"):
+        assert getattr(first, name) is not getattr(second, name), name
+    assert first.matrix.matrix[3] is not second.matrix.matrix[3]
+    assert first.protocols.children[0] is not protocols.children[0]
+
+    first.matrix.matrix[3][0] = 1.0
+    first.color.x = 0.5
+    first.protocols.children.clear()
+    assert second.matrix.matrix[3][0] == 0
+    assert second.color.x != 0.5
+    assert second.protocols.children[0].geometry == "Beam"
+
+
+def test_import_invalid_columns():
+    with pytest.raises(ValueError):
+        pymvr.import_fixtures(pymvr.ChildList(), {"dimmer": [1]})
+    with pytest.raises(ValueError):
+        pymvr.import_fixtures(pymvr.ChildList(), {"name": ["a", "b"], "uuid": ["u"]})
+    with pytest.raises(ValueError):
+        pymvr.read_patch_sheet(io.StringIO("name,dimmer\nSpot,1\n"))
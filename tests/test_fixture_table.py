@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import math
+from array import array
+from pathlib import Path
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def build_scene():
+    nested = pymvr.Fixture(name="Nested", uuid="n", fixture_id_numeric=7)
+    group = pymvr.GroupObject(
+        name="Group", child_list=pymvr.ChildList(fixtures=[nested])
+    )
+    spot = pymvr.Fixture(
+        name="Spot",
+        uuid="s",
+        gdtf_spec="Spot.gdtf",
+        gdtf_mode="Standard",
+        fixture_id="101",
+        matrix=pymvr.Matrix(
+            [[1.0, 0, 0, 0], [0, 1.0, 0, 0], [0, 0, 1.0, 0], [10.0, 20.0, 30.0, 0]]
+        ),
+        addresses=pymvr.Addresses(
+            addresses=[pymvr.Address(dmx_break=0, universe=3, address=17)]
+        ),
+    )
+    child_list = pymvr.ChildList(fixtures=[spot], group_objects=[group])
+    layer = pymvr.Layer(name="Stage", child_list=child_list)
+    return pymvr.Scene(layers=pymvr.Layers(layers=[layer]))
+
+
+def test_fixture_table_columns():
+    table = pymvr.fixture_table(build_scene(), use_numpy=False)
+    assert len(table) == 2
+    assert list(table) == list(pymvr.table.COLUMNS)
+    assert table["uuid"] == ["s", "n"]
+    assert table["layer"] == ["Stage", "Stage"]
+    assert table["gdtf_mode"] == ["Standard", None]
+    assert isinstance(table["universe"], array)
+    assert list(table["fixture_id_numeric"]) == [-1, 7]
+    assert list(table["universe"]) == [3, -1]
+    assert list(table["address"]) == [17, -1]
+    assert list(table["o_x"]) == [10.0, 0.0]
+    assert list(table["o_z"]) == [30.0, 0.0]
+    assert table["color_Y"][0] == 100.0
+
+
+def test_fixture_table_from_file():
+    with pymvr.GeneralSceneDescription(tests_path / "basic_fixture.mvr") as mvr_read:
+        fixtures = mvr_read.scene.layers[0].child_list.fixtures
+        table = pymvr.fixture_table(mvr_read.scene, use_numpy=False)
+    assert len(table) == len(fixtures)
+    assert table["uuid"][0] == fixtures[0].uuid
+    assert table["w_z"][0] == fixtures[0].matrix.matrix[2][2]
+    assert not math.isnan(table["color_x"][0])
+
+
+def test_fixture_table_colors():
+    text = pymvr.Fixture(name="Text", color="0.2,0.4,50")
+    missing = pymvr.Fixture(name="Missing")
+    missing.color = None
+    child_list = pymvr.ChildList(fixtures=[text, missing])
+    scene = pymvr.Scene(
+        layers=pymvr.Layers(layers=[pymvr.Layer(child_list=child_list)])
+    )
+    table = pymvr.fixture_table(scene, use_numpy=False)
+    assert list(table["color_x"])[0] == 0.2
+    assert list(table["color_Y"])[0] == 50.0
+    assert all(math.isnan(value) for value in list(table["color_y"])[1:])
+
+    imported = pymvr.import_fixtures(pymvr.ChildList(), table)
+    assert (imported[0].color.x, imported[0].color.y) == (0.2, 0.4)
+    # no color comes back as the default one of Fixture()
+    assert str(imported[1].color) == str(pymvr.Fixture().color)
+
+
+def test_fixture_table_numpy():
+    numpy = pytest.importorskip("numpy")
+    table = pymvr.fixture_table(build_scene())
+    assert isinstance(table["o_y"], numpy.ndarray)
+    assert table["o_y"].tolist() == [20.0, 0.0]
+    assert table["universe"].tolist() == [3, -1]
+    assert table["uuid"].tolist() == ["s", "n"]
@@ -0,0 +1,91 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import zipfile
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read.scene
+
+
+def save(scene, incremental=True):
+    mvr_writer = pymvr.GeneralSceneDescriptionWriter(incremental=incremental)
+    mvr_writer.serialize_scene(scene)
+    output = io.BytesIO()
+    mvr_writer.write_mvr(output)
+    with zipfile.ZipFile(output) as z:
+        return z.read("GeneralSceneDescription.xml"), mvr_writer.fragments
+
+
+def test_incremental_output_is_identical():
+    for file_name in ["basic_fixture.mvr", "scene_objects.mvr"]:
+        scene = read(file_name)
+        expected, _ = save(scene, incremental=False)
+        first, _ = save(scene)
+        second, fragments = save(scene)
+        assert first == expected
+        assert second == expected
+        assert fragments.built == 0
+
+
+def test_only_changed_nodes_are_serialized_again():
+    scene = read("scene_objects.mvr")
+    save(scene)
+    child_list = next(
+        layer.child_list for layer in scene.layers if layer.child_list.fixtures
+    )
+    child_list.fixtures[0].name = "Changed"
+
+    data, fragments = save(scene)
+    assert data == save(scene, incremental=False)[0]
+    assert b'name="Changed"' in data
+    # the fixture and its layer
+    assert fragments.built == 2
+    assert fragments.reused > 0
+
+    child_list.fixtures.pop()
+    data, fragments = save(scene)
+    assert data == save(scene, incremental=False)[0]
+
+
+def test_plain_save_serializes_directly(monkeypatch):
+    scene = read("scene_objects.mvr")
+    placeholders = []
+    child_xml = pymvr.fragments.child_xml
+    monkeypatch.setattr(
+        pymvr.fragments,
+        "child_xml",
+        lambda node: placeholders.append(node) or child_xml(node),
+    )
+    expected, _ = save(scene, incremental=False)
+    assert placeholders == []
+    assert save(scene)[0] == expected
+    assert placeholders
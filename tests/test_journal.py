@@ -0,0 +1,129 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name="scene_objects.mvr"):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read.scene
+
+
+def scene_xml(scene):
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    scene.to_xml(writer.xml_root)
+    return ElementTree.tostring(writer.xml_root)
+
+
+def fixture_list(scene):
+    return next(layer.child_list for layer in scene.layers if layer.child_list.fixtures)
+
+
+def test_undo_and_redo_transactions():
+    scene = read()
+    original = scene_xml(scene)
+    child_list = fixture_list(scene)
+    with pymvr.Journal(scene) as journal:
+        with journal.transaction("Re-patch"):
+            for fixture in child_list.fixtures:
+                fixture.gdtf_mode = "Extended"
+            new = pymvr.Fixture(name="New", fixture_id="1", fixture_id_numeric=1)
+            child_list.fixtures.append(new)
+            del child_list.fixtures[0]
+        scene.layers[0].name = "Renamed"
+        changed = scene_xml(scene)
+
+        assert len(journal.undo_stack) == 2
+        assert journal.undo()
+        assert scene.layers[0].name != "Renamed"
+        assert journal.undo()
+        assert scene_xml(scene) == original
+        assert not journal.undo()
+
+        assert journal.redo()
+        assert journal.redo()
+        assert scene_xml(scene) == changed
+        assert not journal.can_redo
+
+
+def test_changes_of_added_nodes_are_recorded():
+    scene = read()
+    child_list = fixture_list(scene)
+    with pymvr.Journal(scene) as journal:
+        fixture = pymvr.Fixture(name="New")
+        child_list.fixtures.append(fixture)
+        fixture.addresses.addresses.append(pymvr.Address(universe=2))
+        fixture.matrix.matrix[3][2] = 500
+        assert len(journal.undo_stack) == 3
+        journal.undo()
+        assert fixture.matrix.matrix[3][2] == 0
+        journal.undo()
+        assert fixture.addresses.addresses == []
+
+
+def test_failed_transaction_is_rolled_back():
+    scene = read()
+    original = scene_xml(scene)
+    with pymvr.Journal(scene) as journal:
+        with pytest.raises(ValueError):
+            with journal.transaction():
+                fixture_list(scene).fixtures.clear()
+                raise ValueError()
+        assert scene_xml(scene) == original
+        assert not journal.can_undo
+
+
+def test_history_is_bounded_and_per_scene():
+    scene = read()
+    other = read()
+    with pymvr.Journal(scene, limit=3) as journal:
+        for index in range(5):
+            scene.layers[0].name = f"Layer {index}"
+        other.layers[0].name = "Not recorded"
+        assert len(journal.undo_stack) == 3
+        while journal.undo():
+            pass
+        assert scene.layers[0].name == "Layer 1"
+
+
+def test_saving_is_not_recorded(tmp_path):
+    scene = read()
+    fixture = pymvr.Fixture(name="No id", fixture_id=None)
+    fixture_list(scene).fixtures.append(fixture)
+    with pymvr.Journal(scene) as journal:
+        writer = pymvr.GeneralSceneDescriptionWriter()
+        writer.serialize_scene(scene)
+        writer.write_mvr(tmp_path / "saved.mvr")
+        assert not journal.can_undo
+    assert fixture.fixture_id is None
+    with pymvr.GeneralSceneDescription(tmp_path / "saved.mvr") as saved:
+        saved_fixture = fixture_list(saved.scene).fixtures[-1]
+        assert (saved_fixture.fixture_id, saved_fixture.fixture_id_numeric) == ("0", 0)
@@ -0,0 +1,83 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+from pathlib import Path
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+FILES = ["basic_fixture.mvr", "scene_objects.mvr", "capture_demo_show.mvr"]
+
+
+def layer_count(mvr):
+    return len(mvr.scene.layers)
+
+
+@pytest.fixture
+def paths(tmp_path):
+    broken = tmp_path / "broken.mvr"
+    broken.write_bytes(b"not a zip file")
+    return [tests_path / file_name for file_name in FILES] + [broken]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_load_many_reports_errors_per_file(paths, workers):
+    results = {
+        Path(result.path).name: result
+        for result in pymvr.load_many(paths, workers=workers, chunksize=2)
+    }
+    assert set(results) == set(FILES) | {"broken.mvr"}
+    assert not results["broken.mvr"].ok
+    for file_name in FILES:
+        with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr:
+            expected = mvr.scene.content_hash()
+        assert results[file_name].ok
+        assert results[file_name].value.scene.content_hash() == expected
+
+
+def test_load_many_with_summaries(paths):
+    results = pymvr.load_many(paths[:2], workers=2, function=layer_count)
+    assert sorted(result.value for result in results) == [1, 7]
+
+
+def unpicklable(mvr):
+    if len(mvr.scene.layers) == 1:
+        return threading.Lock()
+    return len(mvr.scene.layers)
+
+
+def test_load_many_with_unpicklable_value(paths):
+    results = {
+        Path(result.path).name: result
+        for result in pymvr.load_many(
+            paths[:2], workers=2, chunksize=2, function=unpicklable
+        )
+    }
+    assert not results["basic_fixture.mvr"].ok
+    assert "pickle" in str(results["basic_fixture.mvr"].error)
+    assert results["scene_objects.mvr"].value == 7
@@ -0,0 +1,158 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import threading
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name="scene_objects.mvr"):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read.scene
+
+
+def fixture_list(scene):
+    return next(layer.child_list for layer in scene.layers if layer.child_list.fixtures)
+
+
+def test_changes_are_reported():
+    scene = read()
+    child_list = fixture_list(scene)
+    received = []
+    with pymvr.Observer(scene, received.append):
+        fixture = child_list.fixtures[0]
+        fixture.gdtf_mode = "Extended"
+        fixture.matrix.matrix[3][0] = 100
+        removed = child_list.fixtures.pop()
+        read().layers[0].name = "Other scene"
+
+    assert [changes.modified for changes in received[:2]] == [
+        [(fixture, {"gdtf_mode"})],
+        [(fixture, {"matrix"})],
+    ]
+    assert received[2].removed == [removed]
+    assert received[2].modified == [(child_list, {"fixtures"})]
+    assert len(received) == 3
+
+
+def test_batch_is_delivered_once():
+    scene = read()
+    child_list = fixture_list(scene)
+    received = []
+    with pymvr.Observer(scene, received.append):
+        with pymvr.batch_changes():
+            for fixture in child_list.fixtures:
+                fixture.gdtf_mode = "Extended"
+                fixture.gdtf_mode = "Basic"
+            new = pymvr.Fixture(name="New")
+            child_list.fixtures.append(new)
+            new.name = "Renamed"
+            temporary = pymvr.Fixture(name="Temporary")
+            child_list.fixtures.append(temporary)
+            child_list.fixtures.remove(temporary)
+            assert received == []
+
+    assert len(received) == 1
+    changes = received[0]
+    assert changes.added == [new]
+    assert changes.removed == []
+    assert {node for node, _ in changes.modified} == set(child_list.fixtures[:-1]) | {
+        child_list
+    }
+    assert all(
+        fields == {"gdtf_mode"}
+        for node, fields in changes.modified
+        if node is not child_list
+    )
+    assert changes.fields(child_list) == {"fixtures"}
+
+
+def test_journal_transactions_are_batches():
+    scene = read()
+    received = []
+    with pymvr.Observer(scene, received.append), pymvr.Journal(scene) as journal:
+        with journal.transaction():
+            for layer in scene.layers:
+                layer.name = "Renamed"
+        journal.undo()
+    assert len(received) == 2
+    assert {node for node, _ in received[1].modified} == set(scene.layers)
+
+
+def test_equal_nodes_are_reported_separately():
+    first = pymvr.Geometry3D(file_name="truss.glb")
+    second = pymvr.Geometry3D(file_name="truss.glb")
+    scene = pymvr.Scene(
+        layers=pymvr.Layers(
+            layers=[
+                pymvr.Layer(
+                    child_list=pymvr.ChildList(
+                        scene_objects=[
+                            pymvr.SceneObject(
+                                geometries=pymvr.Geometries(geometry3d=[first, second])
+                            )
+                        ]
+                    )
+                )
+            ]
+        )
+    )
+    received = []
+    with pymvr.Observer(scene, received.append):
+        with pymvr.batch_changes():
+            first.file_name = "first.glb"
+            second.file_name = "first.glb"
+    assert [node for node, _ in received[0].modified] == [first, second]
+    assert received[0].modified[1][0] is second
+
+
+def test_batches_are_per_thread():
+    scene = read()
+    received = []
+    with pymvr.Observer(scene, received.append):
+        with pymvr.batch_changes():
+            scene.layers[0].name = "Batched"
+
+            def rename():
+                scene.layers[1].name = "Other thread"
+
+            thread = threading.Thread(target=rename)
+            thread.start()
+            thread.join()
+            assert [changes.modified for changes in received] == [
+                [(scene.layers[1], {"name"})]
+            ]
+    assert received[1].modified == [(scene.layers[0], {"name"})]
+
+
+def test_saving_is_not_reported():
+    scene = read()
+    fixture_list(scene).fixtures[0].fixture_id = None
+    received = []
+    with pymvr.Observer(scene, received.append):
+        pymvr.GeneralSceneDescriptionWriter().serialize_scene(scene)
+    assert received == []
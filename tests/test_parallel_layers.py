@@ -0,0 +1,145 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import time
+import uuid
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import pymvr
+import pymvr.parallel
+from pymvr.tracking import content_hash
+
+tests_path = Path(__file__).parent
+
+
+def synthetic_scene(layer_count: int, objects_per_layer: int) -> bytes:
+    """GeneralSceneDescription.xml with layer_count * objects_per_layer
+    scene objects"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<GeneralSceneDescription verMajor="1" verMinor="6"><Scene><Layers>',
+    ]
+    for layer in range(layer_count):
+        parts.append(f'<Layer name="Layer {layer}" uuid="{uuid.uuid4()}"><ChildList>')
+        for index in range(objects_per_layer):
+            parts.append(
+                f'<SceneObject name="Object {index}" uuid="{uuid.uuid4()}">'
+                f"<Matrix>{{1,0,0}}{{0,1,0}}{{0,0,1}}{{{index},{layer},0}}</Matrix>"
+                "<Classing>8fd5d8bb-6e59-4a81-9b48-3f9d3d0e0bf9</Classing>"
+                "</SceneObject>"
+            )
+        parts.append("</ChildList></Layer>")
+    parts.append("</Layers></Scene></GeneralSceneDescription>")
+    return "".join(parts).encode("utf-8")
+
+
+@pytest.fixture
+def threads(monkeypatch):
+    # the thread pool also works with the GIL, just without a speedup
+    monkeypatch.setattr(pymvr.parallel, "free_threaded", lambda: True)
+
+
+def test_parallel_layers_match_serial(pymvr_module, threads):
+    data = synthetic_scene(5, 20)
+    serial = pymvr_module.GeneralSceneDescription.from_xml(data)
+    parallel = pymvr_module.GeneralSceneDescription.from_xml(data, workers=2)
+
+    assert [layer.uuid for layer in parallel.scene.layers] == [
+        layer.uuid for layer in serial.scene.layers
+    ]
+    assert content_hash(parallel.scene) == content_hash(serial.scene)
+
+
+def test_parallel_layers_from_archive(pymvr_module, threads):
+    path = tests_path / "scene_objects.mvr"
+    serial = pymvr_module.GeneralSceneDescription(path)
+    with pymvr_module.GeneralSceneDescription(path, workers=2) as parallel:
+        assert len(parallel.scene.layers) == 7
+        assert content_hash(parallel.scene) == content_hash(serial.scene)
+        assert content_hash(parallel.user_data) == content_hash(serial.user_data)
+
+
+def test_parallel_layers_progress(threads):
+    data = synthetic_scene(5, 20)
+    reports = []
+
+    def progress(state):
+        reports.append((state.layers_done, state.nodes))
+
+    path = io.BytesIO()
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("GeneralSceneDescription.xml", data)
+    path.seek(0)
+    with pymvr.GeneralSceneDescription(path, workers=2, progress=progress):
+        pass
+    # one report per layer, the nodes built by the workers are counted
+    assert [done for done, _ in reports] == [0, 1, 2, 3, 4, 5]
+    assert reports[-1][1] == 100
+
+    token = pymvr.CancelToken()
+
+    def cancel(state):
+        if state.layers_done == 1:
+            token.cancel()
+
+    path.seek(0)
+    with pytest.raises(pymvr.Cancelled):
+        pymvr.GeneralSceneDescription(path, workers=2, progress=cancel, cancel=token)
+
+
+def test_workers_need_free_threading():
+    if pymvr.parallel.free_threaded():
+        pytest.skip("Running without the GIL")
+    with pytest.warns(RuntimeWarning, match="free-threaded"):
+        mvr = pymvr.GeneralSceneDescription.from_xml(synthetic_scene(2, 2), workers=2)
+    assert len(mvr.scene.layers) == 2
+
+
+def test_parallel_layers_benchmark(request):
+    # uv run pytest --benchmark -s tests/test_parallel_layers.py
+    if not request.config.getoption("--benchmark"):
+        pytest.skip("Benchmarks not requested")
+
+    data = synthetic_scene(10, 10_000)
+    timings = {}
+    mvr = None
+    for workers in (1, 2, 4):
+        best = None
+        for _ in range(3):
+            mvr = None  # do not time freeing the previous scene
+            start = time.perf_counter()
+            mvr = pymvr.GeneralSceneDescription.from_xml(data, workers=workers)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        assert (
+            sum(len(layer.child_list.scene_objects) for layer in mvr.scene.layers)
+            == 100_000
+        )
+        timings[workers] = best
+    for workers, elapsed in timings.items():
+        print(f"workers={workers}: {elapsed:.2f}s")
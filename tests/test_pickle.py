@@ -0,0 +1,112 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import copyreg
+import io
+import pickle
+from pathlib import Path
+
+import pytest
+
+import pymvr
+from pymvr.tracking import content_hash
+
+tests_path = Path(__file__).parent
+
+
+def dict_pickle(obj) -> bytes:
+    """Pickle with the instance dicts, as without __reduce__"""
+
+    class Pickler(pickle.Pickler):
+        def reducer_override(self, obj):
+            if isinstance(obj, (pymvr.BaseNode, pymvr.Matrix, pymvr.Color)):
+                return copyreg.__newobj__, (type(obj),), obj.__getstate__()
+            return NotImplemented
+
+    buffer = io.BytesIO()
+    Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(obj)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize("file_name", ["scene_objects.mvr", "capture_demo_show.mvr"])
+def test_pickle_round_trip(file_name):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr:
+        scene = mvr.scene
+    data = pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+    loaded = pickle.loads(data)
+
+    assert type(loaded) is pymvr.Scene
+    assert content_hash(loaded) == content_hash(scene)
+    assert not pymvr.diff_scenes(scene, loaded)
+
+
+def test_pickle_size():
+    with pymvr.GeneralSceneDescription(tests_path / "capture_demo_show.mvr") as mvr:
+        scene = mvr.scene
+    data = pickle.dumps(scene, protocol=pickle.HIGHEST_PROTOCOL)
+
+    assert len(data) < 0.7 * len(dict_pickle(scene))
+
+
+def test_pickle_values():
+    values = [
+        pymvr.Matrix(0),
+        pymvr.Matrix("{1,0,0}{0,1,0}{0,0,1}{1.5,-2,3}"),
+        pymvr.Matrix("{0,1,0}{-1,0,0}{0,0,1}{0,0,0}"),
+        pymvr.Matrix([[1, 2, 3, 4], [5, 6, 7, 8], [9, 10, 11, 12], [0, 0, 0, 1]]),
+        pymvr.Color(),
+        pymvr.Color(0.1, 0.2, 30),
+        pymvr.Color(str_repr="0.3,0.4,50.0"),
+    ]
+    for value in values:
+        loaded = pickle.loads(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        assert type(loaded) is type(value)
+        assert loaded.__getstate__() == value.__getstate__()
+        assert repr(loaded.__getstate__()) == repr(value.__getstate__())
+
+    translation = pymvr.Matrix("{1,0,0}{0,1,0}{0,0,1}{1.5,-2,3}")
+    data = pickle.dumps(translation, protocol=pickle.HIGHEST_PROTOCOL)
+    assert len(data) < len(dict_pickle(translation)) / 2
+
+
+def test_pickle_nodes_and_clones():
+    fixture = pymvr.Fixture(
+        name="Spot",
+        gdtf_spec="Spot.gdtf",
+        gdtf_mode="Default",
+        fixture_id="1",
+        addresses=pymvr.Addresses(addresses=[pymvr.Address(1, 1, 0)]),
+        color=pymvr.Color(0.2, 0.3, 40),
+    )
+    layer = pymvr.Layer(name="Layer", child_list=pymvr.ChildList(fixtures=[fixture]))
+    content_hash(layer)  # tracked nodes carry links to the parent and caches
+    clone = layer.clone()
+
+    for node in (layer, clone):
+        loaded = pickle.loads(pickle.dumps(node, protocol=pickle.HIGHEST_PROTOCOL))
+        loaded_fixture = loaded.child_list.fixtures[0]
+        assert "_parent" not in vars(loaded_fixture)
+        assert loaded_fixture.name == "Spot"
+        assert loaded_fixture.color.Y == 40
+        assert content_hash(loaded) == content_hash(layer)
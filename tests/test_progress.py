@@ -0,0 +1,207 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import zipfile
+from pathlib import Path
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def build_scene(layer_count=3, fixtures_per_layer=4):
+    layers = []
+    for layer in range(layer_count):
+        fixtures = [
+            pymvr.Fixture(name=f"Fixture {layer}.{index}", gdtf_spec="fixture.gdtf")
+            for index in range(fixtures_per_layer)
+        ]
+        layers.append(
+            pymvr.Layer(
+                name=f"Layer {layer}", child_list=pymvr.ChildList(fixtures=fixtures)
+            )
+        )
+    return pymvr.Scene(layers=pymvr.Layers(layers=layers))
+
+
+def write_scene(path, scene, files=()):
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    writer.serialize_scene(scene)
+    for data, name in files:
+        writer.add_file(data, name)
+    writer.write_mvr(path)
+
+
+def test_load_progress(tmp_path):
+    path = tmp_path / "scene.mvr"
+    write_scene(path, build_scene())
+    reports = []
+
+    def progress(state):
+        reports.append((state.layers_done, state.nodes, state.bytes_done))
+
+    with pymvr.GeneralSceneDescription(path, progress=progress) as mvr:
+        assert len(mvr.scene.layers) == 3
+    size = zipfile.ZipFile(path).getinfo("GeneralSceneDescription.xml").file_size
+    assert reports == [(0, 0, size), (1, 4, size), (2, 8, size), (3, 12, size)]
+
+
+def test_load_cancel(tmp_path):
+    path = tmp_path / "scene.mvr"
+    write_scene(path, build_scene())
+    cancel = pymvr.CancelToken()
+
+    def progress(state):
+        if state.layers_done == 1:
+            cancel.cancel()
+
+    with pytest.raises(pymvr.Cancelled):
+        pymvr.GeneralSceneDescription(path, progress=progress, cancel=cancel)
+
+    # checked between the nodes of a layer too
+    cancel = pymvr.CancelToken()
+    cancel.cancel()
+    with pytest.raises(pymvr.Cancelled):
+        pymvr.GeneralSceneDescription.from_bytes(path.read_bytes(), cancel=cancel)
+
+
+def test_trackers_removed(tmp_path):
+    path = tmp_path / "scene.mvr"
+    write_scene(path, build_scene())
+    cancel = pymvr.CancelToken()
+    with pymvr.GeneralSceneDescription(path, cancel=cancel):
+        assert pymvr.progress._installed == 0
+    cancel.cancel()
+    with pytest.raises(pymvr.Cancelled):
+        pymvr.GeneralSceneDescription(path, cancel=cancel)
+    # without trackers, nodes do not look for one
+    assert pymvr.progress._installed == 0
+    assert pymvr.progress.current() is None
+
+
+def test_from_xml_progress():
+    with pymvr.GeneralSceneDescription(tests_path / "basic_fixture.mvr") as mvr:
+        writer = pymvr.GeneralSceneDescriptionWriter()
+        writer.serialize_scene(mvr.scene)
+    data = pymvr.ElementTree.tostring(writer.xml_root)
+    reports = []
+    mvr = pymvr.GeneralSceneDescription.from_xml(data, progress=reports.append)
+    assert reports[-1].bytes_done == len(data)
+    assert reports[-1].layers_done == reports[-1].layers_total == len(mvr.scene.layers)
+
+
+def test_serialize_progress_and_cancel():
+    scene = build_scene()
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    reports = []
+    writer.serialize_scene(
+        scene, progress=lambda state: reports.append((state.layers_done, state.nodes))
+    )
+    # the layers count as nodes as well
+    assert reports == [(1, 5), (2, 10), (3, 15)]
+
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    cancel = pymvr.CancelToken()
+
+    def progress(state):
+        cancel.cancel()
+
+    with pytest.raises(pymvr.Cancelled):
+        writer.serialize_scene(scene, progress=progress, cancel=cancel)
+    assert writer.xml_root.find("Scene") is None
+
+
+def test_write_progress(tmp_path):
+    path = tmp_path / "scene.mvr"
+    reports = []
+    write_scene(tmp_path / "base.mvr", build_scene(), [(b"1" * 100, "one.txt")])
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    writer.serialize_scene(build_scene())
+    writer.add_file(b"2" * 100, "two.txt")
+    writer.write_mvr(
+        path,
+        base=tmp_path / "base.mvr",
+        progress=lambda state: reports.append(
+            (state.files_done, state.files_total, state.bytes_done)
+        ),
+    )
+    # the XML is serialized first, then written with the copied and new files
+    assert [(files, total) for files, total, _ in reports] == [
+        (0, None),
+        (1, 3),
+        (2, 3),
+        (3, 3),
+    ]
+    assert all(a[2] < b[2] for a, b in zip(reports[1:], reports[2:]))
+    assert reports[-1][2] < path.stat().st_size
+
+
+def test_write_cancel_removes_file(tmp_path):
+    path = tmp_path / "scene.mvr"
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    writer.serialize_scene(build_scene())
+    for index in range(5):
+        writer.add_file(b"x" * 100, f"{index}.txt")
+    cancel = pymvr.CancelToken()
+
+    def progress(state):
+        if state.files_done == 3:
+            cancel.cancel()
+
+    with pytest.raises(pymvr.Cancelled):
+        writer.write_mvr(path, progress=progress, cancel=cancel)
+    assert not path.exists()
+
+    # updating in place keeps the original file
+    write_scene(path, build_scene())
+    original = path.read_bytes()
+    with pytest.raises(pymvr.Cancelled):
+        writer.write_mvr(path, base=path, progress=progress, cancel=cancel)
+    assert path.read_bytes() == original
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_async_progress_and_cancel(tmp_path):
+    path = tmp_path / "scene.mvr"
+    write_scene(path, build_scene())
+    reports = []
+
+    async def load():
+        return await pymvr.load_async(path, progress=reports.append)
+
+    with asyncio.run(load()) as mvr:
+        assert len(mvr.scene.layers) == 3
+    assert reports[-1].nodes == 12
+
+    cancel = pymvr.CancelToken()
+    cancel.cancel()
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    writer.serialize_scene(build_scene())
+    target = tmp_path / "out.mvr"
+    with pytest.raises(pymvr.Cancelled):
+        asyncio.run(writer.write_mvr_async(target, cancel=cancel))
+    assert not target.exists()
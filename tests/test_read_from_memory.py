@@ -0,0 +1,67 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import zipfile
+from pathlib import Path
+
+import pytest
+import pymvr
+
+mvr_path = Path(Path(__file__).parent, "basic_fixture.mvr")
+
+
+def check_scene(mvr_read):
+    assert mvr_read.version_major == "1"
+    assert len(mvr_read.scene.layers) > 0
+    assert len(mvr_read.scene.layers[0].child_list.fixtures) > 0
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_from_bytes(wrap):
+    data = wrap(mvr_path.read_bytes())
+    with pymvr.GeneralSceneDescription.from_bytes(data) as mvr_read:
+        check_scene(mvr_read)
+
+
+def test_from_file_object():
+    with open(mvr_path, "rb") as f:
+        with pymvr.GeneralSceneDescription(f) as mvr_read:
+            check_scene(mvr_read)
+
+
+def test_from_xml():
+    with zipfile.ZipFile(mvr_path) as archive:
+        xml_data = archive.read("GeneralSceneDescription.xml")
+
+    check_scene(pymvr.GeneralSceneDescription.from_xml(xml_data))
+    check_scene(pymvr.GeneralSceneDescription.from_xml(xml_data.decode("utf-8")))
+    check_scene(pymvr.GeneralSceneDescription.from_xml(io.BytesIO(xml_data)))
+
+
+def test_empty_description():
+    with pymvr.GeneralSceneDescription() as mvr:
+        assert mvr.scene is None
+        assert mvr.user_data is None
+        assert mvr.version_major == ""
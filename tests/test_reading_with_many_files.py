@@ -41,7 +41,11 @@ def test_reading_with_many_files(request, pymvr_module):
     if not sorted_files:
         pytest.skip(f"No files found in {file_path} matching the pattern")
 
-    for file in sorted_files:
-        print(file)
-        with pymvr_module.GeneralSceneDescription(file) as f:
-            print(f.version_major, f.version_minor, f.provider, f.provider_version)
+    for result in pymvr_module.load_many(sorted_files, function=_versions):
+        print(result.path)
+        assert result.ok, result.error
+        print(*result.value)
+
+
+def _versions(f):
+    return f.version_major, f.version_minor, f.provider, f.provider_version
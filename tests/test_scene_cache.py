@@ -0,0 +1,82 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def cache_entries(cache):
+    return [i for i in os.listdir(cache.directory) if i.endswith(cache.suffix)]
+
+
+def test_cache_hit(tmp_path, monkeypatch):
+    cache = pymvr.SceneCache(tmp_path / "cache")
+    mvr_path = tests_path / "scene_objects.mvr"
+
+    with pymvr.GeneralSceneDescription(mvr_path, cache=cache) as mvr_read:
+        names = [layer.name for layer in mvr_read.scene.layers]
+    assert len(cache_entries(cache)) == 1
+
+    def no_parsing(package):
+        raise AssertionError("scene should come from the cache")
+
+    monkeypatch.setattr(pymvr, "_find_root", no_parsing)
+    with pymvr.GeneralSceneDescription(mvr_path, cache=cache) as mvr_cached:
+        assert mvr_cached.version_minor == "5"
+        assert [layer.name for layer in mvr_cached.scene.layers] == names
+        assert mvr_cached.scene.aux_data.classes[0].name == "Site-Cieling"
+
+
+def test_cache_fallback_on_broken_entry(tmp_path):
+    cache = pymvr.SceneCache(tmp_path / "cache")
+    mvr_path = tests_path / "basic_fixture.mvr"
+    pymvr.GeneralSceneDescription(mvr_path, cache=cache)
+    (entry,) = cache_entries(cache)
+    entry_path = Path(cache.directory, entry)
+    data = entry_path.read_bytes()
+
+    # not a pickle, truncated
+    for broken in [b"broken", data[: len(data) // 2]]:
+        entry_path.write_bytes(broken)
+        mvr_read = pymvr.GeneralSceneDescription(mvr_path, cache=cache)
+        assert len(mvr_read.scene.layers[0].child_list.fixtures) > 0
+        assert entry_path.read_bytes() == data
+
+
+def test_cache_eviction(tmp_path):
+    cache = pymvr.SceneCache(tmp_path / "cache", max_size=1)
+    for file_name in ("basic_fixture.mvr", "scene_objects.mvr"):
+        pymvr.GeneralSceneDescription(tests_path / file_name, cache=cache)
+        assert len(cache_entries(cache)) == 0
+
+    cache.max_size = 100 * 1024 * 1024
+    for file_name in ("basic_fixture.mvr", "scene_objects.mvr"):
+        pymvr.GeneralSceneDescription(tests_path / file_name, cache=cache)
+    assert len(cache_entries(cache)) == 2
+    cache.clear()
+    assert len(cache_entries(cache)) == 0
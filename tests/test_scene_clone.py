@@ -0,0 +1,110 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import pickle
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name="scene_objects.mvr"):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read.scene
+
+
+def scene_xml(scene):
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    scene.to_xml(writer.xml_root)
+    return ElementTree.tostring(writer.xml_root)
+
+
+def first_fixture_list(scene):
+    return next(layer.child_list for layer in scene.layers if layer.child_list.fixtures)
+
+
+def test_clone_has_same_content():
+    scene = read()
+    clone = scene.clone()
+    assert scene_xml(clone) == scene_xml(scene)
+    assert clone.content_hash() == scene.content_hash()
+    assert first_fixture_list(clone) is not first_fixture_list(scene)
+
+
+def test_clone_is_copied_on_use():
+    scene = read()
+    clone = scene.clone()
+    assert "_cow_source" in vars(clone)
+
+    fixture = first_fixture_list(clone).fixtures[0]
+    fixture.name = "Plot B"
+    assert first_fixture_list(scene).fixtures[0].name != "Plot B"
+    # layers which were not used are still shared
+    unused = [layer for layer in clone.layers.layers if "_cow_source" in vars(layer)]
+    assert unused
+    assert pymvr.diff_scenes(scene, clone).modified[0].uuid == fixture.uuid
+
+
+def test_changes_of_source_are_not_seen_by_clone():
+    scene = read()
+    expected = scene_xml(scene)
+    clone = scene.clone()
+
+    child_list = first_fixture_list(scene)
+    child_list.fixtures[0].name = "Changed"
+    child_list.fixtures[1].matrix.matrix[3][0] = 1234.5
+    child_list.fixtures.pop()
+    scene.layers.layers[0].name = "Changed"
+
+    assert scene_xml(clone) == expected
+    assert scene_xml(scene) != expected
+
+
+def test_unused_clone_pickles_and_snapshots():
+    scene = read()
+    clone = scene.clone()
+    expected = scene_xml(scene)
+    assert scene_xml(pickle.loads(pickle.dumps(clone))) == expected
+    assert scene_xml(pymvr.load_snapshot(pymvr.save_snapshot(clone.clone()))) == (
+        expected
+    )
+
+
+def test_reading_does_not_materialize():
+    scene = read()
+    clone = scene.clone()
+    assert "_content_hash" not in vars(scene)  # cloning does not hash
+
+    assert scene_xml(clone) == scene_xml(scene)
+    fixture = first_fixture_list(clone).fixtures[0]
+    assert fixture.name == first_fixture_list(scene).fixtures[0].name
+    read_nodes = [clone, clone.layers, *clone.layers.layers, fixture]
+    assert all("_cow_source" in vars(node) for node in read_nodes)
+
+    # changes of the source still copy the views first
+    first_fixture_list(scene).fixtures[0].name = "Changed"
+    assert "_cow_source" not in vars(fixture)
+    assert fixture.name != "Changed"
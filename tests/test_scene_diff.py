@@ -0,0 +1,89 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read(file_name):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        return mvr_read
+
+
+def test_diff_identical():
+    diff = pymvr.diff_scenes(read("scene_objects.mvr"), read("scene_objects.mvr"))
+    assert not diff
+    assert (diff.added, diff.removed, diff.moved, diff.modified) == ([], [], [], [])
+
+
+def test_diff_changes():
+    old = read("basic_fixture.mvr")
+    new = read("basic_fixture.mvr")
+    layer = new.scene.layers[0]
+    fixture = layer.child_list.fixtures[0]
+    fixture.gdtf_mode = "Changed mode"
+    fixture.matrix.matrix[3][0] += 100
+    fixture.addresses.addresses[0].address += 1
+
+    added = pymvr.Fixture(name="Added")
+    layer.child_list.fixtures.append(added)
+    second_layer = pymvr.Layer(name="Second", child_list=pymvr.ChildList())
+    new.scene.layers.append(second_layer)
+
+    diff = pymvr.diff_scenes(old, new)
+    assert diff.added == [added, second_layer]
+    assert diff.parents[added.uuid] == layer.uuid
+    assert diff.removed == []
+    assert diff.moved == []
+    assert len(diff.modified) == 1
+    change = diff.modified[0]
+    assert change.uuid == fixture.uuid
+    assert set(change.fields) == {"gdtf_mode", "matrix", "addresses"}
+    assert change.fields["gdtf_mode"][1] == "Changed mode"
+
+    # re-parent the fixture into the new layer, remove the added one
+    layer.child_list.fixtures.remove(fixture)
+    layer.child_list.fixtures.remove(added)
+    second_layer.child_list.fixtures.append(fixture)
+    diff = pymvr.diff_scenes(old, new)
+    assert diff.added == [second_layer]
+    assert [i.uuid for i in diff.moved] == [fixture.uuid]
+    assert diff.moved[0].old_parent == layer.uuid
+    assert diff.moved[0].new_parent == second_layer.uuid
+    assert diff.moved[0] is diff.modified[0]
+
+    # and back, reported as removed on the reverse diff
+    assert [i.uuid for i in pymvr.diff_scenes(new, old).removed] == [second_layer.uuid]
+
+
+def test_diff_aux_data():
+    old = read("scene_objects.mvr")
+    new = read("scene_objects.mvr")
+    new.scene.aux_data.classes[0].name = "Renamed"
+    diff = pymvr.diff_scenes(old.scene, new.scene)
+    assert [i.fields["name"][1] for i in diff.modified] == ["Renamed"]
+    assert diff.modified[0].old_parent is None
@@ -0,0 +1,109 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def read():
+    with pymvr.GeneralSceneDescription(tests_path / "basic_fixture.mvr") as mvr_read:
+        return mvr_read.scene
+
+
+def fixtures(scene):
+    return scene.layers[0].child_list.fixtures
+
+
+def test_merge_independent_changes():
+    base, ours, theirs = read(), read(), read()
+    # lighting patches, rigging moves
+    fixtures(ours)[0].addresses.addresses[0].address = 101
+    fixtures(theirs)[0].matrix.matrix[3][2] = 7000.0
+    added = pymvr.Fixture(name="Added by theirs")
+    fixtures(theirs).append(added)
+    truss_layer = pymvr.Layer(name="Trusses", child_list=pymvr.ChildList())
+    theirs.layers.append(truss_layer)
+
+    result = pymvr.merge_scenes(base, ours, theirs)
+    assert result.conflicts == []
+    merged = fixtures(result.scene)
+    assert merged[0].addresses.addresses[0].address == 101
+    assert merged[0].matrix.matrix[3][2] == 7000.0
+    assert [i.uuid for i in merged][-1] == added.uuid
+    assert merged[-1] is not added
+    assert [i.name for i in result.scene.layers][-1] == "Trusses"
+    # inputs are untouched
+    assert fixtures(ours)[0].matrix.matrix[3][2] != 7000.0
+    assert len(fixtures(ours)) == len(fixtures(base))
+
+
+def test_merge_conflicts():
+    base, ours, theirs = read(), read(), read()
+    fixtures(ours)[0].gdtf_mode = "Ours"
+    fixtures(theirs)[0].gdtf_mode = "Theirs"
+    fixtures(theirs)[0].name = "Renamed"
+
+    result = pymvr.merge_scenes(base, ours, theirs)
+    assert [(i.field, i.ours, i.theirs) for i in result.conflicts] == [
+        ("gdtf_mode", "Ours", "Theirs")
+    ]
+    assert fixtures(result.scene)[0].gdtf_mode == "Ours"
+    assert fixtures(result.scene)[0].name == "Renamed"
+
+    result = pymvr.merge_scenes(base, ours, theirs, resolve="theirs")
+    assert fixtures(result.scene)[0].gdtf_mode == "Theirs"
+
+
+def test_merge_move_and_delete():
+    base, ours, theirs = read(), read(), read()
+    moved_uuid = fixtures(base)[0].uuid
+
+    # theirs moves the fixture into a new group
+    group = pymvr.GroupObject(name="Group", child_list=pymvr.ChildList())
+    group.child_list.fixtures.append(fixtures(theirs).pop(0))
+    theirs.layers[0].child_list.group_objects.append(group)
+
+    result = pymvr.merge_scenes(base, ours, theirs)
+    assert result.conflicts == []
+    merged_group = result.scene.layers[0].child_list.group_objects[-1]
+    assert [i.uuid for i in merged_group.child_list.fixtures] == [moved_uuid]
+    assert moved_uuid not in [i.uuid for i in fixtures(result.scene)]
+
+    # theirs deletes, ours modifies: conflict, ours kept
+    base, ours, theirs = read(), read(), read()
+    fixtures(theirs).pop(0)
+    fixtures(ours)[0].gdtf_mode = "Kept"
+    result = pymvr.merge_scenes(base, ours, theirs)
+    assert [i.field for i in result.conflicts] == ["deleted"]
+    assert fixtures(result.scene)[0].gdtf_mode == "Kept"
+
+    # unmodified in ours, deleted
+    base, ours, theirs = read(), read(), read()
+    fixtures(theirs).pop(0)
+    result = pymvr.merge_scenes(base, ours, theirs)
+    assert result.conflicts == []
+    assert moved_uuid not in [i.uuid for i in fixtures(result.scene)]
@@ -0,0 +1,88 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+from pathlib import Path
+from xml.etree import ElementTree
+
+import pytest
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+
+def scene_xml(scene, user_data):
+    writer = pymvr.GeneralSceneDescriptionWriter()
+    scene.to_xml(writer.xml_root)
+    if user_data is not None:
+        user_data.to_xml(writer.xml_root)
+    return ElementTree.tostring(writer.xml_root)
+
+
+@pytest.mark.parametrize("file_name", ["basic_fixture.mvr", "scene_objects.mvr"])
+def test_snapshot_round_trip(file_name):
+    with pymvr.GeneralSceneDescription(tests_path / file_name) as mvr_read:
+        data = pymvr.save_snapshot(mvr_read)
+        expected = scene_xml(mvr_read.scene, mvr_read.user_data)
+
+    loaded = pymvr.load_snapshot(data)
+    assert isinstance(loaded, pymvr.GeneralSceneDescription)
+    assert loaded.version_major == mvr_read.version_major
+    assert loaded.provider == mvr_read.provider
+    assert scene_xml(loaded.scene, loaded.user_data) == expected
+
+
+def test_snapshot_file_and_stream(tmp_path):
+    mvr_read = pymvr.GeneralSceneDescription(tests_path / "basic_fixture.mvr")
+    scene = mvr_read.scene
+
+    snapshot_path = tmp_path / "scene.snapshot"
+    pymvr.save_snapshot(scene, snapshot_path)
+    loaded = pymvr.load_snapshot(snapshot_path)
+    assert isinstance(loaded, pymvr.Scene)
+    fixture = loaded.layers[0].child_list.fixtures[0]
+    original = scene.layers[0].child_list.fixtures[0]
+    assert fixture.uuid == original.uuid
+    assert fixture.matrix.matrix == original.matrix.matrix
+    assert str(fixture.addresses.addresses[0]) == str(original.addresses.addresses[0])
+
+    stream = io.BytesIO()
+    pymvr.save_snapshot(scene.layers[0], stream)
+    stream.seek(0)
+    assert pymvr.load_snapshot(stream).uuid == scene.layers[0].uuid
+
+
+def test_snapshot_is_smaller_than_xml():
+    with pymvr.GeneralSceneDescription(tests_path / "scene_objects.mvr") as mvr_read:
+        xml_size = mvr_read._package.getinfo("GeneralSceneDescription.xml").file_size
+        assert len(pymvr.save_snapshot(mvr_read)) < xml_size
+
+
+def test_snapshot_invalid_data():
+    with pytest.raises(ValueError):
+        pymvr.load_snapshot(b"not a snapshot")
+    data = pymvr.save_snapshot(pymvr.Fixture(name="Spot"))
+    with pytest.raises(ValueError):
+        pymvr.load_snapshot(data[:-3])
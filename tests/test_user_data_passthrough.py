@@ -0,0 +1,108 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import pickle
+import zipfile
+from pathlib import Path
+
+import pymvr
+
+tests_path = Path(__file__).parent
+
+USER_DATA = (
+    b'<UserData>\n  <Data provider="Vendor" ver="2">'
+    b'<Blob  id="1">keep   <b>as is</b></Blob>\n  </Data>\n</UserData>'
+)
+
+
+def description(user_data=USER_DATA, before=b""):
+    return (
+        b'<?xml version="1.0" encoding="UTF-8"?>\n'
+        b'<GeneralSceneDescription verMajor="1" verMinor="6">\n'
+        + before
+        + user_data
+        + b"\n<Scene><Layers/></Scene>\n</GeneralSceneDescription>"
+    )
+
+
+def write(mvr):
+    mvr_writer = pymvr.GeneralSceneDescriptionWriter()
+    mvr_writer.serialize_scene(mvr.scene)
+    mvr_writer.serialize_user_data(mvr.user_data)
+    output = io.BytesIO()
+    mvr_writer.write_mvr(output)
+    with zipfile.ZipFile(output) as z:
+        return z.read("GeneralSceneDescription.xml")
+
+
+def test_user_data_is_parsed_on_access():
+    mvr = pymvr.GeneralSceneDescription.from_xml(description())
+    assert mvr.user_data.raw == USER_DATA
+    assert "data" not in vars(mvr.user_data)
+    assert write(mvr).count(USER_DATA) == 1
+
+    data = mvr.user_data.data[0]
+    assert data.provider == "Vendor"
+    assert data.extra_children[0].get("id") == "1"
+    assert "raw" not in vars(mvr.user_data)
+
+    # parsed data is written verbatim as well
+    data.ver = "3"
+    written = write(mvr)
+    assert (
+        b'<Data provider="Vendor" ver="3"><Blob id="1">keep   <b>as is</b></Blob>\n'
+        b"  </Data>"
+    ) in written
+    reread = pymvr.GeneralSceneDescription.from_xml(written)
+    assert reread.user_data.data[0].ver == "3"
+
+
+def test_raw_user_data_survives_pickle_and_snapshot():
+    mvr = pymvr.GeneralSceneDescription.from_xml(description())
+    copied = pickle.loads(pickle.dumps(mvr.user_data))
+    assert copied.raw == USER_DATA
+    loaded = pymvr.load_snapshot(pymvr.save_snapshot(mvr))
+    assert loaded.user_data.data[0].provider == "Vendor"
+
+
+def test_user_data_hidden_in_markup_is_parsed():
+    hidden = b"<!-- <UserData> -->"
+    mvr = pymvr.GeneralSceneDescription.from_xml(
+        description(user_data=b"<UserData/>", before=hidden)
+    )
+    assert "raw" not in vars(mvr.user_data)
+    assert mvr.user_data.data == []
+
+    cdata = b"<UserData><Data><![CDATA[</UserData>]]></Data></UserData>"
+    mvr = pymvr.GeneralSceneDescription.from_xml(description(user_data=cdata))
+    assert "raw" not in vars(mvr.user_data)
+    assert mvr.user_data.data[0].text == "</UserData>"
+
+
+def test_user_data_of_file():
+    with pymvr.GeneralSceneDescription(tests_path / "scene_objects.mvr") as mvr:
+        assert "raw" in vars(mvr.user_data)
+        providers = [data.provider for data in mvr.user_data.data]
+    assert providers == ["Vectorworks", "VectorworksLitFiles"]
@@ -0,0 +1,84 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import zipfile
+
+import pytest
+import pymvr
+
+
+class NonSeekableStream(io.RawIOBase):
+    """Write only stream, like a socket or a pipe"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def getvalue(self):
+        return b"".join(self.chunks)
+
+
+def create_writer():
+    mvr = pymvr.GeneralSceneDescriptionWriter(workers=2)
+    mvr.parallel_threshold = 1024
+    layer = pymvr.Layer(
+        name="Stream layer",
+        child_list=pymvr.ChildList(fixtures=[pymvr.Fixture(name="Fixture")]),
+    )
+    mvr.serialize_scene(pymvr.Scene(layers=pymvr.Layers([layer])))
+    mvr.add_file(b"gdtf data", "fixture.gdtf")
+    mvr.add_file(b"mesh " * 2000, "mesh.3ds")
+    mvr.add_file(io.BytesIO(b"texture " * 100), "texture.txt")
+    return mvr
+
+
+@pytest.mark.parametrize("stream_class", [io.BytesIO, NonSeekableStream])
+def test_write_to_stream(stream_class):
+    stream = stream_class()
+    create_writer().write_mvr(stream)
+
+    data = io.BytesIO(stream.getvalue())
+    with zipfile.ZipFile(data) as archive:
+        assert archive.testzip() is None
+        assert archive.read("fixture.gdtf") == b"gdtf data"
+        assert archive.read("mesh.3ds") == b"mesh " * 2000
+        assert archive.read("texture.txt") == b"texture " * 100
+
+    with pymvr.GeneralSceneDescription(data) as mvr_read:
+        assert mvr_read.scene.layers[0].name == "Stream layer"
+
+
+def test_write_without_target():
+    with pytest.raises(ValueError):
+        create_writer().write_mvr(None)
@@ -0,0 +1,107 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import os
+import zipfile
+
+import pytest
+
+import pymvr
+
+
+def create_base_mvr(path):
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    layer = pymvr.Layer(
+        name="Layer 1",
+        child_list=pymvr.ChildList(fixtures=[pymvr.Fixture(name="Fixture 1")]),
+    )
+    mvr.serialize_scene(pymvr.Scene(layers=pymvr.Layers([layer])))
+    mvr.add_file(os.urandom(4096), "fixture.gdtf")
+    mvr.add_file(b"mesh data" * 1000, "mesh.3ds")
+    mvr.add_file(b"old texture", "texture.txt")
+    mvr.write_mvr(path)
+
+
+def test_update_copies_members_raw(tmp_path):
+    base_path = tmp_path / "base.mvr"
+    create_base_mvr(base_path)
+
+    with pymvr.GeneralSceneDescription(base_path) as mvr_read:
+        mvr_read.scene.layers[0].child_list.fixtures[0].name = "Renamed"
+        mvr = pymvr.GeneralSceneDescriptionWriter()
+        mvr.serialize_scene(mvr_read.scene)
+        mvr.add_file(b"new texture", "texture.txt")
+        updated_path = tmp_path / "updated.mvr"
+        mvr.write_mvr(updated_path, base=mvr_read)
+
+    with zipfile.ZipFile(base_path) as base, zipfile.ZipFile(updated_path) as updated:
+        assert updated.testzip() is None
+        assert sorted(base.namelist()) == sorted(updated.namelist())
+        for name in ("fixture.gdtf", "mesh.3ds"):
+            base_info = base.getinfo(name)
+            info = updated.getinfo(name)
+            assert info.compress_type == base_info.compress_type
+            assert info.compress_size == base_info.compress_size
+            assert info.CRC == base_info.CRC
+            assert updated.read(name) == base.read(name)
+        assert updated.read("texture.txt") == b"new texture"
+
+    mvr_updated = pymvr.GeneralSceneDescription(updated_path)
+    assert mvr_updated.scene.layers[0].child_list.fixtures[0].name == "Renamed"
+
+
+def test_update_in_place(tmp_path):
+    base_path = tmp_path / "base.mvr"
+    create_base_mvr(base_path)
+    with zipfile.ZipFile(base_path) as base:
+        gdtf_data = base.read("fixture.gdtf")
+
+    mvr_read = pymvr.GeneralSceneDescription(base_path)
+    mvr_read.scene.layers[0].name = "Updated layer"
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    mvr.serialize_scene(mvr_read.scene)
+    mvr.write_mvr(base_path, base=base_path)
+
+    with zipfile.ZipFile(base_path) as updated:
+        assert updated.testzip() is None
+        assert updated.read("fixture.gdtf") == gdtf_data
+        assert updated.read("texture.txt") == b"old texture"
+    assert pymvr.GeneralSceneDescription(base_path).scene.layers[0].name == (
+        "Updated layer"
+    )
+
+
+def test_failed_write_keeps_existing_file(tmp_path):
+    path = tmp_path / "scene.mvr"
+    create_base_mvr(path)
+    original = path.read_bytes()
+
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    mvr.serialize_scene(pymvr.Scene())
+    mvr.add_file(b"model", "model.3ds")
+    mvr.add_file(str(tmp_path / "missing.3ds"), "missing.3ds")
+    with pytest.raises(FileNotFoundError):
+        mvr.write_mvr(path)
+    assert path.read_bytes() == original
+    assert list(tmp_path.iterdir()) == [path]
@@ -0,0 +1,119 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import os
+import sys
+import zipfile
+
+import pytest
+
+import pymvr
+import pymvr.archive
+
+
+def test_compression_policy(tmp_path):
+    gdtf_path = tmp_path / "fixture.gdtf"
+    gdtf_path.write_bytes(os.urandom(2048))
+    model_path = tmp_path / "model.3ds"
+    model_path.write_bytes(b"3ds model " * 200)
+
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    mvr.serialize_scene(pymvr.Scene())
+    mvr.files_list = [
+        (str(gdtf_path), "fixture.gdtf"),
+        (str(model_path), "model.3ds"),
+    ]
+    test_file_path = tmp_path / "policy.mvr"
+    mvr.write_mvr(test_file_path)
+
+    with zipfile.ZipFile(test_file_path, "r") as archive:
+        infos = {info.filename: info for info in archive.infolist()}
+        assert (
+            infos["GeneralSceneDescription.xml"].compress_type == zipfile.ZIP_DEFLATED
+        )
+        assert infos["fixture.gdtf"].compress_type == zipfile.ZIP_STORED
+        assert infos["model.3ds"].compress_type == zipfile.ZIP_DEFLATED
+        assert archive.read("fixture.gdtf") == gdtf_path.read_bytes()
+        assert archive.read("model.3ds") == model_path.read_bytes()
+
+
+def test_parallel_deflate(tmp_path):
+    files_list = []
+    for index in range(5):
+        file_path = tmp_path / f"mesh_{index}.3ds"
+        file_path.write_bytes(f"mesh {index} ".encode() * 5000)
+        files_list.append((str(file_path), f"mesh_{index}.3ds"))
+
+    mvr = pymvr.GeneralSceneDescriptionWriter(workers=3)
+    mvr.parallel_threshold = 1024
+    mvr.serialize_scene(pymvr.Scene())
+    mvr.files_list = files_list
+    test_file_path = tmp_path / "parallel.mvr"
+    mvr.write_mvr(test_file_path)
+
+    with zipfile.ZipFile(test_file_path, "r") as archive:
+        assert archive.testzip() is None
+        for file_path, file_name in files_list:
+            info = archive.getinfo(file_name)
+            assert info.compress_type == zipfile.ZIP_DEFLATED
+            assert info.compress_size < info.file_size
+            with open(file_path, "rb") as f:
+                assert archive.read(file_name) == f.read()
+
+    mvr_read = pymvr.GeneralSceneDescription(test_file_path)
+    assert len(mvr_read.scene.layers) == 0
+
+
+def test_raw_writes_supported():
+    # the zipfile internals are checked with these CPython versions
+    if sys.implementation.name != "cpython" or sys.version_info >= (3, 14):
+        pytest.skip("zipfile internals not checked with this Python")
+    with zipfile.ZipFile(io.BytesIO(), "w") as archive:
+        assert pymvr.archive.raw_writes(archive)
+
+
+def test_raw_writes_fallback(tmp_path, monkeypatch):
+    # without the zipfile internals, members go through ZipFile.open()
+    monkeypatch.setattr(pymvr.archive, "RAW_WRITES", False)
+    data = b"mesh data " * 5000
+    mvr = pymvr.GeneralSceneDescriptionWriter(workers=2)
+    mvr.parallel_threshold = 1024
+    mvr.serialize_scene(pymvr.Scene())
+    mvr.add_file(data, "mesh.3ds")
+    mvr.add_file(os.urandom(2048), "fixture.gdtf")
+    base_path = tmp_path / "base.mvr"
+    mvr.write_mvr(base_path)
+
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    mvr.serialize_scene(pymvr.Scene())
+    updated_path = tmp_path / "updated.mvr"
+    mvr.write_mvr(updated_path, base=base_path)
+
+    with zipfile.ZipFile(base_path) as base, zipfile.ZipFile(updated_path) as updated:
+        assert base.testzip() is None and updated.testzip() is None
+        assert base.getinfo("mesh.3ds").compress_type == zipfile.ZIP_DEFLATED
+        assert updated.getinfo("fixture.gdtf").compress_type == zipfile.ZIP_STORED
+        assert updated.read("mesh.3ds") == data
+        assert updated.read("fixture.gdtf") == base.read("fixture.gdtf")
@@ -0,0 +1,67 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import io
+import zipfile
+
+import pytest
+import pymvr
+
+
+def test_write_in_memory_sources(tmp_path):
+    source_mvr = pymvr.GeneralSceneDescriptionWriter()
+    source_mvr.serialize_scene(pymvr.Scene())
+    source_mvr.add_file(b"<GDTF/>" * 100, "generated.gdtf")
+    source_mvr.add_file(io.BytesIO(b"mesh data" * 100), "meshes/model.3ds")
+    source_mvr.add_file(memoryview(b"picture"), "picture.png")
+    source_path = tmp_path / "source.mvr"
+    source_mvr.write_mvr(source_path)
+
+    with zipfile.ZipFile(source_path, "r") as archive:
+        assert archive.read("generated.gdtf") == b"<GDTF/>" * 100
+        assert archive.read("meshes/model.3ds") == b"mesh data" * 100
+        assert archive.read("picture.png") == b"picture"
+
+    with pymvr.GeneralSceneDescription(source_path) as mvr_read:
+        mvr = pymvr.GeneralSceneDescriptionWriter()
+        mvr.serialize_scene(mvr_read.scene)
+        mvr.add_file(pymvr.ArchiveMember(mvr_read, "generated.gdtf"), "copy.gdtf")
+        mvr.add_file(
+            pymvr.ArchiveMember(mvr_read._package, "meshes/model.3ds"), "model.3ds"
+        )
+        test_file_path = tmp_path / "rebuilt.mvr"
+        mvr.write_mvr(test_file_path)
+
+    with zipfile.ZipFile(test_file_path, "r") as archive:
+        assert archive.read("copy.gdtf") == b"<GDTF/>" * 100
+        assert archive.read("model.3ds") == b"mesh data" * 100
+        assert archive.getinfo("copy.gdtf").compress_type == zipfile.ZIP_STORED
+
+
+def test_missing_file_raises(tmp_path):
+    mvr = pymvr.GeneralSceneDescriptionWriter()
+    mvr.serialize_scene(pymvr.Scene())
+    mvr.add_file(str(tmp_path / "missing.gdtf"), "missing.gdtf")
+    with pytest.raises(FileNotFoundError):
+        mvr.write_mvr(tmp_path / "missing.mvr")
@@ -0,0 +1,177 @@
+# MIT License
+#
+# Copyright (C) 2026 vanous
+#
+# This file is part of pymvr.
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+
+import asyncio
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from pymvr import xchange
+
+tests_path = Path(__file__).parent
+
+
+def test_packets():
+    async def run():
+        reader = asyncio.StreamReader()
+        reader.feed_data(xchange.pack_message({"Type": "MVR_JOIN"}))
+        reader.feed_data(xchange.pack_file_header(1, 2, 3) + b"abc")
+        reader.feed_data(b"\x00" * xchange.HEADER.size)
+        assert await xchange.read_packet(reader) == (
+            xchange.PACKAGE_JSON,
+            0,
+            1,
+            b'{"Type": "MVR_JOIN"}',
+        )
+        assert await xchange.read_packet(reader) == (xchange.PACKAGE_FILE, 1, 2, b"abc")
+        with pytest.raises(xchange.XchangeError):
+            await xchange.read_packet(reader)
+
+    asyncio.run(run())
+
+
+def test_join_commit_and_load(tmp_path):
+    data = (tests_path / "basic_fixture.mvr").read_bytes()
+
+    async def run():
+        # small chunks and spool, the file is sent in many packets to disk
+        host = xchange.Station("Host", chunk_size=1000, spool_size=2000)
+        client = xchange.Station("Client")
+        committed = asyncio.Event()
+        client.on_commit = lambda commit: committed.set()
+        async with host, client:
+            early = await host.commit(data, comment="before join")
+            address = await host.start()
+            connection = await client.join(*address)
+            assert connection.station_name == "Host"
+            assert list(client.commits) == [early.file_uuid]
+            assert list(host.peers) == [client.station_uuid]
+
+            path = tmp_path / "scene.mvr"
+            path.write_bytes(data)
+            commit = await host.commit(path, comment="after join")
+            await asyncio.wait_for(committed.wait(), 5)
+            received = client.commits[commit.file_uuid]
+            assert received.file_name == "scene.mvr"
+            assert received.file_size == len(data)
+            assert received.comment == "after join"
+
+            with await client.load(commit.file_uuid) as mvr:
+                assert len(mvr.scene.layers) == 1
+                (spooled,) = mvr._owned_files
+            assert spooled.closed
+            with await client.request(early.file_uuid) as f:
+                assert f.read() == data
+
+            # the joined station can commit back over the same connection
+            back = await client.commit(b"x" * 2500)
+            target = io.BytesIO()
+            await host.request(back.file_uuid, target=target)
+            assert target.getvalue() == b"x" * 2500
+
+            with pytest.raises(xchange.XchangeError):
+                await client.request("missing", station_uuid=host.station_uuid)
+
+            await client.leave()
+            await asyncio.sleep(0.05)
+            assert host.peers == {}
+            assert back.file_uuid not in host.commits
+
+    asyncio.run(run())
+
+
+def test_many_stations():
+    async def run():
+        host = xchange.Station("Host", chunk_size=4096)
+        address = await host.start()
+        stations = [xchange.Station(f"Station {i}") for i in range(20)]
+        await asyncio.gather(*(station.join(*address) for station in stations))
+        assert len(host.peers) == 20
+
+        data = bytes(range(256)) * 100
+        commit = await host.commit(
+            data, for_stations=[s.station_uuid for s in stations[:15]]
+        )
+        received = await asyncio.gather(
+            *(station.request(commit.file_uuid) for station in stations[:15])
+        )
+        for f in received:
+            with f:
+                assert f.read() == data
+        assert all(commit.file_uuid not in s.commits for s in stations[15:])
+
+        await asyncio.gather(*(station.close() for station in stations))
+        await host.close()
+
+    asyncio.run(run())
+
+
+def test_stand_in_peer():
+    """Our station against a minimal peer written from the packet layout"""
+    seen = []
+
+    async def peer(reader, writer):
+        while True:
+            try:
+                _, _, _, payload = await xchange.read_packet(reader)
+            except asyncio.IncompleteReadError:
+                break
+            message = json.loads(payload)
+            seen.append(message["Type"])
+            if message["Type"] == "MVR_JOIN":
+                reply = {
+                    "Type": "MVR_JOIN_RET",
+                    "OK": True,
+                    "Message": "",
+                    "StationUUID": "peer",
+                    "StationName": "Peer",
+                    "Files": [{"FileUUID": "f1", "FileSize": 9}],
+                }
+                writer.write(xchange.pack_message(reply))
+            elif message.get("FileUUID") == "f1":
+                for number, chunk in enumerate([b"abc", b"def", b"ghi"]):
+                    writer.write(xchange.pack_file_header(number, 3, 3) + chunk)
+            else:
+                reply = {"Type": "MVR_REQUEST_RET", "OK": False, "Message": "no"}
+                writer.write(xchange.pack_message(reply))
+            await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(peer, "127.0.0.1", 0)
+        station = xchange.Station()
+        await station.join(*server.sockets[0].getsockname()[:2])
+        assert station.commits["f1"].station_uuid == "peer"
+        with await station.request("f1") as f:
+            assert f.read() == b"abcdefghi"
+        with pytest.raises(xchange.XchangeError, match="no"):
+            await station.request(station_uuid="peer")
+        await station.close()
+        server.close()
+        await server.wait_closed()
+
+    asyncio.run(run())
+    assert seen == ["MVR_JOIN", "MVR_REQUEST", "MVR_REQUEST", "MVR_LEAVE"]